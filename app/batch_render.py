@@ -0,0 +1,259 @@
+"""Headless batch renderer: dumps in, thumbnail/band sheets, detailed sectors and mosaics out.
+
+Runs without Qt. Each dump gets its own output directory with a ``manifest.json`` written last,
+so rerunning the same command skips finished dumps and redoes interrupted ones.
+
+    python batch_render.py dumps/ -o renders/ --products thumbs,bands,mosaic --jobs 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from core.addressing import SECTOR_SIZE, SECTORS_TOTAL
+from core.image_io import open_image_writer
+from core.model import MappedMemoryModel
+from core.mosaic import render_mosaic
+from core.render import PALETTES, sector_band_images, sector_detailed_images, sector_thumbnails_from_stats
+
+PRODUCTS = ("thumbs", "bands", "detailed", "mosaic")
+SHEET_COLS = 32
+THUMB_SIZE = (48, 32)
+BAND_SIZE = (256, 64)
+DETAILED_HEIGHT = 180
+MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    products: tuple[str, ...] = ("thumbs", "bands", "mosaic")
+    bitorder: str = "msb"
+    palette: str | None = None
+    lod: int = 2
+    scale: float = 4.0
+    fmt: str = "png"
+    sectors: str = "programmed"  # sectors for "detailed": "programmed", "all" or e.g. "0-15,40"
+
+
+def parse_sectors(spec: str, programmed: np.ndarray) -> list[int]:
+    if spec == "programmed":
+        return np.flatnonzero(programmed).tolist()
+    if spec == "all":
+        return list(range(SECTORS_TOTAL))
+    ids: set[int] = set()
+    for part in spec.split(","):
+        lo, _, hi = part.strip().partition("-")
+        first, last = int(lo, 0), int(hi or lo, 0)
+        if not 0 <= first <= last < SECTORS_TOTAL:
+            raise ValueError(f"bad sector range: {part}")
+        ids.update(range(first, last + 1))
+    return sorted(ids)
+
+
+def collect_dumps(inputs: list[str]) -> list[Path]:
+    """Files as given plus every ``*.bin`` under given directories, sorted and de-duplicated."""
+    paths: set[Path] = set()
+    for item in inputs:
+        p = Path(item)
+        paths.update(p.rglob("*.bin") if p.is_dir() else [p])
+    return sorted(paths)
+
+
+def output_dirs(dumps: list[Path], out_root: Path) -> list[Path]:
+    """One directory per dump named after its stem; repeated stems get ``-2``, ``-3``..."""
+    seen: dict[str, int] = {}
+    dirs = []
+    for dump in dumps:
+        n = seen[dump.stem] = seen.get(dump.stem, 0) + 1
+        dirs.append(out_root / (dump.stem if n == 1 else f"{dump.stem}-{n}"))
+    return dirs
+
+
+def _source_info(dump: Path) -> dict:
+    st = dump.stat()
+    return {"source": str(dump.resolve()), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def is_done(dump: Path, out_dir: Path, opts: BatchOptions) -> bool:
+    try:
+        manifest = json.loads((out_dir / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return False
+    return (
+        manifest.get("options") == json.loads(json.dumps(asdict(opts)))
+        and all(manifest.get(k) == v for k, v in _source_info(dump).items())
+        and all((out_dir / name).exists() for name in manifest.get("outputs", []))
+    )
+
+
+class _Partial:
+    """Write to ``name.part.<ext>`` and rename into place only once complete."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp = path.with_name(f"{path.stem}.part{path.suffix}")
+
+    def __enter__(self) -> Path:
+        return self.tmp
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            os.replace(self.tmp, self.path)
+        else:
+            self.tmp.unlink(missing_ok=True)
+
+
+def _write_sheet(path: Path, count: int, size: tuple[int, int], render) -> None:
+    """Grid of ``SHEET_COLS`` tiles per row, streamed one row of tiles at a time."""
+    w, h = size
+    rows = (count + SHEET_COLS - 1) // SHEET_COLS
+    with _Partial(path) as tmp, open_image_writer(tmp, SHEET_COLS * w, rows * h) as writer:
+        for r in range(rows):
+            ids = range(r * SHEET_COLS, min((r + 1) * SHEET_COLS, count))
+            tiles = np.full((SHEET_COLS, h, w, 3), 255, dtype=np.uint8)
+            tiles[: len(ids)] = render(ids)
+            writer.write_rows(tiles.transpose(1, 0, 2, 3).reshape(h, SHEET_COLS * w, 3))
+
+
+def _write_image(path: Path, img: np.ndarray) -> None:
+    with _Partial(path) as tmp, open_image_writer(tmp, img.shape[1], img.shape[0]) as writer:
+        writer.write_rows(img)
+
+
+def render_dump(dump: Path, out_dir: Path, opts: BatchOptions, threads: int | None = None) -> dict:
+    """Render every requested product of one dump, then write its manifest.
+
+    ``threads`` caps the mosaic's render threads; it does not change the output, so it stays out of the manifest.
+    """
+    t0 = time.perf_counter()
+    palette = PALETTES[opts.palette] if opts.palette else None
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MANIFEST).unlink(missing_ok=True)
+    model = MappedMemoryModel(path=str(dump))
+    outputs: list[str] = []
+    try:
+        sectors = model.read_view(0, SECTORS_TOTAL * SECTOR_SIZE).reshape(SECTORS_TOTAL, SECTOR_SIZE)
+        if "thumbs" in opts.products:
+            zero_bits = model.page_zero_bits.reshape(SECTORS_TOTAL, -1)
+            name = f"thumbs.{opts.fmt}"
+            _write_sheet(out_dir / name, SECTORS_TOTAL, THUMB_SIZE, lambda ids: sector_thumbnails_from_stats(zero_bits[ids], *THUMB_SIZE, palette))
+            outputs.append(name)
+        if "bands" in opts.products:
+            name = f"bands.{opts.fmt}"
+            _write_sheet(out_dir / name, SECTORS_TOTAL, BAND_SIZE, lambda ids: sector_band_images(sectors[ids], *BAND_SIZE, opts.bitorder, palette=palette))
+            outputs.append(name)
+        if "detailed" in opts.products:
+            (out_dir / "detailed").mkdir(exist_ok=True)
+            ids = parse_sectors(opts.sectors, model.sector_programmed)
+            for i in range(0, len(ids), SHEET_COLS):
+                chunk = ids[i : i + SHEET_COLS]
+                ecc = np.stack([model.ecc_index.sector_matrix(sid) for sid in chunk])
+                images = sector_detailed_images(sectors[chunk], DETAILED_HEIGHT, True, opts.bitorder, "vertical", ecc, palette)
+                for sid, img in zip(chunk, images):
+                    name = f"detailed/sector_{sid:03d}.{opts.fmt}"
+                    _write_image(out_dir / name, img)
+                    outputs.append(name)
+        if "mosaic" in opts.products:
+            name = f"mosaic.{opts.fmt}"
+            with _Partial(out_dir / name) as tmp:
+                render_mosaic(model, tmp, lod=opts.lod, scale=opts.scale, bitorder=opts.bitorder, palette=palette, workers=threads)
+            outputs.append(name)
+        del sectors
+    finally:
+        model.close()
+    manifest = {**_source_info(dump), "options": asdict(opts), "outputs": outputs, "seconds": round(time.perf_counter() - t0, 3)}
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def run_batch(dumps: list[Path], out_root: Path, opts: BatchOptions, jobs: int = 1, force: bool = False, log=sys.stderr) -> int:
+    """Render all dumps (``jobs`` in parallel); returns the number of failures."""
+    todo = []
+    for dump, out_dir in zip(dumps, output_dirs(dumps, out_root)):
+        if force or not is_done(dump, out_dir, opts):
+            todo.append((dump, out_dir))
+    skipped = len(dumps) - len(todo)
+    if log and skipped:
+        print(f"resume: {skipped} of {len(dumps)} dumps already rendered", file=log)
+    failures = 0
+    t0 = time.perf_counter()
+
+    def report(i: int, dump: Path, status: str):
+        if log:
+            eta = (time.perf_counter() - t0) / i * (len(todo) - i)
+            print(f"[{i}/{len(todo)}] {dump.name}: {status} (eta {_format_eta(eta)})", file=log, flush=True)
+
+    # Any exception only fails its own dump: one corrupt file must not stop an overnight batch.
+    if jobs <= 1:
+        for i, (dump, out_dir) in enumerate(todo, 1):
+            try:
+                status = f"ok in {render_dump(dump, out_dir, opts)['seconds']:.1f}s"
+            except Exception as exc:
+                failures += 1
+                status = f"FAILED: {type(exc).__name__}: {exc}"
+            report(i, dump, status)
+        return failures
+    with ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(render_dump, dump, out_dir, opts, 1): dump for dump, out_dir in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                status = f"ok in {future.result()['seconds']:.1f}s"
+            except Exception as exc:
+                failures += 1
+                status = f"FAILED: {type(exc).__name__}: {exc}"
+            report(i, futures[future], status)
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="dump files or directories searched for *.bin")
+    parser.add_argument("-o", "--output", required=True, help="output root; one directory per dump")
+    parser.add_argument("--products", default="thumbs,bands,mosaic", help=f"comma list of {', '.join(PRODUCTS)}")
+    parser.add_argument("--sectors", default="programmed", help="detailed sectors: programmed, all or ranges like 0-15,40")
+    parser.add_argument("--bitorder", choices=("msb", "lsb"), default="msb")
+    parser.add_argument("--palette", choices=sorted(PALETTES), default=None)
+    parser.add_argument("--lod", type=int, choices=(0, 1, 2), default=2, help="mosaic level of detail")
+    parser.add_argument("--scale", type=float, default=4.0, help="mosaic pixels per scene unit")
+    parser.add_argument("--format", choices=("png", "tif"), default="png")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="dumps rendered in parallel")
+    parser.add_argument("--force", action="store_true", help="re-render dumps that already have a matching manifest")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    products = tuple(p for p in PRODUCTS if p in {s.strip() for s in args.products.split(",")})
+    unknown = {s.strip() for s in args.products.split(",")} - set(PRODUCTS)
+    if unknown or not products:
+        parser.error(f"unknown products: {', '.join(sorted(unknown)) or '(none given)'}")
+    opts = BatchOptions(
+        products=products,
+        bitorder=args.bitorder,
+        palette=args.palette,
+        lod=args.lod,
+        scale=args.scale,
+        fmt=args.format,
+        sectors=args.sectors,
+    )
+    dumps = collect_dumps(args.inputs)
+    if not dumps:
+        parser.error("no dumps found")
+    failures = run_batch(dumps, Path(args.output), opts, args.jobs, args.force, None if args.quiet else sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
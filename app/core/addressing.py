@@ -58,6 +58,12 @@ def sector_start(sector_id: int) -> int:
     return sector_id * SECTOR_SIZE
 
 
+def sectors_in_range(start: int, size: int) -> range:
+    if size <= 0:
+        return range(0)
+    return range(start >> 16, ((start + size - 1) >> 16) + 1)
+
+
 def dataset_address(sector_id: int, page_in_sector: int) -> tuple[int, int]:
     if not (0 <= sector_id < SECTORS_TOTAL):
         raise ValueError("Invalid sector")
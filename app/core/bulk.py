@@ -0,0 +1,43 @@
+"""Bulk program/erase operations applied to a MemoryModel in one pass."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+OP_PROGRAM = "program"
+OP_ERASE = "erase"
+
+
+@dataclass
+class BulkOp:
+    kind: str
+    start: int
+    size: int
+    segments: list[dict] = field(default_factory=list)
+    enforce_nor: bool | None = None
+    data: bytes | None = None  # raw payload; takes precedence over segments
+
+
+@dataclass(frozen=True)
+class BulkStats:
+    ops: int
+    bytes_total: int
+    seconds: float
+
+    @property
+    def mb_per_s(self) -> float:
+        if self.seconds <= 0:
+            return float("inf")
+        return self.bytes_total / (1024 * 1024) / self.seconds
+
+
+def program_op(start: int, size: int, segments: list[dict], enforce_nor: bool | None = None) -> BulkOp:
+    return BulkOp(OP_PROGRAM, start, size, list(segments), enforce_nor)
+
+
+def erase_op(start: int, size: int) -> BulkOp:
+    return BulkOp(OP_ERASE, start, size)
+
+
+def data_op(start: int, data: bytes, enforce_nor: bool | None = None) -> BulkOp:
+    return BulkOp(OP_PROGRAM, start, len(data), enforce_nor=enforce_nor, data=bytes(data))
@@ -0,0 +1,141 @@
+"""Whole-chip ECC index kept in step with the model's page generations."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .addressing import CAPACITY_BYTES, PAGE_SIZE
+from .bulk import data_op
+from .ecc_overlay import ECC_BITS, ecc_bits_batch
+from .secded import SecDedReport, secded_correct, secded_decode, secded_encode
+from .utils import as_u8_array, decode_array, encode_array
+
+PAGES_TOTAL = CAPACITY_BYTES // PAGE_SIZE
+PAGES_PER_SECTOR = 256
+_CHUNK_PAGES = 16384
+_WEIGHTS = (1 << np.arange(ECC_BITS, dtype=np.uint16)).astype(np.uint16)
+
+
+def pack_ecc(bits: np.ndarray) -> np.ndarray:
+    """(N, 10) overlay bits -> (N,) uint16 codes, bit ``i`` holding overlay column ``i``."""
+    return (bits.astype(np.uint16) * _WEIGHTS).sum(axis=1, dtype=np.uint16)
+
+
+def unpack_ecc(codes: np.ndarray) -> np.ndarray:
+    return ((codes[:, None] >> np.arange(ECC_BITS, dtype=np.uint16)) & 1).astype(np.uint8)
+
+
+def _overlay_codes(view: np.ndarray) -> np.ndarray:
+    return pack_ecc(ecc_bits_batch(view))
+
+
+class EccIndex:
+    """Stored ECC (simulated overlay bits and SEC-DED codes) for every 256-byte dataset of a model.
+
+    Built lazily on first use, then refreshed only for sectors whose page generation moved.
+    Content changed behind the model's back (or a read-back dump) shows up as a syndrome.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._codes: np.ndarray | None = None
+        self._secded: np.ndarray | None = None
+        self._generation = np.zeros(PAGES_TOTAL, dtype=np.uint32)
+
+    @property
+    def codes(self) -> np.ndarray:
+        self.refresh()
+        return self._codes
+
+    @property
+    def secded_codes(self) -> np.ndarray:
+        self.refresh()
+        return self._secded
+
+    def refresh(self) -> int:
+        """Recompute stale datasets; returns how many pages were updated."""
+        gen = self.model.page_generation
+        if self._codes is None:
+            self._codes = self._compute(0, PAGES_TOTAL, _overlay_codes)
+            self._secded = self._compute(0, PAGES_TOTAL, secded_encode)
+            self._generation[:] = gen
+            return PAGES_TOTAL
+        stale_pages = gen != self._generation
+        stale = stale_pages.reshape(-1, PAGES_PER_SECTOR).any(axis=1)
+        if not stale.any():
+            return 0
+        # Compute whole runs of dirty sectors (cheap next to per-page dispatch) but only adopt
+        # stale pages, so untracked corruption elsewhere in the sector stays detectable.
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], stale.view(np.int8), [0]))))
+        for s0, s1 in zip(edges[::2], edges[1::2]):
+            p0, p1 = s0 * PAGES_PER_SECTOR, s1 * PAGES_PER_SECTOR
+            mask = stale_pages[p0:p1]
+            self._codes[p0:p1][mask] = self._compute(p0, p1, _overlay_codes)[mask]
+            self._secded[p0:p1][mask] = self._compute(p0, p1, secded_encode)[mask]
+        self._generation[:] = gen
+        return int(np.count_nonzero(stale_pages))
+
+    def bits(self, first_page: int, count: int = 1) -> np.ndarray:
+        """(count, 10) stored overlay bits starting at ``first_page``."""
+        return unpack_ecc(self.codes[first_page : first_page + count])
+
+    def sector_matrix(self, sector_id: int) -> np.ndarray:
+        """(10, 256) matrix in the layout of ``ecc_matrix_for_sector``."""
+        return np.ascontiguousarray(self.bits(sector_id * PAGES_PER_SECTOR, PAGES_PER_SECTOR).T)
+
+    def syndromes(self, data=None) -> np.ndarray:
+        """(pages,) uint16 XOR of stored and recomputed codes; ``data`` defaults to the model's content."""
+        stored = self.codes
+        if data is None:
+            fresh = self._compute(0, PAGES_TOTAL, _overlay_codes)
+        else:
+            fresh = pack_ecc(ecc_bits_batch(data))
+            stored = stored[: fresh.size]
+        return stored ^ fresh
+
+    def mismatched_pages(self, data=None) -> np.ndarray:
+        return np.flatnonzero(self.syndromes(data))
+
+    def correct(self, data=None) -> SecDedReport:
+        """SEC-DED check against the stored codes, fixing single-bit errors.
+
+        ``data`` (a writable dump buffer) is corrected in place; without it the model itself is
+        corrected through ``apply_batch``, so the fix is tracked and undoable.
+        """
+        codes = self.secded_codes
+        if data is not None:
+            size = as_u8_array(data).size
+            if size > CAPACITY_BYTES:
+                raise ValueError("dump is larger than the device")
+            return secded_correct(data, codes[: size // PAGE_SIZE])
+        status = np.empty(PAGES_TOTAL, dtype=np.uint8)
+        ops = []
+        for c0 in range(0, PAGES_TOTAL, _CHUNK_PAGES):
+            view = self.model.read_view(c0 * PAGE_SIZE, _CHUNK_PAGES * PAGE_SIZE).reshape(-1, PAGE_SIZE)
+            status[c0 : c0 + _CHUNK_PAGES], data_bit = secded_decode(view, codes[c0 : c0 + _CHUNK_PAGES])
+            for page in np.flatnonzero(data_bit >= 0):
+                fixed = bytearray(view[page])
+                fixed[data_bit[page] >> 3] ^= 0x80 >> (data_bit[page] & 7)
+                ops.append(data_op((c0 + int(page)) * PAGE_SIZE, bytes(fixed), enforce_nor=False))
+        if ops:
+            self.model.apply_batch(ops)
+        return SecDedReport(status)
+
+    def to_json(self) -> dict:
+        return {"codes": encode_array(self.codes), "secded": encode_array(self.secded_codes)}
+
+    def restore(self, meta: dict) -> None:
+        """Adopt stored codes as the reference for the model's current generations."""
+        self._codes = decode_array(meta["codes"], np.uint16, PAGES_TOTAL)
+        if "secded" in meta:
+            self._secded = decode_array(meta["secded"], np.uint16, PAGES_TOTAL)
+        else:
+            self._secded = self._compute(0, PAGES_TOTAL, secded_encode)
+        self._generation[:] = self.model.page_generation
+
+    def _compute(self, p0: int, p1: int, kernel) -> np.ndarray:
+        out = np.empty(p1 - p0, dtype=np.uint16)
+        for c0 in range(p0, p1, _CHUNK_PAGES):
+            c1 = min(c0 + _CHUNK_PAGES, p1)
+            out[c0 - p0 : c1 - p0] = kernel(self.model.read_view(c0 * PAGE_SIZE, (c1 - c0) * PAGE_SIZE))
+        return out
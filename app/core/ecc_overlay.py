@@ -4,27 +4,71 @@ from __future__ import annotations
 
 import numpy as np
 
+from .utils import POPCOUNT8, BufferLike, as_u8_array
+
 
 ECC_BITS = 10
 SEC_BITS = 9
+DATASET_SIZE = 0x100
+
+
+def _residue_luts() -> np.ndarray:
+    """(9, 256) uint16: SEC mask contributed by a byte at column ``c`` (bit ``t`` lands in ``(8c + t) % 9``)."""
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)  # (256, 8), MSB first
+    luts = np.zeros((SEC_BITS, 256), dtype=np.uint16)
+    for c in range(SEC_BITS):
+        for t in range(8):
+            luts[c] ^= bits[:, t].astype(np.uint16) << ((8 * c + t) % SEC_BITS)
+    return luts
+
+
+_SEC_LUTS = _residue_luts()
+_SEC_SHIFTS = np.arange(SEC_BITS, dtype=np.uint16)
 
 
-def ecc_for_dataset(dataset_bytes: bytes) -> np.ndarray:
-    arr = np.frombuffer(dataset_bytes, dtype=np.uint8)
-    bits = np.unpackbits(arr)
-    sec = np.zeros(SEC_BITS, dtype=np.uint8)
-    idx = np.arange(bits.size)
-    for k in range(SEC_BITS):
-        sec[k] = np.bitwise_xor.reduce(bits[idx % SEC_BITS == k]) if bits.size else 0
-    ded = (np.bitwise_xor.reduce(bits) if bits.size else 0) ^ np.bitwise_xor.reduce(sec)
-    return np.concatenate([[ded], sec]).astype(np.uint8)
+def ecc_bits_batch(datasets: BufferLike, dataset_size: int = DATASET_SIZE) -> np.ndarray:
+    """(N, 10) overlay bits ``[ded, sec0..sec8]`` for N consecutive ``dataset_size``-byte datasets.
 
+    SEC parity is linear, so bytes sharing a column mod 9 are XOR-folded first and only the
+    nine folded bytes per dataset go through the lookup tables.
+    """
+    arr = as_u8_array(datasets)
+    if dataset_size <= 0 or arr.size % dataset_size:
+        raise ValueError("buffer is not a whole number of datasets")
+    rows = arr.reshape(-1, dataset_size)
+    folded = np.zeros((rows.shape[0], SEC_BITS), dtype=np.uint8)
+    for c in range(min(SEC_BITS, dataset_size)):
+        np.bitwise_xor.reduce(rows[:, c::SEC_BITS], axis=1, out=folded[:, c])
+    sec = np.zeros(rows.shape[0], dtype=np.uint16)
+    for c in range(SEC_BITS):
+        sec ^= _SEC_LUTS[c][folded[:, c]]
+    out = np.empty((rows.shape[0], ECC_BITS), dtype=np.uint8)
+    out[:, 1:] = (sec[:, None] >> _SEC_SHIFTS) & 1
+    data_parity = POPCOUNT8[np.bitwise_xor.reduce(folded, axis=1)] & 1
+    out[:, 0] = data_parity ^ (out[:, 1:].sum(axis=1) & 1)
+    return out
 
-def ecc_matrix_for_sector(sector_bytes: bytes) -> np.ndarray:
-    if len(sector_bytes) != 0x10000:
+
+def ecc_for_dataset(dataset_bytes: BufferLike) -> np.ndarray:
+    arr = as_u8_array(dataset_bytes)
+    if not arr.size:
+        return np.zeros(ECC_BITS, dtype=np.uint8)
+    return ecc_bits_batch(arr, arr.size)[0]
+
+
+def ecc_matrix_for_sector(sector_bytes: BufferLike) -> np.ndarray:
+    sector_bytes = as_u8_array(sector_bytes)
+    if sector_bytes.size != 0x10000:
         raise ValueError("sector_bytes must be 64KiB")
-    matrix = np.zeros((ECC_BITS, 256), dtype=np.uint8)
-    for page in range(256):
-        start = page * 0x100
-        matrix[:, page] = ecc_for_dataset(sector_bytes[start : start + 0x100])
-    return matrix
+    return np.ascontiguousarray(ecc_bits_batch(sector_bytes).T)
+
+
+def ecc_for_chip(chip_bytes: BufferLike, chunk_datasets: int = 16384) -> np.ndarray:
+    """(datasets, 10) overlay bits for a whole dump, in bounded-memory chunks."""
+    arr = as_u8_array(chip_bytes)
+    count = arr.size // DATASET_SIZE
+    out = np.empty((count, ECC_BITS), dtype=np.uint8)
+    step = chunk_datasets * DATASET_SIZE
+    for i, pos in enumerate(range(0, count * DATASET_SIZE, step)):
+        out[i * chunk_datasets : (i + 1) * chunk_datasets] = ecc_bits_batch(arr[pos : pos + step])
+    return out
@@ -0,0 +1,249 @@
+"""Golden-image regression checks: digests of rendered sectors compared against a stored manifest.
+
+A golden directory holds ``manifest.json`` (render settings plus one digest per source, kind and
+sector) and ``images/<digest>.png`` with each distinct reference image once, so a mismatch can be
+shown as a per-pixel diff rather than just a changed hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from .addressing import SECTOR_SIZE, SECTORS_TOTAL, sector_start
+from .image_io import PngStreamWriter, read_png
+from .pyramid import LEVELS, level_denominator
+from .render import (
+    PALETTES,
+    Palette,
+    band_images_from_counts,
+    sector_band_images,
+    sector_detailed_images,
+    sector_thumbnails_from_stats,
+)
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+DIGEST_SIZE = 16
+DEFAULT_KINDS = ("thumb", "band", "detailed")
+_CHUNK = 32
+
+DIFF_SAME = np.array([235, 235, 235], dtype=np.uint8)
+DIFF_HOT = np.array([220, 30, 30], dtype=np.uint8)
+
+
+def _sectors(model, ids: list[int]) -> np.ndarray:
+    return np.stack([model.read_view(sector_start(sid), SECTOR_SIZE) for sid in ids])
+
+
+def _thumb(model, ids, bitorder, palette):
+    return sector_thumbnails_from_stats(model.page_zero_bits.reshape(SECTORS_TOTAL, -1)[ids], 48, 32, palette)
+
+
+def _band(model, ids, bitorder, palette):
+    return sector_band_images(_sectors(model, ids), 256, 64, bitorder, palette=palette)
+
+
+def _detailed(model, ids, bitorder, palette):
+    ecc = np.stack([model.ecc_index.sector_matrix(sid) for sid in ids])
+    return sector_detailed_images(_sectors(model, ids), 180, True, bitorder, "vertical", ecc, palette)
+
+
+def _pyramid(level: int):
+    def render(model, ids, bitorder, palette):
+        counts = model.sector_pyramid(bitorder).counts(ids, level)
+        return band_images_from_counts(counts, level_denominator(level), counts.shape[2], palette)
+
+    return render
+
+
+# kind -> render(model, sector_ids, bitorder, palette) -> (N, h, w, 3)
+RENDERS: dict[str, Callable] = {
+    "thumb": _thumb,  # LOD1 tile, from page statistics
+    "band": _band,  # LOD2 tile, from sector bytes
+    "detailed": _detailed,  # sector dock image with the ECC overlay
+    **{f"pyramid{level}": _pyramid(level) for level in range(LEVELS)},  # die-view tiles at native width
+}
+
+
+def image_digest(img: np.ndarray) -> str:
+    """BLAKE2b-128 of the packed pixels, with the shape mixed in so sizes never collide."""
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    h = hashlib.blake2b(np.asarray(img.shape, dtype="<u4").tobytes(), digest_size=DIGEST_SIZE)
+    h.update(img.data)
+    return h.hexdigest()
+
+
+def render_kind(model, kind: str, sector_ids, bitorder: str = "msb", palette: Palette | None = None) -> np.ndarray:
+    if kind not in RENDERS:
+        raise ValueError(f"unknown render kind: {kind}")
+    return RENDERS[kind](model, [int(s) for s in sector_ids], bitorder, palette)
+
+
+def _prepare(model, kinds, bitorder: str) -> None:
+    # Lazy model state is built once here, not raced by the render threads.
+    model.page_zero_bits
+    model.sector_digests.refresh()
+    if "detailed" in kinds:
+        model.ecc_index.refresh()
+    if any(k.startswith("pyramid") for k in kinds):
+        model.sector_pyramid(bitorder).refresh()
+
+
+def render_digests(
+    model,
+    sector_ids=None,
+    kinds=DEFAULT_KINDS,
+    bitorder: str = "msb",
+    palette: Palette | None = None,
+    workers: int | None = None,
+    dedupe: bool = True,
+    images: dict[str, np.ndarray] | None = None,
+) -> dict[str, str]:
+    """``{"<kind>/<sector>": digest}`` for every kind and sector, rendered on ``workers`` threads.
+
+    With ``dedupe`` each distinct sector content is rendered once per kind (every renderer is a
+    function of the sector bytes). ``images``, if given, collects each rendered image by digest.
+    """
+    ids = list(range(SECTORS_TOTAL)) if sector_ids is None else [int(s) for s in sector_ids]
+    for kind in kinds:
+        if kind not in RENDERS:
+            raise ValueError(f"unknown render kind: {kind}")
+    _prepare(model, kinds, bitorder)
+    groups: dict[object, list[int]] = {}
+    for sid in ids:
+        groups.setdefault(model.sector_digests[sid] if dedupe else sid, []).append(sid)
+    reps = [members[0] for members in groups.values()]
+
+    def job(kind: str, chunk: list[int]) -> list[tuple[str, np.ndarray]]:
+        return [(image_digest(img), img) for img in render_kind(model, kind, chunk, bitorder, palette)]
+
+    jobs = [(kind, reps[i : i + _CHUNK]) for kind in kinds for i in range(0, len(reps), _CHUNK)]
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(lambda args: job(*args), jobs))
+    out: dict[str, str] = {}
+    for (kind, chunk), rendered in zip(jobs, results):
+        for rep, (digest, img) in zip(chunk, rendered):
+            if images is not None:
+                images.setdefault(digest, img)
+            for sid in groups[model.sector_digests[rep] if dedupe else rep]:
+                out[f"{kind}/{sid:03d}"] = digest
+    return {key: out[key] for key in sorted(out)}
+
+
+def _parse_key(key: str) -> tuple[str, int]:
+    kind, _, sid = key.partition("/")
+    return kind, int(sid)
+
+
+def _write_png(path: Path, img: np.ndarray) -> None:
+    with PngStreamWriter(path, img.shape[1], img.shape[0]) as writer:
+        writer.write_rows(img)
+
+
+def record_golden(
+    golden_dir: str | Path,
+    sources: dict[str, object],
+    sector_ids=None,
+    kinds=DEFAULT_KINDS,
+    bitorder: str = "msb",
+    palette: str | None = None,
+    workers: int | None = None,
+    save_images: bool = True,
+) -> dict:
+    """Render ``sources`` (name -> model) and store their digests (and images) as the new golden set.
+
+    ``sector_ids`` is a list of ids or a callable ``model -> ids``; by default the whole chip.
+    """
+    golden_dir = Path(golden_dir)
+    image_dir = golden_dir / "images"
+    image_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "bitorder": bitorder, "palette": palette, "kinds": list(kinds), "sources": {}}
+    for name, model in sources.items():
+        ids = sector_ids(model) if callable(sector_ids) else sector_ids
+        images: dict[str, np.ndarray] | None = {} if save_images else None
+        manifest["sources"][name] = render_digests(model, ids, kinds, bitorder, PALETTES.get(palette), workers, images=images)
+        for digest, img in (images or {}).items():
+            if not (image_dir / f"{digest}.png").exists():
+                _write_png(image_dir / f"{digest}.png", img)
+    (golden_dir / MANIFEST).write_text(json.dumps(manifest, indent=1))
+    return manifest
+
+
+def load_golden(golden_dir: str | Path) -> dict:
+    manifest = json.loads((Path(golden_dir) / MANIFEST).read_text())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"unsupported golden manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def diff_image(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """``expected | actual | diff`` side by side; diff pixels go from light grey (equal) to red.
+
+    Any difference, even one level in one channel, is at least a third of the way to red.
+    """
+    if expected.shape != actual.shape:
+        h, w = max(expected.shape[0], actual.shape[0]), max(expected.shape[1], actual.shape[1])
+        pad = lambda img: np.pad(img, ((0, h - img.shape[0]), (0, w - img.shape[1]), (0, 0)), constant_values=255)
+        expected, actual = pad(expected), pad(actual)
+        changed = np.ones(expected.shape[:2], dtype=np.float32)
+    else:
+        delta = np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max(axis=2)
+        changed = np.where(delta > 0, 1 / 3 + delta / 255 * 2 / 3, 0).astype(np.float32)
+    heat = (DIFF_SAME + (DIFF_HOT.astype(np.float32) - DIFF_SAME) * changed[..., None] + 0.5).astype(np.uint8)
+    gap = np.full((expected.shape[0], 2, 3), 255, dtype=np.uint8)
+    return np.concatenate([expected, gap, actual, gap, heat], axis=1)
+
+
+@dataclass
+class GoldenReport:
+    checked: int = 0
+    mismatched: list[str] = field(default_factory=list)  # "<source>:<kind>/<sector>"
+    missing: list[str] = field(default_factory=list)  # golden sources not given to the check
+    diffs: list[Path] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatched and not self.missing
+
+
+def check_golden(
+    golden_dir: str | Path, sources: dict[str, object], diff_dir: str | Path | None = None, workers: int | None = None
+) -> GoldenReport:
+    """Re-render every golden entry of ``sources`` with the manifest's settings and compare digests.
+
+    Mismatches get ``<diff_dir>/<source>_<kind>_<sector>.png`` when the reference image was stored.
+    """
+    golden_dir = Path(golden_dir)
+    manifest = load_golden(golden_dir)
+    bitorder, palette = manifest["bitorder"], PALETTES.get(manifest["palette"])
+    report = GoldenReport(missing=sorted(set(manifest["sources"]) - set(sources)))
+    for name, model in sources.items():
+        expected = manifest["sources"].get(name)
+        if expected is None:
+            raise ValueError(f"no golden digests for source: {name}")
+        keys = [_parse_key(key) for key in expected]
+        kinds = list(dict.fromkeys(kind for kind, _ in keys))
+        ids = sorted({sid for _, sid in keys})
+        actual = render_digests(model, ids, kinds, bitorder, palette, workers)
+        report.checked += len(expected)
+        for key, digest in expected.items():
+            if actual.get(key) == digest:
+                continue
+            report.mismatched.append(f"{name}:{key}")
+            reference = golden_dir / "images" / f"{digest}.png"
+            if diff_dir is None or not reference.exists():
+                continue
+            kind, sid = _parse_key(key)
+            path = Path(diff_dir) / f"{name}_{kind}_{sid:03d}.png"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_png(path, diff_image(read_png(reference), render_kind(model, kind, [sid], bitorder, palette)[0]))
+            report.diffs.append(path)
+    return report
@@ -0,0 +1,121 @@
+"""Undo/redo history built from deduplicated, optionally compressed 4KiB block pre-images."""
+
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+# One step maps 4KiB block id -> digest of the block content to restore.
+Step = dict[int, bytes]
+
+
+class UndoHistory:
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024, compress: bool = True):
+        self.budget_bytes = budget_bytes
+        self.compress = compress
+        self.stored_bytes = 0
+        self._blobs: dict[bytes, list] = {}  # digest -> [payload, refcount]
+        self._undo: deque[Step] = deque()
+        self._redo: list[Step] = []
+        self._pending: Step | None = None
+        self._groups = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def begin(self) -> None:
+        if self._pending is None:  # inside a group the open step keeps collecting
+            self._pending = {}
+
+    def wants(self, block_id: int) -> bool:
+        return self._pending is not None and block_id not in self._pending
+
+    def capture(self, block_id: int, data: bytes) -> None:
+        if self.wants(block_id):
+            self._pending[block_id] = self.intern(data)
+
+    def commit(self) -> None:
+        if self._groups:
+            return
+        step, self._pending = self._pending, None
+        if not step:
+            return
+        self._undo.append(step)
+        while self._redo:
+            self.release(self._redo.pop())
+        self._enforce_budget()
+
+    @contextmanager
+    def group(self):
+        """Merge every batch applied inside the block into one undo step.
+
+        Each 4KiB block is captured once per step, so the step stays bounded by the blocks touched.
+        """
+        self.begin()
+        self._groups += 1
+        try:
+            yield
+        finally:
+            self._groups -= 1
+            self.commit()
+
+    def pop_undo(self) -> Step | None:
+        return self._undo.pop() if self._undo else None
+
+    def pop_redo(self) -> Step | None:
+        return self._redo.pop() if self._redo else None
+
+    def push_undo(self, step: Step) -> None:
+        self._undo.append(step)
+        self._enforce_budget()
+
+    def push_redo(self, step: Step) -> None:
+        self._redo.append(step)
+        self._enforce_budget()
+
+    def intern(self, data: bytes) -> bytes:
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        entry = self._blobs.get(key)
+        if entry is None:
+            payload = zlib.compress(data, 1) if self.compress else bytes(data)
+            self._blobs[key] = [payload, 1]
+            self.stored_bytes += len(payload)
+        else:
+            entry[1] += 1
+        return key
+
+    def load(self, key: bytes) -> bytes:
+        payload = self._blobs[key][0]
+        return zlib.decompress(payload) if self.compress else payload
+
+    def release(self, step: Step) -> None:
+        for key in step.values():
+            entry = self._blobs[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                self.stored_bytes -= len(entry[0])
+                del self._blobs[key]
+
+    def clear(self) -> None:
+        while self._undo:
+            self.release(self._undo.pop())
+        while self._redo:
+            self.release(self._redo.pop())
+
+    def trim(self, limit_bytes: int) -> None:
+        """Drop steps until at most ``limit_bytes`` are stored.
+
+        Oldest undo steps go first; redo steps only once no undo history is left.
+        """
+        while self.stored_bytes > limit_bytes and (self._undo or self._redo):
+            self.release(self._undo.popleft() if self._undo else self._redo.pop(0))
+
+    def _enforce_budget(self) -> None:
+        self.trim(self.budget_bytes)
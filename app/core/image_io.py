@@ -0,0 +1,172 @@
+"""Streaming RGB image writers: rows go to disk as they arrive, the full image is never held."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+class PngStreamWriter:
+    """8-bit RGB PNG written band by band through one zlib stream (Up filter)."""
+
+    def __init__(self, path: str | Path, width: int, height: int, level: int = 6):
+        self.width, self.height = width, height
+        self._rows = 0
+        self._prev = np.zeros(width * 3, dtype=np.uint8)
+        self._z = zlib.compressobj(level)
+        self._f = open(path, "wb")
+        self._f.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self._f.write(struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data)))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        flat = np.ascontiguousarray(rows, dtype=np.uint8).reshape(-1, self.width * 3)
+        filtered = np.empty((flat.shape[0], 1 + self.width * 3), dtype=np.uint8)
+        filtered[:, 0] = 2  # Up
+        filtered[:1, 1:] = flat[:1] - self._prev
+        filtered[1:, 1:] = flat[1:] - flat[:-1]
+        self._prev = flat[-1].copy()
+        self._rows += flat.shape[0]
+        data = self._z.compress(filtered.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._chunk(b"IDAT", self._z.flush())
+        self._chunk(b"IEND", b"")
+        self._f.close()
+        if self._rows != self.height:
+            raise ValueError(f"wrote {self._rows} rows, expected {self.height}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
+
+
+class TiffStreamWriter:
+    """Uncompressed 8-bit RGB baseline TIFF; fixed-height strips streamed, IFD appended at close."""
+
+    def __init__(self, path: str | Path, width: int, height: int, rows_per_strip: int = 64):
+        if width * height * 3 + (1 << 20) >= 1 << 32:
+            raise ValueError("TIFF output exceeds 4 GiB")
+        self.width, self.height, self.rows_per_strip = width, height, rows_per_strip
+        self._rows = 0
+        self._pending: list[np.ndarray] = []
+        self._pending_rows = 0
+        self._offsets: list[int] = []
+        self._counts: list[int] = []
+        self._f = open(path, "wb")
+        self._f.write(b"II*\x00" + struct.pack("<I", 0))  # IFD offset patched at close
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        flat = np.ascontiguousarray(rows, dtype=np.uint8).reshape(-1, self.width * 3)
+        self._rows += flat.shape[0]
+        self._pending.append(flat)
+        self._pending_rows += flat.shape[0]
+        if self._pending_rows >= self.rows_per_strip:
+            block = np.concatenate(self._pending)
+            cut = self._pending_rows - self._pending_rows % self.rows_per_strip
+            for i in range(0, cut, self.rows_per_strip):
+                self._write_strip(block[i : i + self.rows_per_strip])
+            self._pending = [block[cut:]]
+            self._pending_rows -= cut
+
+    def _write_strip(self, strip: np.ndarray) -> None:
+        self._offsets.append(self._f.tell())
+        self._counts.append(strip.nbytes)
+        self._f.write(strip.tobytes())
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        if self._pending_rows:
+            self._write_strip(np.concatenate(self._pending))
+        n = len(self._offsets)
+        pos = self._f.tell() + (self._f.tell() & 1)
+        extra = pos + 2 + 10 * 12 + 4  # count, 10 entries, next-IFD offset; out-of-line values follow
+        bits_off, offsets_off = extra, extra + 6
+        counts_off = offsets_off + 4 * n
+
+        tags = [
+            (256, 4, 1, self.width),
+            (257, 4, 1, self.height),
+            (258, 3, 3, bits_off),
+            (259, 3, 1, 1),  # no compression
+            (262, 3, 1, 2),  # RGB
+            (273, 4, n, self._offsets[0] if n == 1 else offsets_off),
+            (277, 3, 1, 3),
+            (278, 4, 1, self.rows_per_strip),
+            (279, 4, n, self._counts[0] if n == 1 else counts_off),
+            (284, 3, 1, 1),  # chunky
+        ]
+        ifd = struct.pack("<H", len(tags))
+        for tag, kind, count, value in tags:
+            packed = struct.pack("<HH", value, 0) if kind == 3 and count == 1 else struct.pack("<I", value)
+            ifd += struct.pack("<HHI", tag, kind, count) + packed
+        ifd += struct.pack("<I", 0)
+        self._f.seek(pos)
+        self._f.write(ifd + struct.pack("<3H", 8, 8, 8))
+        if n > 1:
+            self._f.write(struct.pack(f"<{n}I", *self._offsets) + struct.pack(f"<{n}I", *self._counts))
+        self._f.seek(4)
+        self._f.write(struct.pack("<I", pos))
+        self._f.close()
+        if self._rows != self.height:
+            raise ValueError(f"wrote {self._rows} rows, expected {self.height}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
+
+
+def open_image_writer(path: str | Path, width: int, height: int):
+    suffix = Path(path).suffix.lower()
+    if suffix == ".png":
+        return PngStreamWriter(path, width, height)
+    if suffix in (".tif", ".tiff"):
+        return TiffStreamWriter(path, width, height)
+    raise ValueError(f"Unsupported image format: {suffix or path}")
+
+
+def read_png(path: str | Path) -> np.ndarray:
+    """(h, w, 3) pixels of an 8-bit RGB PNG using the None/Up filters, as ``PngStreamWriter`` writes."""
+    data = Path(path).read_bytes()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"not a PNG file: {path}")
+    pos, idat, header = 8, [], None
+    while pos < len(data):
+        (n,), kind = struct.unpack(">I", data[pos : pos + 4]), data[pos + 4 : pos + 8]
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", data[pos + 8 : pos + 21])
+        elif kind == b"IDAT":
+            idat.append(data[pos + 8 : pos + 8 + n])
+        pos += 12 + n
+    if header is None or header[2:5] != (8, 2, 0) or header[6] != 0:
+        raise ValueError(f"only non-interlaced 8-bit RGB PNGs are supported: {path}")
+    w, h = header[:2]
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(h, 1 + w * 3)
+    if not np.isin(raw[:, 0], (0, 2)).all():
+        raise ValueError(f"unsupported PNG row filter: {path}")
+    rows = raw[:, 1:].copy()
+    # Up rows add the decoded row above; a None row restarts the running sum.
+    for y in np.flatnonzero(raw[:, 0] == 2).tolist():
+        if y:
+            rows[y] += rows[y - 1]
+    return rows.reshape(h, w, 3)
@@ -97,6 +97,50 @@ def sector_scene_xy(sector_id: int, cfg: SceneLayout) -> tuple[int, int]:
     return x, y
 
 
+def section8x2_array_width(cfg: SceneLayout) -> int:
+    section_w = 2 * cfg.tile_w + cfg.tile_gap
+    return 8 * section_w + 7 * cfg.block_gap
+
+
+def section8x2_geometry(cfg: SceneLayout, visible_rows: int = 16) -> tuple[int, int, int, int]:
+    """(array0 origin y, central strip y, array1 origin y, row pitch) of the 8x2 die view."""
+    row_pitch = cfg.tile_h + cfg.tile_gap
+    vis_rows = max(1, min(16, int(visible_rows)))
+    array_h = vis_rows * row_pitch - cfg.tile_gap
+    array0_origin_y = cfg.margin
+    central_strip_y = array0_origin_y + array_h + cfg.array_gap
+    array1_origin_y = central_strip_y + cfg.central_strip_h + cfg.array_gap
+    return array0_origin_y, central_strip_y, array1_origin_y, row_pitch
+
+
+def section8x2_scene_size(cfg: SceneLayout, visible_rows: int = 16) -> tuple[int, int]:
+    _, _, array1_origin_y, row_pitch = section8x2_geometry(cfg, visible_rows)
+    vis_rows = max(1, min(16, int(visible_rows)))
+    return section8x2_array_width(cfg) + cfg.margin * 2, array1_origin_y + vis_rows * row_pitch - cfg.tile_gap + cfg.margin
+
+
+def section8x2_xy(cfg: SceneLayout, sector_id: int) -> tuple[int, int]:
+    """(x, row) of a sector: 8 section columns, 2 physical columns per section, 16 rows contiguous."""
+    array_idx = 0 if sector_id < ARRAY_SECTORS else 1
+    in_array = sector_id if array_idx == 0 else sector_id - ARRAY_SECTORS
+    section_idx = in_array // 32
+    local = in_array % 32
+    group = local // 16
+    row = local % 16
+    col_in_section = 1 - group
+    section_w = 2 * cfg.tile_w + cfg.tile_gap
+    x = cfg.margin + section_idx * (section_w + cfg.block_gap) + col_in_section * (cfg.tile_w + cfg.tile_gap)
+    return x, row
+
+
+def section8x2_scene_xy(cfg: SceneLayout, sector_id: int, visible_rows: int = 16) -> tuple[int, int]:
+    """Absolute scene position of a sector tile in the 8x2 die view."""
+    array0_origin_y, _, array1_origin_y, row_pitch = section8x2_geometry(cfg, visible_rows)
+    x, row = section8x2_xy(cfg, sector_id)
+    y_base = array0_origin_y if sector_id < ARRAY_SECTORS else array1_origin_y
+    return x, y_base + row * row_pitch
+
+
 def row_sector_ids(array_idx: int, row: int) -> list[int]:
     if array_idx not in (0, 1):
         raise ValueError("array_idx must be 0 or 1")
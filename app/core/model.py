@@ -2,10 +2,29 @@
 
 from __future__ import annotations
 
+import mmap
+import os
+import time
+import weakref
 from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
 
-from .addressing import CAPACITY_BYTES, MAX_ADDRESS
-from .patterns import build_pattern_bytes
+import numpy as np
+
+from .addressing import CAPACITY_BYTES, MAX_ADDRESS, PAGE_SIZE, SECTOR_SIZE, SECTORS_TOTAL, SUB4_SIZE
+from .bulk import OP_ERASE, OP_PROGRAM, BulkOp, BulkStats, erase_op, program_op
+from .ecc_index import EccIndex
+from .history import Step, UndoHistory
+from .patterns import PatternPlan, compile_pattern
+from .pyramid import SectorPyramid
+from .sector_digest import SectorDigests
+from .utils import POPCOUNT8
+
+PAGES_TOTAL = CAPACITY_BYTES // PAGE_SIZE
+BLOCKS_TOTAL = CAPACITY_BYTES // SUB4_SIZE
+PAGES_PER_SECTOR = SECTOR_SIZE // PAGE_SIZE
+PAGES_PER_BLOCK = SUB4_SIZE // PAGE_SIZE
 
 
 @dataclass
@@ -13,25 +32,257 @@ class MemoryModel:
     enforce_nor: bool = True
 
     def __post_init__(self):
-        self.mem = bytearray([0xFF] * CAPACITY_BYTES)
+        self._init_storage()
+        self.sector_generation = np.zeros(SECTORS_TOTAL, dtype=np.uint32)
+        self.page_generation = np.zeros(PAGES_TOTAL, dtype=np.uint32)
+        self._journal: list[tuple[int, int]] = []
+        self._journal_limit = 1024
+        self._page_programmed = np.zeros(PAGES_TOTAL, dtype=np.uint16)
+        self._page_zero_bits = np.zeros(PAGES_TOTAL, dtype=np.uint16)
+        self._sector_programmed = np.zeros(SECTORS_TOTAL, dtype=np.uint32)
+        self._sector_zero_bits = np.zeros(SECTORS_TOTAL, dtype=np.uint32)
+        self._stats_ready = self._starts_erased
+        self.history: UndoHistory | None = UndoHistory()
+        # Wear counters per 4KiB block: erases count once per erase op covering the block,
+        # programs once per page programmed in it, however the writes were batched.
+        self.block_erase_count = np.zeros(BLOCKS_TOTAL, dtype=np.uint32)
+        self.block_program_count = np.zeros(BLOCKS_TOTAL, dtype=np.uint32)
+        self._ecc_index: EccIndex | None = None
+        self._sector_digests: SectorDigests | None = None
+        self._pyramids: dict[str, SectorPyramid] = {}
+
+    _starts_erased = True
+
+    def _init_storage(self):
+        self.mem = bytearray(b"\xFF" * CAPACITY_BYTES)
+        self._arr = np.frombuffer(self.mem, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        """Process memory held by the array contents (excluding undo history)."""
+        return CAPACITY_BYTES
 
     def read(self, start: int, size: int) -> bytes:
         self._validate_region(start, size)
         return bytes(self.mem[start : start + size])
 
-    def erase(self, region_start: int, region_size: int) -> None:
-        self._validate_region(region_start, region_size)
-        self.mem[region_start : region_start + region_size] = b"\xFF" * region_size
+    def read_view(self, start: int, size: int) -> np.ndarray:
+        """Read-only uint8 view of a region, aliasing the model's storage where it can (no copy).
+
+        Dense and mapped models return live views that reflect later program/erase calls and
+        must not outlive the model (for mapped models: must not be used after ``close()``).
+        Sparse models return a snapshot instead. Callers should therefore use the view before
+        the next write and not rely on either behaviour; use ``snapshot`` for data handed to
+        background tasks.
+        """
+        self._validate_region(start, size)
+        view = self._arr[start : start + size]
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self, start: int, size: int) -> np.ndarray:
+        """Immutable copy of a region, safe to keep across later writes."""
+        snap = np.array(self.read_view(start, size))
+        snap.flags.writeable = False
+        return snap
+
+    def erase(self, region_start: int, region_size: int) -> BulkStats:
+        return self.apply_batch([erase_op(region_start, region_size)])
+
+    def program(self, region_start: int, region_size: int, pattern_segments: list[dict], enforce_nor: bool | None = None) -> BulkStats:
+        return self.apply_batch([program_op(region_start, region_size, pattern_segments, enforce_nor)])
+
+    def apply_batch(self, ops: list[BulkOp]) -> BulkStats:
+        """Validate every op first, then apply them in order with NumPy views over ``mem``."""
+        plans = []  # compiled once here, so hex files are not decoded again when applied
+        for op in ops:
+            if op.kind not in (OP_PROGRAM, OP_ERASE):
+                raise ValueError(f"Unknown op kind: {op.kind}")
+            self._validate_region(op.start, op.size)
+            if op.data is not None and len(op.data) != op.size:
+                raise ValueError("op data length does not match size")
+            plans.append(compile_pattern(op.segments) if op.kind == OP_PROGRAM and op.data is None else None)
+        t0 = time.perf_counter()
+        total = 0
+        if self.history is not None:
+            self.history.begin()
+        # A failing op (e.g. a vanished source file) stops the batch, but whatever was already
+        # written is still marked dirty and committed as one undoable step.
+        try:
+            for op, plan in zip(ops, plans):
+                if op.size == 0:
+                    continue
+                self._capture_pre_images(op.start, op.size)
+                try:
+                    self._apply_op(op, plan)
+                finally:
+                    self.mark_dirty(op.start, op.size)
+                total += op.size
+        finally:
+            if self.history is not None:
+                self.history.commit()
+        return BulkStats(len(ops), total, time.perf_counter() - t0)
+
+    def _apply_op(self, op: BulkOp, plan: PatternPlan | None) -> None:
+        blocks = slice(op.start // SUB4_SIZE, (op.start + op.size - 1) // SUB4_SIZE + 1)
+        if op.kind == OP_ERASE:
+            self._fill(op.start, op.size, 0xFF)
+            self.block_erase_count[blocks] += 1
+            return
+        first_page, last_page = op.start // PAGE_SIZE, (op.start + op.size - 1) // PAGE_SIZE
+        self.block_program_count[blocks] += np.bincount(
+            np.arange(first_page, last_page + 1) // PAGES_PER_BLOCK - blocks.start
+        ).astype(np.uint32)
+        nor = self.enforce_nor if op.enforce_nor is None else op.enforce_nor
+        if op.data is not None:
+            self._write(op.start, np.frombuffer(op.data, dtype=np.uint8), nor)
+        else:
+            # Stream the compiled pattern through one reused chunk buffer.
+            pos = op.start
+            for chunk in plan.iter_chunks(op.size, base=op.start):
+                self._write(pos, chunk, nor)
+                pos += chunk.size
+
+    def undo(self) -> bool:
+        step = self.history.pop_undo() if self.history is not None else None
+        if step is None:
+            return False
+        self.history.push_redo(self._restore_blocks(step))
+        return True
+
+    def redo(self) -> bool:
+        step = self.history.pop_redo() if self.history is not None else None
+        if step is None:
+            return False
+        self.history.push_undo(self._restore_blocks(step))
+        return True
+
+    def _capture_pre_images(self, start: int, size: int) -> None:
+        if self.history is None:
+            return
+        for bid in range(start // SUB4_SIZE, (start + size - 1) // SUB4_SIZE + 1):
+            if self.history.wants(bid):
+                self.history.capture(bid, self.read_view(bid * SUB4_SIZE, SUB4_SIZE).tobytes())
+
+    def _restore_blocks(self, step: Step) -> Step:
+        """Write a step's block images back and return the images they replaced."""
+        replaced = {}
+        for bid, key in sorted(step.items()):
+            start = bid * SUB4_SIZE
+            replaced[bid] = self.history.intern(self.read_view(start, SUB4_SIZE).tobytes())
+            self._write(start, np.frombuffer(self.history.load(key), dtype=np.uint8), False)
+            self.mark_dirty(start, SUB4_SIZE)
+        self.history.release(step)
+        return replaced
+
+    def mark_dirty(self, start: int, size: int) -> None:
+        """Bump page/sector generations and journal the range; call after writing ``mem`` directly."""
+        self._validate_region(start, size)
+        if size == 0:
+            return
+        end = start + size - 1
+        self.page_generation[start // PAGE_SIZE : end // PAGE_SIZE + 1] += 1
+        self.sector_generation[start // SECTOR_SIZE : end // SECTOR_SIZE + 1] += 1
+        if self._stats_ready:
+            self._update_stats(start // PAGE_SIZE, end // PAGE_SIZE + 1)
+        if self._journal:
+            last_start, last_size = self._journal[-1]
+            if last_start <= start <= last_start + last_size:
+                self._journal[-1] = (last_start, max(last_size, end + 1 - last_start))
+                return
+        self._journal.append((start, size))
+        if len(self._journal) > self._journal_limit:
+            self._journal = _coalesce(self._journal)
+            self._journal_limit = max(1024, 2 * len(self._journal))
+
+    def drain_dirty(self) -> list[tuple[int, int]]:
+        """Return coalesced (start, size) ranges written since the last drain and reset the journal."""
+        ranges = _coalesce(self._journal)
+        self._journal = []
+        self._journal_limit = 1024
+        return ranges
+
+    # Per-page / per-sector aggregates: count of non-0xFF bytes and of zero bits.
+    @property
+    def page_programmed(self) -> np.ndarray:
+        self._ensure_stats()
+        return self._page_programmed
+
+    @property
+    def page_zero_bits(self) -> np.ndarray:
+        self._ensure_stats()
+        return self._page_zero_bits
+
+    @property
+    def sector_programmed(self) -> np.ndarray:
+        self._ensure_stats()
+        return self._sector_programmed
+
+    @property
+    def sector_zero_bits(self) -> np.ndarray:
+        self._ensure_stats()
+        return self._sector_zero_bits
+
+    @property
+    def sector_erased(self) -> np.ndarray:
+        return self.sector_programmed == 0
+
+    @property
+    def ecc_index(self) -> EccIndex:
+        if self._ecc_index is None:
+            self._ecc_index = EccIndex(self)
+        return self._ecc_index
+
+    @property
+    def sector_digests(self) -> SectorDigests:
+        if self._sector_digests is None:
+            self._sector_digests = SectorDigests(self)
+        return self._sector_digests
+
+    def sector_pyramid(self, bitorder: str = "msb") -> SectorPyramid:
+        if bitorder not in self._pyramids:
+            self._pyramids[bitorder] = SectorPyramid(self, bitorder)
+        return self._pyramids[bitorder]
+
+    def recompute_stats(self) -> None:
+        """Full-chip statistics in one vectorized pass over a (512, 256 pages, 256) reshape."""
+        data = self.read_view(0, CAPACITY_BYTES).reshape(SECTORS_TOTAL, PAGES_PER_SECTOR, PAGE_SIZE)
+        programmed = np.count_nonzero(data != 0xFF, axis=2)
+        zero_bits = PAGE_SIZE * 8 - POPCOUNT8[data].sum(axis=2, dtype=np.uint32)
+        self._page_programmed[:] = programmed.reshape(-1)
+        self._page_zero_bits[:] = zero_bits.reshape(-1)
+        self._sector_programmed[:] = programmed.sum(axis=1)
+        self._sector_zero_bits[:] = zero_bits.sum(axis=1)
+        self._stats_ready = True
 
-    def program(self, region_start: int, region_size: int, pattern_segments: list[dict], enforce_nor: bool | None = None):
-        self._validate_region(region_start, region_size)
-        data = build_pattern_bytes(pattern_segments, region_size)
-        nor = self.enforce_nor if enforce_nor is None else enforce_nor
+    def _ensure_stats(self) -> None:
+        if not self._stats_ready:
+            self.recompute_stats()
+
+    def _update_stats(self, first_page: int, end_page: int) -> None:
+        for p0 in range(first_page, end_page, 4096):
+            p1 = min(p0 + 4096, end_page)
+            data = self.read_view(p0 * PAGE_SIZE, (p1 - p0) * PAGE_SIZE).reshape(-1, PAGE_SIZE)
+            self._page_programmed[p0:p1] = np.count_nonzero(data != 0xFF, axis=1)
+            self._page_zero_bits[p0:p1] = PAGE_SIZE * 8 - POPCOUNT8[data].sum(axis=1, dtype=np.uint32)
+        s0, s1 = first_page // PAGES_PER_SECTOR, (end_page - 1) // PAGES_PER_SECTOR + 1
+        p0, p1 = s0 * PAGES_PER_SECTOR, s1 * PAGES_PER_SECTOR
+        self._sector_programmed[s0:s1] = self._page_programmed[p0:p1].reshape(-1, PAGES_PER_SECTOR).sum(axis=1)
+        self._sector_zero_bits[s0:s1] = self._page_zero_bits[p0:p1].reshape(-1, PAGES_PER_SECTOR).sum(axis=1)
+
+    def write_dump(self, path: str | Path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.mem)
+
+    def _fill(self, start: int, size: int, value: int) -> None:
+        self._arr[start : start + size] = value
+
+    def _write(self, start: int, data: np.ndarray, nor: bool) -> None:
+        dst = self._arr[start : start + data.size]
         if nor:
-            for i in range(region_size):
-                self.mem[region_start + i] &= data[i]
+            np.bitwise_and(dst, data, out=dst)
         else:
-            self.mem[region_start : region_start + region_size] = data
+            dst[:] = data
 
     def _validate_region(self, start: int, size: int):
         if size < 0:
@@ -39,3 +290,228 @@ class MemoryModel:
         end = start + size - 1 if size else start
         if start < 0 or end > MAX_ADDRESS:
             raise ValueError("region out of range")
+
+
+def _coalesce(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    out: list[list[int]] = []
+    for start, size in sorted(ranges):
+        if out and start <= out[-1][0] + out[-1][1]:
+            out[-1][1] = max(out[-1][1], start + size - out[-1][0])
+        else:
+            out.append([start, size])
+    return [(start, size) for start, size in out]
+
+
+@dataclass
+class SparseMemoryModel(MemoryModel):
+    """MemoryModel that only stores non-erased 4KiB blocks; absent blocks read as 0xFF."""
+
+    def _init_storage(self):
+        self._blocks: dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_dump(cls, path: str | Path, enforce_nor: bool = True) -> "SparseMemoryModel":
+        """Load a 32MiB dump keeping only its non-erased 4KiB blocks."""
+        model = cls(enforce_nor=enforce_nor)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) != CAPACITY_BYTES:
+                raise ValueError(f"dump must be exactly {CAPACITY_BYTES} bytes: {path}")
+            blocks = np.frombuffer(mm, dtype=np.uint8).reshape(-1, SUB4_SIZE)
+            for bid in np.flatnonzero((blocks != 0xFF).any(axis=1)):
+                model._blocks[int(bid)] = blocks[bid].copy()
+            del blocks
+        model.recompute_stats()
+        return model
+
+    @property
+    def block_count(self) -> int:
+        return len(self._blocks)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._blocks) * SUB4_SIZE
+
+    def read(self, start: int, size: int) -> bytes:
+        self._validate_region(start, size)
+        out = np.full(size, 0xFF, dtype=np.uint8)
+        for bid, off, pos, n in self._block_spans(start, size):
+            block = self._blocks.get(bid)
+            if block is not None:
+                out[pos : pos + n] = block[off : off + n]
+        return out.tobytes()
+
+    def read_view(self, start: int, size: int) -> np.ndarray:
+        """Always a read-only snapshot: blocks are allocated and freed by writes, so an alias would go stale."""
+        view = np.frombuffer(self.read(start, size), dtype=np.uint8)
+        view.flags.writeable = False
+        return view
+
+    def write_dump(self, path: str | Path) -> None:
+        erased = b"\xFF" * SUB4_SIZE
+        with open(path, "wb") as f:
+            for bid in range(CAPACITY_BYTES // SUB4_SIZE):
+                block = self._blocks.get(bid)
+                f.write(erased if block is None else block.tobytes())
+
+    def _fill(self, start: int, size: int, value: int) -> None:
+        for bid, off, _, n in self._block_spans(start, size):
+            block = self._blocks.get(bid)
+            if value == 0xFF:
+                if block is None:
+                    continue
+                if n == SUB4_SIZE:
+                    del self._blocks[bid]
+                    continue
+            elif block is None:
+                block = self._blocks[bid] = np.full(SUB4_SIZE, 0xFF, dtype=np.uint8)
+            block[off : off + n] = value
+            self._release_if_erased(bid, block)
+
+    def _write(self, start: int, data: np.ndarray, nor: bool) -> None:
+        for bid, off, pos, n in self._block_spans(start, data.size):
+            chunk = data[pos : pos + n]
+            block = self._blocks.get(bid)
+            if block is None:
+                if not (chunk != 0xFF).any():
+                    continue
+                block = self._blocks[bid] = np.full(SUB4_SIZE, 0xFF, dtype=np.uint8)
+            dst = block[off : off + n]
+            if nor:
+                np.bitwise_and(dst, chunk, out=dst)
+            else:
+                dst[:] = chunk
+                self._release_if_erased(bid, block)
+
+    def _release_if_erased(self, bid: int, block: np.ndarray) -> None:
+        if not (block != 0xFF).any():
+            del self._blocks[bid]
+
+    @staticmethod
+    def _block_spans(start: int, size: int):
+        pos = 0
+        while pos < size:
+            addr = start + pos
+            bid, off = divmod(addr, SUB4_SIZE)
+            n = min(SUB4_SIZE - off, size - pos)
+            yield bid, off, pos, n
+            pos += n
+
+
+@dataclass
+class MappedMemoryModel(MemoryModel):
+    """MemoryModel backed by an mmap of a dump file; pages are faulted in on first access.
+
+    With ``write_through`` program/erase go straight to the file. Otherwise the map is
+    copy-on-write and touched 4KiB blocks are written back only by ``flush()``.
+    """
+
+    path: str = ""
+    write_through: bool = False
+    _starts_erased = False
+
+    def _init_storage(self):
+        self._file = open(self.path, "r+b" if self.write_through else "rb")
+        if os.fstat(self._file.fileno()).st_size != CAPACITY_BYTES:
+            self._file.close()
+            raise ValueError(f"dump must be exactly {CAPACITY_BYTES} bytes: {self.path}")
+        access = mmap.ACCESS_WRITE if self.write_through else mmap.ACCESS_COPY
+        self.mem = mmap.mmap(self._file.fileno(), CAPACITY_BYTES, access=access)
+        self._arr = np.frombuffer(self.mem, dtype=np.uint8)
+        self._dirty_blocks: set[int] = set()
+
+    @property
+    def pending_blocks(self) -> int:
+        return len(self._dirty_blocks)
+
+    @property
+    def nbytes(self) -> int:
+        # Clean pages are backed by the file; only copy-on-write pages are private memory.
+        return len(self._dirty_blocks) * SUB4_SIZE
+
+    def flush(self) -> None:
+        if self.write_through:
+            self.mem.flush()
+        elif self._dirty_blocks:
+            with open(self.path, "r+b") as f:
+                for bid in sorted(self._dirty_blocks):
+                    f.seek(bid * SUB4_SIZE)
+                    f.write(self.mem[bid * SUB4_SIZE : (bid + 1) * SUB4_SIZE])
+        self._dirty_blocks.clear()
+
+    def write_dump(self, path: str | Path) -> None:
+        if Path(path).resolve() == Path(self.path).resolve():
+            self.flush()
+        else:
+            super().write_dump(path)
+
+    def close(self) -> None:
+        self._arr = None
+        try:
+            self.mem.close()
+        except BufferError:
+            pass  # outstanding read_view()s keep the mapping alive until they are released
+        self._file.close()
+
+    def _fill(self, start: int, size: int, value: int) -> None:
+        super()._fill(start, size, value)
+        self._mark_blocks(start, size)
+
+    def _write(self, start: int, data: np.ndarray, nor: bool) -> None:
+        super()._write(start, data, nor)
+        self._mark_blocks(start, data.size)
+
+    def _mark_blocks(self, start: int, size: int) -> None:
+        if not self.write_through and size:
+            self._dirty_blocks.update(range(start // SUB4_SIZE, (start + size - 1) // SUB4_SIZE + 1))
+
+
+def _release_segment(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        pass  # outstanding read_view()s keep the mapping alive until they are released
+    shm.unlink()
+
+
+class SharedMemoryModel(MemoryModel):
+    """Dense model whose array is a ``multiprocessing.shared_memory`` segment, so worker
+    processes can attach by ``shm_name`` and read sectors without copies."""
+
+    def _init_storage(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=CAPACITY_BYTES)
+        # Unlink even if the model is never closed (garbage collected, or still open at exit).
+        self._unlink = weakref.finalize(self, _release_segment, self._shm)
+        self.mem = self._shm.buf
+        self._arr = np.ndarray(CAPACITY_BYTES, dtype=np.uint8, buffer=self._shm.buf)
+        self._arr[:] = 0xFF
+
+    @classmethod
+    def from_dump(cls, path: str | Path, enforce_nor: bool = True) -> "SharedMemoryModel":
+        """Copy a 32MiB dump into a new shared segment."""
+        model = cls(enforce_nor=enforce_nor)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size != CAPACITY_BYTES:
+                    raise ValueError(f"dump must be exactly {CAPACITY_BYTES} bytes: {path}")
+                f.readinto(model._shm.buf)
+        except (OSError, ValueError):
+            model.close()
+            raise
+        model.recompute_stats()
+        return model
+
+    @property
+    def shm_name(self) -> str:
+        return self._shm.name
+
+    @property
+    def closed(self) -> bool:
+        return self._arr is None
+
+    def close(self) -> None:
+        """Unlink the segment; render pools tell their workers to drop it on their next job."""
+        if self._arr is None:
+            return
+        self._arr = None
+        self.mem = None
+        self._unlink()
@@ -0,0 +1,167 @@
+"""Headless full-die mosaic: all 512 sectors in the 8x2 die-view layout, streamed to an image file."""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from .addressing import SECTOR_SIZE, SECTORS_TOTAL, sector_start
+from .image_io import open_image_writer
+from .layout import SceneLayout, section8x2_array_width, section8x2_geometry, section8x2_scene_size, section8x2_scene_xy
+from .pyramid import level_for_rows
+from .render import Palette, sector_band_images, sector_state_colors
+from .render_pool import ProcessRenderPool
+
+BACKGROUND = np.array([255, 255, 255], dtype=np.uint8)
+STRIP = np.array([40, 50, 45], dtype=np.uint8)
+TILE_BORDER = np.array([60, 90, 60], dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class MosaicTile:
+    sector_id: int
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+
+def mosaic_tiles(scale: float, cfg: SceneLayout = SceneLayout(), visible_rows: int = 16) -> tuple[int, int, list[MosaicTile]]:
+    """Output size and pixel rectangles of the visible sector tiles, snapped so neighbours never overlap."""
+    scene_w, scene_h = section8x2_scene_size(cfg, visible_rows)
+    tiles = []
+    for sid in range(SECTORS_TOTAL):
+        if sid % 16 >= visible_rows:
+            continue
+        x, y = section8x2_scene_xy(cfg, sid, visible_rows)
+        tiles.append(MosaicTile(sid, round(x * scale), round(y * scale), round((x + cfg.tile_w) * scale), round((y + cfg.tile_h) * scale)))
+    return round(scene_w * scale), round(scene_h * scale), tiles
+
+
+def render_mosaic_tile(
+    model, tile: MosaicTile, lod: int, bitorder: str = "msb", border: bool = True, palette: Palette | None = None
+) -> np.ndarray:
+    """(h, w, 3) pixels of one tile rendered directly at its output size."""
+    w, h = tile.x1 - tile.x0, tile.y1 - tile.y0
+    sid = tile.sector_id
+    if lod <= 0:
+        img = np.empty((h, w, 3), dtype=np.uint8)
+        img[:] = sector_state_colors(model.sector_programmed[sid : sid + 1])[0]
+    elif lod == 1:
+        # What the die view shows at this size: the pyramid level it picks, scaled to the tile.
+        img = resize_nearest(model.sector_pyramid(bitorder).images([sid], level_for_rows(h), palette)[0], w, h)
+    else:
+        img = sector_band_images(model.read_view(sector_start(sid), SECTOR_SIZE)[None], w, h, bitorder, palette=palette)[0]
+    return _draw_border(img) if border else img
+
+
+def resize_nearest(img: np.ndarray, w: int, h: int) -> np.ndarray:
+    """Nearest-neighbour resize of an (h, w, 3) image (pixel centres, like an unsmoothed pixmap draw)."""
+    rows = ((np.arange(h) + 0.5) * img.shape[0] / h).astype(np.intp)
+    cols = ((np.arange(w) + 0.5) * img.shape[1] / w).astype(np.intp)
+    return img[rows[:, None], cols]
+
+
+def _draw_border(img: np.ndarray) -> np.ndarray:
+    if img.shape[0] > 2 and img.shape[1] > 2:
+        img[[0, -1], :] = TILE_BORDER
+        img[:, [0, -1]] = TILE_BORDER
+    return img
+
+
+def _pooled_tile(processes: ProcessRenderPool, model, tile: MosaicTile, bitorder: str, palette: Palette | None) -> np.ndarray:
+    result = processes.band_images(model, [tile.sector_id], tile.x1 - tile.x0, tile.y1 - tile.y0, bitorder, palette)
+    try:
+        img = result.result()[0].copy()
+    finally:
+        result.release()
+    return _draw_border(img)
+
+
+def render_mosaic(
+    model,
+    path: str | Path,
+    lod: int = 2,
+    scale: float = 4.0,
+    bitorder: str = "msb",
+    visible_rows: int = 16,
+    cfg: SceneLayout = SceneLayout(),
+    band_rows: int = 256,
+    workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    palette: Palette | None = None,
+    processes: ProcessRenderPool | None = None,
+) -> tuple[int, int]:
+    """Render every sector into one PNG/TIFF, ``band_rows`` output rows at a time.
+
+    Tiles are rendered on a thread pool one tile row ahead of the band being written and dropped
+    once written, so memory stays around two tile rows plus one band (and one copy per repeated
+    sector content) regardless of output size. With ``processes`` (and a shared-memory model)
+    LOD 2 tiles render on worker processes; the threads then only dispatch and compose.
+
+    LOD 1 matches the die view (pyramid band images); LOD 2 renders each tile from the sector
+    bytes at full output resolution. LOD 0 uses the plain state colours: the view's wear and
+    ECC status overlays are not exported.
+    """
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+    width, height, tiles = mosaic_tiles(scale, cfg, visible_rows)
+    _, strip_y, _, _ = section8x2_geometry(cfg, visible_rows)
+    strip = (
+        round(cfg.margin * scale),
+        round(strip_y * scale),
+        round((cfg.margin + section8x2_array_width(cfg)) * scale),
+        round((strip_y + cfg.central_strip_h) * scale),
+    )
+    # Force lazy model state on this thread before workers read it.
+    _ = model.sector_programmed
+    if lod == 1:
+        model.sector_pyramid(bitorder).refresh(processes)
+    digests = model.sector_digests.digests if lod > 0 else None
+    tiles.sort(key=lambda t: (t.y0, t.x0))
+    keys = [(digests[t.sector_id] if digests else t.sector_id, t.x1 - t.x0, t.y1 - t.y0) for t in tiles]
+    uses = Counter(keys)
+    # Equal sectors of equal size render once; a result is kept until its last tile is written.
+    shared: dict[tuple, object] = {}
+    use_processes = lod >= 2 and processes is not None and processes.supports(model)
+    pending: dict[int, object] = {}
+    next_tile = 0
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool, open_image_writer(path, width, height) as writer:
+        for b0 in range(0, height, band_rows):
+            b1 = min(b0 + band_rows, height)
+            # Submit tiles starting before the end of the next band (one band of look-ahead).
+            while next_tile < len(tiles) and tiles[next_tile].y0 < b1 + band_rows:
+                key = keys[next_tile]
+                if key not in shared and use_processes:
+                    shared[key] = pool.submit(_pooled_tile, processes, model, tiles[next_tile], bitorder, palette)
+                elif key not in shared:
+                    shared[key] = pool.submit(render_mosaic_tile, model, tiles[next_tile], lod, bitorder, True, palette)
+                pending[next_tile] = shared[key]
+                next_tile += 1
+            band = np.empty((b1 - b0, width, 3), dtype=np.uint8)
+            band[:] = BACKGROUND
+            sx0, sy0, sx1, sy1 = strip
+            if sy0 < b1 and sy1 > b0:
+                band[max(sy0, b0) - b0 : min(sy1, b1) - b0, sx0:sx1] = STRIP
+            for idx in sorted(pending):
+                tile = tiles[idx]
+                if tile.y0 >= b1 or tile.y1 <= b0:
+                    continue
+                img = pending[idx].result()
+                r0, r1 = max(tile.y0, b0), min(tile.y1, b1)
+                band[r0 - b0 : r1 - b0, tile.x0 : tile.x1] = img[r0 - tile.y0 : r1 - tile.y0]
+                if tile.y1 <= b1:
+                    del pending[idx]
+                    uses[keys[idx]] -= 1
+                    if not uses[keys[idx]]:
+                        del shared[keys[idx]]
+            writer.write_rows(band)
+            if progress is not None:
+                progress(b1, height)
+    return width, height
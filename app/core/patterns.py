@@ -2,7 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+import mmap
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
 
 
 def _parse_hex_stream(text: str) -> bytes:
@@ -23,32 +32,265 @@ def _repeat_to_size(chunk: bytes, size: int) -> bytes:
     return (chunk * times)[:size]
 
 
-def segment_to_bytes(seg_type: str, value, size_bytes: int) -> bytes:
+def _segment_payload(seg_type: str, value) -> bytes:
     if seg_type == "text":
-        payload = str(value).encode("utf-8")
-    elif seg_type == "hex":
-        payload = _parse_hex_stream(str(value))
-    elif seg_type == "fill":
+        return str(value).encode("utf-8")
+    if seg_type == "hex":
+        return _parse_hex_stream(str(value))
+    if seg_type == "fill":
         text = str(value).strip()
         # Accept both decimal (170) and prefixed bases (0xAA, 0b1010, 0o12).
         v = int(text, 0) if text else 0
         if not 0 <= v <= 255:
             raise ValueError("fill value must be 0..255")
-        payload = bytes([v])
+        return bytes([v])
+    if seg_type in ("walk1", "walk0"):
+        # 32 little-endian 32-bit words, each with a single bit set (or cleared).
+        words = np.left_shift(np.uint32(1), np.arange(32, dtype=np.uint32)).astype("<u4")
+        return (words if seg_type == "walk1" else ~words).tobytes()
+    raise ValueError(f"Unknown segment type: {seg_type}")
+
+
+# A generator fills ``dest`` given the segment-relative offset and absolute address of ``dest[0]``.
+Generator = Callable[[np.ndarray, int, int], None]
+
+
+def _seed(value) -> int:
+    text = str(value).strip()
+    return int(text, 0) & 0xFFFF_FFFF_FFFF_FFFF if text else 0
+
+
+def _prng(value, options: dict) -> Generator:
+    """Counter-based splitmix64 keyed by seed and 8-byte word index, so any chunk can be produced independently."""
+    seed = np.uint64(_seed(value))
+
+    def generate(dest: np.ndarray, pos: int, addr: int) -> None:
+        w0, w1 = pos // 8, (pos + dest.size + 7) // 8
+        z = np.arange(w0 + 1, w1 + 1, dtype=np.uint64)
+        z *= np.uint64(0x9E3779B97F4A7C15)
+        z += seed
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(0xBF58476D1CE4E5B9)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        lo = pos - w0 * 8
+        dest[:] = z.astype("<u8", copy=False).view(np.uint8)[lo : lo + dest.size]
+
+    return generate
+
+
+def _addr32(dtype: str) -> Callable[[object, dict], Generator]:
+    def make(value, options: dict) -> Generator:
+        def generate(dest: np.ndarray, pos: int, addr: int) -> None:
+            a0 = addr & ~3
+            words = np.arange(a0, addr + dest.size, 4, dtype=np.uint64) & np.uint64(0xFFFF_FFFF)
+            lo = addr - a0
+            dest[:] = words.astype(dtype).view(np.uint8)[lo : lo + dest.size]
+
+        return generate
+
+    return make
+
+
+def _checker(inverse: bool) -> Callable[[object, dict], Generator]:
+    """Physical checkerboard for the 256-bit word band layout of ``sector_band_image``.
+
+    Word ``w`` of a sector lands in band row ``w % 16`` of column ``w // 16`` for every bit plane, so
+    alternating whole words (flipping phase each column) checkers the die view; the period is 1 KiB.
+    """
+    w = np.arange(32)
+    period = np.repeat(np.where(((w & 15) + (w >> 4)) & 1, 0x00, 0xFF).astype(np.uint8), 32)
+    if inverse:
+        period = ~period
+
+    def make(value, options: dict) -> Generator:
+        def generate(dest: np.ndarray, pos: int, addr: int) -> None:
+            _tile_into(dest, period, addr % period.size)
+
+        return generate
+
+    return make
+
+
+HEX_TEXT_SUFFIXES = (".hex",)
+
+
+def _read_hex_text(path: Path) -> bytes:
+    text = path.read_text(encoding="ascii", errors="replace")
+    try:
+        return bytes.fromhex(text.replace(",", " ").replace("0x", "").replace("0X", ""))
+    except ValueError:
+        return _parse_hex_stream(text)
+
+
+def _is_hex_file(path: Path, options: dict) -> bool:
+    fmt = str(options.get("format", "auto"))
+    if fmt not in ("auto", "hex", "binary"):
+        raise ValueError(f"Unknown file format: {fmt}")
+    return fmt == "hex" or (fmt == "auto" and path.suffix.lower() in HEX_TEXT_SUFFIXES)
+
+
+def _copy_padded(dest: np.ndarray, src, pos: int, avail: int) -> None:
+    """Copy ``src[pos:pos + dest.size]`` into ``dest``; bytes past ``avail`` read as erased."""
+    n = max(0, min(dest.size, avail - pos))
+    if n:
+        dest[:n] = np.frombuffer(src, dtype=np.uint8, count=n, offset=pos)
+    dest[n:] = 0xFF
+
+
+def _file(value, options: dict) -> Generator:
+    """Contents of a file slice (``offset``/``length`` options); the rest of the segment reads as erased.
+
+    Binary files are mapped per chunk rather than read up front. Hex text is decoded once, for
+    ``.hex`` files or with ``format="hex"``; ``format="binary"`` programs any file verbatim.
+    """
+    path = Path(str(value))
+    offset = int(str(options.get("offset", 0)), 0)
+    if _is_hex_file(path, options):
+        data = _read_hex_text(path)
+        start, avail = offset, max(0, len(data) - offset)
     else:
-        raise ValueError(f"Unknown segment type: {seg_type}")
-    return _repeat_to_size(payload, size_bytes)
+        data = None
+        start, avail = offset, max(0, path.stat().st_size - offset)
+    if "length" in options:
+        avail = min(avail, int(str(options["length"]), 0))
+
+    def generate(dest: np.ndarray, pos: int, addr: int) -> None:
+        if data is not None or pos >= avail:
+            _copy_padded(dest, data or b"", start + pos, start + avail)
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _copy_padded(dest, mm, start + pos, start + avail)
+
+    return generate
+
+
+GENERATED_TYPES: dict[str, Callable[[object, dict], Generator]] = {
+    "prng": _prng,
+    "addr32le": _addr32("<u4"),
+    "addr32be": _addr32(">u4"),
+    "checker": _checker(False),
+    "checker_inv": _checker(True),
+    "file": _file,
+}
+SEGMENT_TYPES = ("fill", "hex", "text", "prng", "addr32le", "addr32be", "checker", "checker_inv", "walk1", "walk0", "file")
+
+
+def segment_to_bytes(seg_type: str, value, size_bytes: int) -> bytes:
+    if seg_type in GENERATED_TYPES:
+        return compile_pattern([{"type": seg_type, "value": value, "size_bytes": size_bytes}]).to_bytes(size_bytes)
+    return _repeat_to_size(_segment_payload(seg_type, value), size_bytes)
+
+
+def _tile_into(dst: np.ndarray, period: np.ndarray, phase: int) -> None:
+    """Fill ``dst`` with ``period`` repeated, starting ``phase`` bytes into it, by doubling copies."""
+    n = dst.size
+    if n == 0:
+        return
+    p = period.size
+    k = min(p - phase, n)
+    dst[:k] = period[phase : phase + k]
+    if k < n:
+        m = min(phase, n - k)
+        dst[k : k + m] = period[:m]
+        k += m
+    while k < n:
+        m = min(k, n - k)
+        dst[k : k + m] = dst[:m]
+        k += m
+
+
+@dataclass(frozen=True)
+class CompiledSegment:
+    offset: int
+    size: int
+    period: np.ndarray | None = None  # repeated to fill ``size`` bytes
+    generate: Generator | None = None  # position-dependent content instead of a period
 
 
-def build_pattern_bytes(pattern_segments: Iterable[dict], target_size: int) -> bytes:
-    out = bytearray()
-    for segment in pattern_segments:
-        size = int(segment["size_bytes"])
+@dataclass(frozen=True)
+class PatternPlan:
+    segments: tuple[CompiledSegment, ...]
+
+    @property
+    def size(self) -> int:
+        return self.segments[-1].offset + self.segments[-1].size if self.segments else 0
+
+    def write_into(self, dest: np.ndarray, offset: int = 0, base: int = 0) -> None:
+        """Fill ``dest`` with pattern bytes ``[offset, offset + dest.size)``; past the segments is 0xFF.
+
+        ``base`` is the memory address of pattern byte 0, used by address-dependent segment types.
+        """
+        end = offset + dest.size
+        covered = offset
+        for seg in self.segments:
+            s0, s1 = max(seg.offset, offset), min(seg.offset + seg.size, end)
+            if s0 >= s1:
+                continue
+            out = dest[s0 - offset : s1 - offset]
+            if seg.generate is not None:
+                seg.generate(out, s0 - seg.offset, base + s0)
+            else:
+                _tile_into(out, seg.period, (s0 - seg.offset) % seg.period.size)
+            covered = s1
+        if covered < end:
+            dest[covered - offset :] = 0xFF
+
+    def iter_chunks(self, total: int, chunk_size: int = CHUNK_SIZE, base: int = 0) -> Iterator[np.ndarray]:
+        """Yield ``total`` pattern bytes as successive views of one reused chunk buffer."""
+        buf = np.empty(min(chunk_size, max(total, 0)), dtype=np.uint8)
+        for pos in range(0, total, chunk_size):
+            view = buf[: min(chunk_size, total - pos)]
+            self.write_into(view, pos, base)
+            yield view
+
+    def to_bytes(self, total: int, base: int = 0) -> bytes:
+        out = np.empty(max(total, 0), dtype=np.uint8)
+        self.write_into(out, 0, base)
+        return out.tobytes()
+
+
+def _segment_key(segment: dict) -> tuple:
+    options = {k: str(v) for k, v in segment.items() if k not in ("type", "size_bytes", "value")}
+    if segment["type"] == "file":
+        # Re-compile when the file changes on disk.
+        try:
+            st = os.stat(str(segment.get("value", "")))
+        except OSError as exc:
+            raise ValueError(f"cannot read pattern file: {exc}") from exc
+        options["_stat"] = f"{st.st_mtime_ns}:{st.st_size}"
+    extra = tuple(sorted(options.items()))
+    return (segment["type"], int(segment["size_bytes"]), str(segment.get("value", "")), extra)
+
+
+@lru_cache(maxsize=256)
+def _compile(keys: tuple) -> PatternPlan:
+    compiled = []
+    offset = 0
+    for seg_type, size, value, extra in keys:
         if size <= 0:
             continue
-        out.extend(segment_to_bytes(segment["type"], segment.get("value", ""), size))
-        if len(out) >= target_size:
-            return bytes(out[:target_size])
-    if len(out) < target_size:
-        out.extend([0xFF] * (target_size - len(out)))
-    return bytes(out[:target_size])
+        if seg_type in GENERATED_TYPES:
+            compiled.append(CompiledSegment(offset, size, generate=GENERATED_TYPES[seg_type](value, dict(extra))))
+        else:
+            payload = _segment_payload(seg_type, value) or b"\xFF"
+            compiled.append(CompiledSegment(offset, size, np.frombuffer(payload, dtype=np.uint8)))
+        offset += size
+    return PatternPlan(tuple(compiled))
+
+
+def compile_pattern(pattern_segments: Iterable[dict]) -> PatternPlan:
+    """Compile a segment list once; identical lists hit the cache and skip parsing entirely.
+
+    Plans holding decoded hex-file payloads are built fresh each time, so the cache never pins file data.
+    """
+    segments = list(pattern_segments)
+    keys = tuple(_segment_key(seg) for seg in segments)
+    if any(seg["type"] == "file" and _is_hex_file(Path(str(seg.get("value", ""))), seg) for seg in segments):
+        return _compile.__wrapped__(keys)
+    return _compile(keys)
+
+
+def build_pattern_bytes(pattern_segments: Iterable[dict], target_size: int, base_address: int = 0) -> bytes:
+    return compile_pattern(pattern_segments).to_bytes(target_size, base_address)
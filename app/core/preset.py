@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from .addressing import SECTOR_SIZE, sector_start
-from .render import sector_thumbnail, thumbnail_hash
+from .bulk import BulkStats, erase_op, program_op
+from .golden import render_digests
 
 
 @dataclass(frozen=True)
@@ -14,7 +15,7 @@ class ValidationResult:
     match: bool
 
 
-def apply_paper_like_preset(model) -> None:
+def apply_paper_like_preset(model) -> BulkStats:
     patterns = {
         0: [{"type": "text", "size_bytes": SECTOR_SIZE, "value": "D"}],
         1: [{"type": "text", "size_bytes": SECTOR_SIZE, "value": "Da"}],
@@ -39,18 +40,18 @@ def apply_paper_like_preset(model) -> None:
         14: [{"type": "fill", "size_bytes": SECTOR_SIZE, "value": 0x55}],
         15: [{"type": "fill", "size_bytes": SECTOR_SIZE, "value": 0xAA}],
     }
+    ops = []
     for sid in range(16):
         start = sector_start(sid)
-        model.erase(start, SECTOR_SIZE)
-        model.program(start, SECTOR_SIZE, patterns[sid], enforce_nor=True)
+        ops.append(erase_op(start, SECTOR_SIZE))
+        ops.append(program_op(start, SECTOR_SIZE, patterns[sid], enforce_nor=True))
+    return model.apply_batch(ops)
 
 
 def validate_paper_like_hashes(model, bitorder: str = "msb") -> tuple[dict[int, str], list[ValidationResult]]:
-    hashes: dict[int, str] = {}
-    for sid in range(16):
-        start = sector_start(sid)
-        thumb = sector_thumbnail(model.read(start, SECTOR_SIZE), width=48, height=32, bitorder=bitorder)
-        hashes[sid] = thumbnail_hash(thumb)
+    # No dedupe: each sector of a pair is rendered on its own, so equal digests mean equal pixels.
+    digests = render_digests(model, range(16), ("thumb",), bitorder, workers=1, dedupe=False)
+    hashes = {sid: digests[f"thumb/{sid:03d}"] for sid in range(16)}
 
     pairs = [(0, 12), (7, 10), (5, 8), (6, 11)]
     results = [
@@ -0,0 +1,133 @@
+"""Per-sector mipmap pyramids of band ones-counts, kept in step with the model's page generations."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from .addressing import CAPACITY_BYTES, PAGE_SIZE, SECTOR_SIZE, SECTORS_TOTAL
+from .render import Palette, _band_vertical, band_images_from_counts
+
+WORD_BITS = 256
+BASE_ROWS = 64  # 4 bit planes x 16 word rows per cell
+BASE_COLS = SECTOR_SIZE * 8 // WORD_BITS // 16  # 128 band columns of 16 words
+LEVELS = 5  # 64x128 down to 4x8
+COLUMN_BYTES = 16 * WORD_BITS // 8  # one band column: 512 contiguous bytes, two pages
+COLUMNS_TOTAL = CAPACITY_BYTES // COLUMN_BYTES
+PLANES_PER_ROW = WORD_BITS * 16 // BASE_ROWS
+_BUILD_SECTORS = 32
+
+
+def level_shape(level: int) -> tuple[int, int]:
+    return BASE_ROWS >> level, BASE_COLS >> level
+
+
+def level_denominator(level: int) -> int:
+    """Bits behind one cell of ``level``: counts divide by this to give the mean bit value."""
+    return PLANES_PER_ROW * 4**level
+
+
+def level_for_rows(rows: float) -> int:
+    """Coarsest level that still has a cell row per output pixel row of a tile ``rows`` pixels tall."""
+    level = int(np.floor(np.log2(BASE_ROWS / max(rows, 1.0))))
+    return max(0, min(LEVELS - 1, level))
+
+
+def _column_counts(data: np.ndarray, bitorder: str) -> np.ndarray:
+    """(N, 512) band columns -> (N, 64) ones counts of each base cell."""
+    counts, _ = _band_vertical(data, 16, 1, BASE_ROWS, bitorder, WORD_BITS)
+    return counts[:, :, 0]
+
+
+def _pool(level: np.ndarray) -> np.ndarray:
+    return level[..., 0::2, 0::2] + level[..., 1::2, 0::2] + level[..., 0::2, 1::2] + level[..., 1::2, 1::2]
+
+
+class SectorPyramid:
+    """Band ones-counts of every sector at ``LEVELS`` resolutions for one bit order.
+
+    Level 0 pools 4 bit planes x 16 words per cell; each further level is a 2x2 sum of the one
+    below, so every die-view zoom is served without touching sector bytes. A programmed page
+    only recomputes its 512-byte band column and the cells above it. Render threads may refresh
+    and read it concurrently.
+    """
+
+    def __init__(self, model, bitorder: str = "msb"):
+        self.model = model
+        self.bitorder = bitorder
+        self._levels: list[np.ndarray] | None = None
+        self._generation = np.zeros(CAPACITY_BYTES // PAGE_SIZE, dtype=np.uint32)
+        self._sector_generation = np.zeros(SECTORS_TOTAL, dtype=np.uint32)
+        self._lock = threading.RLock()
+
+    def refresh(self, pool=None) -> int:
+        """Recompute stale band columns; returns how many were read.
+
+        A ``ProcessRenderPool`` that supports the model spreads the initial full build over its workers.
+        """
+        with self._lock:
+            return self._refresh(pool)
+
+    def _refresh(self, pool) -> int:
+        # Generations before reading: a write racing the read leaves its columns stale for next time.
+        gen, sector_gen = self.model.page_generation.copy(), self.model.sector_generation.copy()
+        if self._levels is None:
+            self._build(pool if pool is not None and pool.supports(self.model) else None)
+            self._generation[:] = gen
+            self._sector_generation[:] = sector_gen
+            return COLUMNS_TOTAL
+        # Sector generations move with page generations: narrow down per sector first.
+        dirty = np.flatnonzero(sector_gen != self._sector_generation)
+        if not dirty.size:
+            return 0
+        pages = gen.reshape(SECTORS_TOTAL, -1)[dirty] != self._generation.reshape(SECTORS_TOTAL, -1)[dirty]
+        stale = pages.reshape(dirty.size, BASE_COLS, -1).any(axis=2)
+        columns = (dirty[:, None] * BASE_COLS + np.arange(BASE_COLS))[stale]
+        data = np.empty((columns.size, COLUMN_BYTES), dtype=np.uint8)
+        edges = np.flatnonzero(np.diff(np.concatenate(([-2], columns))) != 1).tolist() + [columns.size]
+        for i0, i1 in zip(edges[:-1], edges[1:]):  # one read per run of adjacent columns
+            start = int(columns[i0]) * COLUMN_BYTES
+            data[i0:i1] = self.model.read_view(start, (i1 - i0) * COLUMN_BYTES).reshape(-1, COLUMN_BYTES)
+        sectors, cols = np.divmod(columns, BASE_COLS)
+        self._levels[0][sectors, :, cols] = _column_counts(data, self.bitorder)
+        for level in range(1, LEVELS):
+            keys = np.unique(sectors * BASE_COLS + (cols >> level))
+            s, c = np.divmod(keys, BASE_COLS)
+            below = self._levels[level - 1][s[:, None], :, 2 * c[:, None] + np.arange(2)].astype(np.uint16)  # (n, 2, rows)
+            self._levels[level][s, :, c] = (below[:, :, 0::2] + below[:, :, 1::2]).sum(axis=1)
+        self._generation[:] = gen
+        self._sector_generation[:] = sector_gen
+        return int(columns.size)
+
+    def _build(self, pool=None) -> None:
+        levels = [np.empty((SECTORS_TOTAL, *level_shape(level)), dtype=np.uint8 if level == 0 else np.uint16) for level in range(LEVELS)]
+        if pool is not None:
+            result = pool.band_counts(self.model, range(SECTORS_TOTAL), BASE_ROWS, BASE_COLS, self.bitorder, WORD_BITS)
+            try:
+                levels[0][:] = result.result()
+            finally:
+                result.release()
+        for s0 in range(0, SECTORS_TOTAL if pool is None else 0, _BUILD_SECTORS):
+            data = self.model.read_view(s0 * SECTOR_SIZE, _BUILD_SECTORS * SECTOR_SIZE).reshape(_BUILD_SECTORS, SECTOR_SIZE)
+            counts, _ = _band_vertical(data, BASE_COLS * 16, BASE_COLS, BASE_ROWS, self.bitorder, WORD_BITS)
+            levels[0][s0 : s0 + _BUILD_SECTORS] = counts
+        for level in range(1, LEVELS):
+            levels[level][:] = _pool(levels[level - 1].astype(np.uint16))
+        self._levels = levels
+
+    def images(self, sector_ids, level: int, palette: Palette | None = None) -> np.ndarray:
+        """(N, rows, cols, 3) band images of ``level`` at its native size, as the die view draws them."""
+        counts = self.counts(sector_ids, level)
+        return band_images_from_counts(counts, level_denominator(level), counts.shape[2], palette)
+
+    def counts(self, sector_ids, level: int, pool=None) -> np.ndarray:
+        """(N, rows, cols) ones counts of the given sectors at ``level`` (a copy)."""
+        with self._lock:
+            self._refresh(pool)
+            return self._levels[level][np.asarray(sector_ids, dtype=np.intp)]
+
+    def revisions(self, sector_ids) -> np.ndarray:
+        """Sector generations the counts were last refreshed at."""
+        with self._lock:
+            return self._sector_generation[np.asarray(sector_ids, dtype=np.intp)]
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 
-from .ecc_overlay import ecc_matrix_for_sector
+from .ecc_overlay import ecc_bits_batch
+from .utils import POPCOUNT8, BufferLike, as_u8_array
 
 # Visual convention tuned to resemble lab/paper-like captures:
 # erased(1) -> green background, programmed(0) -> yellow bands.
@@ -15,7 +19,7 @@ DARK = np.array([20, 60, 30], dtype=np.uint8)
 PERIPHERY_A = np.array([190, 150, 190], dtype=np.uint8)
 PERIPHERY_B = np.array([150, 170, 210], dtype=np.uint8)
 
-_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_POPCOUNT = POPCOUNT8
 
 
 def _mix(c1, c2, t):
@@ -31,76 +35,200 @@ def _smooth1d(x: np.ndarray, repeats: int = 2) -> np.ndarray:
     return y
 
 
+@dataclass(frozen=True)
+class Palette:
+    """Two-colour ramp from erased (all ones) to programmed (all zeros), expanded to uint8 LUTs."""
+
+    name: str
+    erased: tuple[int, int, int]
+    programmed: tuple[int, int, int]
+
+
+PALETTES = {
+    "paper": Palette("paper", (35, 170, 70), (230, 220, 70)),
+    # Okabe-Ito blue/orange: distinguishable under the common colour-vision deficiencies.
+    "colorblind": Palette("colorblind", (0, 114, 178), (230, 159, 0)),
+}
+
+# Band separator shading: even column groups are darkened to 0.95, odd ones left as is.
+BAND_SHADES = (0.95, 1.0)
+
+
+@lru_cache(maxsize=None)
+def palette_lut(palette: Palette, shades: tuple[float, ...] = (1.0,)) -> np.ndarray:
+    """(len(shades) * 256, 3) uint8: the 256-level zero-ratio ramp once per shade factor."""
+    t = (np.arange(256, dtype=np.float32) / np.float32(255))[:, None]
+    ramp = (np.array(palette.erased, dtype=np.float32) * (1 - t) + np.array(palette.programmed, dtype=np.float32) * t).astype(np.uint8)
+    lut = np.concatenate([(ramp * np.float32(f)).astype(np.uint8) for f in shades])
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=64)
+def _level_lut(denom: int) -> np.ndarray:
+    ones = np.arange(denom + 1, dtype=np.uint64)
+    return (((denom - ones) * 255 + denom // 2) // denom).astype(np.uint8)
+
+
+def _zero_levels(ones: np.ndarray, denom: int) -> np.ndarray:
+    """Integer ones counts out of ``denom`` -> zero ratio quantized to 0..255 (rounded)."""
+    if denom <= 1 << 16:
+        return _level_lut(denom)[ones]  # a gather instead of an integer division per pixel
+    zeros = denom - ones.astype(np.uint64)
+    return ((zeros * 255 + denom // 2) // denom).astype(np.uint8)
+
+
+def _smooth2d_int(x: np.ndarray, dtype=np.uint32) -> np.ndarray:
+    """``_smooth2d_light`` without the division: integer [1,2,1] passes, result scaled by 16."""
+    lead = ((0, 0),) * (x.ndim - 2)
+    tmp = np.pad(x.astype(dtype), lead + ((0, 0), (1, 1)), mode="edge")
+    h = tmp[..., :-2] + 2 * tmp[..., 1:-1] + tmp[..., 2:]
+    tmp2 = np.pad(h, lead + ((1, 1), (0, 0)), mode="edge")
+    return tmp2[..., :-2, :] + 2 * tmp2[..., 1:-1, :] + tmp2[..., 2:, :]
+
+
 def _smooth2d_light(x: np.ndarray) -> np.ndarray:
-    """Very light separable [1,2,1]/4 smoothing, 1 pass each axis."""
+    """Very light separable [1,2,1]/4 smoothing, 1 pass each of the last two axes."""
     k = np.array([1.0, 2.0, 1.0], dtype=np.float32) / 4.0
+    lead = ((0, 0),) * (x.ndim - 2)
     # horizontal
-    tmp = np.pad(x.astype(np.float32), ((0, 0), (1, 1)), mode="edge")
-    h = tmp[:, :-2] * k[0] + tmp[:, 1:-1] * k[1] + tmp[:, 2:] * k[2]
+    tmp = np.pad(x.astype(np.float32), lead + ((0, 0), (1, 1)), mode="edge")
+    h = tmp[..., :-2] * k[0] + tmp[..., 1:-1] * k[1] + tmp[..., 2:] * k[2]
     # vertical
-    tmp2 = np.pad(h, ((1, 1), (0, 0)), mode="edge")
-    v = tmp2[:-2, :] * k[0] + tmp2[1:-1, :] * k[1] + tmp2[2:, :] * k[2]
+    tmp2 = np.pad(h, lead + ((1, 1), (0, 0)), mode="edge")
+    v = tmp2[..., :-2, :] * k[0] + tmp2[..., 1:-1, :] * k[1] + tmp2[..., 2:, :] * k[2]
     return v
 
 
-def sector_state_summary(sector_bytes: bytes) -> tuple[bool, float]:
-    arr = np.frombuffer(sector_bytes, dtype=np.uint8)
+ERASED_TILE = np.array([70, 140, 70], dtype=np.uint8)
+
+
+def sector_state_colors(sector_programmed: np.ndarray, sector_size: int = 0x10000) -> np.ndarray:
+    """(N, 3) LOD 0 tile colours: erased green, programmed tiles redder with the programmed ratio."""
+    programmed = np.asarray(sector_programmed)
+    colors = np.empty((programmed.size, 3), dtype=np.uint8)
+    colors[:, 0] = 120 + (120 * (programmed / sector_size)).astype(np.int64)
+    colors[:, 1:] = (170, 70)
+    colors[programmed == 0] = ERASED_TILE
+    return colors
+
+
+WEAR_COLD = np.array([30, 60, 150], dtype=np.uint8)
+WEAR_HOT = np.array([235, 60, 40], dtype=np.uint8)
+
+
+def wear_heatmap_colors(counts: np.ndarray) -> np.ndarray:
+    """(N,) cycle counts -> (N, 3) uint8 colours, scaled to the hottest entry."""
+    counts = np.asarray(counts, dtype=np.float32)
+    peak = float(counts.max()) if counts.size else 0.0
+    t = counts / peak if peak > 0 else np.zeros_like(counts)
+    return _mix(WEAR_COLD, WEAR_HOT, t[:, None])
+
+
+def sector_state_summary(sector_bytes: BufferLike) -> tuple[bool, float]:
+    arr = as_u8_array(sector_bytes)
     changed = np.count_nonzero(arr != 0xFF)
     ratio = float(changed) / float(arr.size)
     return changed == 0, ratio
 
 
-def sector_band_image(
-    sector_bytes: bytes,
+@lru_cache(maxsize=None)
+def _plane_group_lut(bitorder: str, k: int) -> np.ndarray:
+    """(256,) LUT packing the ones of each run of ``k`` bit planes of a byte into 8-bit fields.
+
+    Fields sit little-endian in one integer of ``8 // k`` bytes, so summing up to 16 entries
+    (one band row group) adds every field at once without carries.
+    """
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder="big" if bitorder == "msb" else "little")
+    counts = np.ascontiguousarray(bits.reshape(256, 8 // k, k).sum(axis=2, dtype=np.uint8))
+    return counts.view(f"<u{8 // k}").reshape(256)
+
+
+def _band_vertical(arr: np.ndarray, words_count: int, cols: int, out_h: int, bitorder: str, word_bits: int) -> tuple[np.ndarray, int]:
+    """(N, out_h, cols) ones counts of N bands pooled over ``vh`` planes, and ``vh`` (1 when sampling)."""
+    n = arr.shape[0]
+    band_h = word_bits * 16
+    word_bytes = word_bits // 8
+    packed = np.full((n, cols * 16, word_bytes), 0xFF, dtype=np.uint8)  # pad with erased=1
+    packed[:, :words_count] = arr[:, : words_count * word_bytes].reshape(n, words_count, word_bytes)
+    # Band row b*16 + r, column c holds plane b of word c*16 + r.
+    words = packed.reshape(n, cols, 16, word_bytes)
+    if band_h % out_h:
+        yi = np.linspace(0, band_h - 1, out_h).astype(int)
+        planes, rows = yi // 16, yi % 16
+        shift = 7 - planes % 8 if bitorder == "msb" else planes % 8
+        picked = words[:, :, rows, planes // 8]  # (n, cols, out_h)
+        return ((picked >> shift.astype(np.uint8)) & 1).transpose(0, 2, 1), 1
+    vh = band_h // out_h
+    k = vh // 16  # planes per output row
+    lut = _plane_group_lut(bitorder, min(k, 8))
+    packed_counts = np.take(lut, words).sum(axis=2, dtype=lut.dtype)  # (n, cols, word_bytes)
+    counts = packed_counts.view(np.uint8).reshape(n, cols, -1)  # per plane group, in plane order
+    if k > 8:
+        counts = counts.reshape(n, cols, out_h, k // 8).sum(axis=3, dtype=np.uint32)
+    return counts.transpose(0, 2, 1), vh
+
+
+def _as_sector_rows(sectors) -> np.ndarray:
+    arr = sectors if isinstance(sectors, np.ndarray) else as_u8_array(sectors)
+    return arr.reshape(1, -1) if arr.ndim == 1 else arr
+
+
+def sector_band_images(
+    sectors: np.ndarray,
     out_w: int,
     out_h: int,
     bitorder: str = "msb",
     word_bits: int = 256,
+    palette: Palette | None = None,
 ) -> np.ndarray:
-    """
-    Paper-like band rendering.
-    Builds a (word_bits*16) x cols binary matrix from bit-planes, then downsamples to out_h x out_w.
-    bit=1 (erased) -> GREEN, bit=0 -> YELLOW.
-    """
-    arr = np.frombuffer(sector_bytes, dtype=np.uint8)
-    bits = np.unpackbits(arr, bitorder="big" if bitorder == "msb" else "little")
-
-    total_bits = (bits.size // word_bits) * word_bits
-    bits = bits[:total_bits]
-    words = bits.reshape(-1, word_bits)  # (words_count, word_bits)
-    words_count = words.shape[0]
+    """Batch ``sector_band_image``: (N, sector_size) uint8 -> (N, out_h, out_w, 3).
 
+    With a ``palette`` the pooling stays in integer counts and pixels come from a uint8 LUT
+    (256 levels per separator shade); without one the float reference path is used.
+    """
+    arr = _as_sector_rows(sectors)
+    n = arr.shape[0]
+    words_count = arr.shape[1] * 8 // word_bits
     cols = (words_count + 15) // 16
-    padded_words = np.ones((cols * 16, word_bits), dtype=np.uint8)  # pad with erased=1
-    padded_words[:words_count, :] = words
-
-    # Build big band matrix: (word_bits*16, cols)
-    # plane b => 16 x cols tile
     band_h = word_bits * 16
     band_w = cols
-    band = np.empty((band_h, band_w), dtype=np.uint8)
-
-    # Fill band block by block: each plane occupies 16 rows
-    for b in range(word_bits):
-        plane = padded_words[:, b].reshape(cols, 16).T  # (16, cols)
-        band[b * 16 : (b + 1) * 16, :] = plane
-
-    # Downsample band -> out_h x out_w using pooling (fast because dimensions divide nicely often)
-    # First vertical pooling
-    if band_h % out_h == 0:
-        vh = band_h // out_h
-        band_ds = band.reshape(out_h, vh, band_w).mean(axis=1)
+    vh = band_h // out_h
+
+    if word_bits % 8 == 0 and (band_h % out_h or (vh % 16 == 0 and (8 % (vh // 16) == 0 or (vh // 16) % 8 == 0))):
+        # Pool (or sample) straight from the packed bytes: popcounts over whole groups of planes.
+        counts, denom = _band_vertical(arr, words_count, cols, out_h, bitorder, word_bits)
     else:
-        yi = np.linspace(0, band_h - 1, out_h).astype(int)
-        band_ds = band[yi, :].astype(np.float32)
+        bits = np.unpackbits(arr, axis=1, bitorder="big" if bitorder == "msb" else "little")
+        padded_words = np.ones((n, cols * 16, word_bits), dtype=np.uint8)  # pad with erased=1
+        padded_words[:, :words_count, :] = bits[:, : words_count * word_bits].reshape(n, -1, word_bits)
+        # Plane b of word c*16 + r lands at band row b*16 + r, column c: one transpose.
+        band = padded_words.reshape(n, cols, 16, word_bits).transpose(0, 3, 2, 1).reshape(n, band_h, band_w)
+        if band_h % out_h == 0:
+            counts, denom = band.reshape(n, out_h, vh, band_w).sum(axis=2, dtype=np.uint32), vh
+        else:
+            yi = np.linspace(0, band_h - 1, out_h).astype(int)
+            counts, denom = band[:, yi, :], 1
+    return band_images_from_counts(counts, denom, out_w, palette)
+
+
+def band_images_from_counts(counts: np.ndarray, denom: int, out_w: int, palette: Palette | None = None) -> np.ndarray:
+    """(N, out_h, band_w) ones counts out of ``denom`` -> (N, out_h, out_w, 3) band pixels.
+
+    The shared back half of ``sector_band_images``, also fed from precomputed count grids.
+    """
+    if palette is not None:
+        return _band_lut_image(counts, denom, out_w, palette)
+    n, out_h, band_w = counts.shape
+    band_ds = counts.astype(np.float32) if denom == 1 else counts / denom
 
     # Then horizontal pooling
     if band_w % out_w == 0:
         vw = band_w // out_w
-        band_ds = band_ds.reshape(out_h, out_w, vw).mean(axis=2)
+        band_ds = band_ds.reshape(n, out_h, out_w, vw).mean(axis=3)
     else:
         xi = np.linspace(0, band_w - 1, out_w).astype(int)
-        band_ds = band_ds[:, xi]
+        band_ds = band_ds[:, :, xi]
 
     # Very light 2D smoothing for LOD2/strip only.
     band_ds = _smooth2d_light(band_ds)
@@ -109,36 +237,94 @@ def sector_band_image(
     t = (1.0 - band_ds).astype(np.float32)
     t = np.clip(t, 0.0, 1.0)
 
-    img = _mix(GREEN, YELLOW, t[..., None])
-
     # subtle separators to look more “captured”
     sep = ((np.arange(out_w)[None, :] // max(1, out_w // 32)) % 2) * 0.05
-    img = np.clip(img.astype(np.float32) * (0.95 + sep[..., None]), 0, 255).astype(np.uint8)
+    # Same arithmetic as _mix followed by the separator factor, one contiguous channel at a time.
+    # The factor is at most 1.0, so the product needs no clipping before truncation.
+    factor = 0.95 + sep
+    u = 1 - t
+    img = np.empty(t.shape + (3,), dtype=np.uint8)
+    for ch in range(3):
+        mixed = (np.float32(GREEN[ch]) * u + np.float32(YELLOW[ch]) * t).astype(np.uint8)
+        img[..., ch] = mixed * factor
     return img
 
 
-def sector_thumbnail_fast(sector_bytes: bytes, width: int, height: int) -> np.ndarray:
+def _band_lut_image(counts: np.ndarray, denom: int, out_w: int, palette: Palette) -> np.ndarray:
+    n, out_h, band_w = counts.shape
+    if band_w % out_w == 0:
+        vw = band_w // out_w
+        counts = counts.reshape(n, out_h, out_w, vw).sum(axis=3, dtype=np.uint32)
+        denom *= vw
+    else:
+        counts = counts[:, :, np.linspace(0, band_w - 1, out_w).astype(int)]
+    # uint16 holds the 16x-scaled sums for the usual tile sizes and halves the memory traffic.
+    levels = _zero_levels(_smooth2d_int(counts, np.uint16 if denom * 16 < 1 << 16 else np.uint32), denom * 16)
+    # Shade variant per column selects the LUT half; one gather yields the RGB pixels.
+    shade = ((np.arange(out_w) // max(1, out_w // 32)) % 2).astype(np.uint16) * 256
+    return np.take(palette_lut(palette, BAND_SHADES), levels + shade, axis=0)
+
+
+def sector_band_image(
+    sector_bytes: BufferLike,
+    out_w: int,
+    out_h: int,
+    bitorder: str = "msb",
+    word_bits: int = 256,
+    palette: Palette | None = None,
+) -> np.ndarray:
+    """
+    Paper-like band rendering.
+    Builds a (word_bits*16) x cols binary matrix from bit-planes, then downsamples to out_h x out_w.
+    bit=1 (erased) -> GREEN, bit=0 -> YELLOW.
+    """
+    return sector_band_images(as_u8_array(sector_bytes)[None, :], out_w, out_h, bitorder, word_bits, palette)[0]
+
+
+def sector_thumbnail_fast(sector_bytes: BufferLike, width: int, height: int, palette: Palette | None = None) -> np.ndarray:
+    return sector_thumbnails_fast(as_u8_array(sector_bytes)[None, :], width, height, palette)[0]
+
+
+def sector_thumbnails_fast(sectors: np.ndarray, width: int, height: int, palette: Palette | None = None) -> np.ndarray:
+    """Batch ``sector_thumbnail_fast``: (N, 65536) -> (N, height, width, 3)."""
     # page-based intensity (256 pages)
-    arr = np.frombuffer(sector_bytes, dtype=np.uint8).reshape(256, 256)
-    ones_per_page = _POPCOUNT[arr].sum(axis=1).astype(np.float32)  # (256,)
+    arr = _as_sector_rows(sectors).reshape(-1, 256, 256)
+    ones_per_page = _POPCOUNT[arr].sum(axis=2).astype(np.float32)  # (N, 256)
+    return _thumbnail_from_page_ones(ones_per_page, width, height, palette)
+
+
+def sector_thumbnail_from_stats(page_zero_bits: np.ndarray, width: int, height: int, palette: Palette | None = None) -> np.ndarray:
+    """Same image as ``sector_thumbnail_fast`` built from the model's per-page zero-bit counts."""
+    return sector_thumbnails_from_stats(np.asarray(page_zero_bits)[None, :], width, height, palette)[0]
+
+
+def sector_thumbnails_from_stats(page_zero_bits: np.ndarray, width: int, height: int, palette: Palette | None = None) -> np.ndarray:
+    """Batch ``sector_thumbnail_from_stats``: (N, 256) zero-bit counts -> (N, height, width, 3)."""
+    ones_per_page = (256 * 8 - np.asarray(page_zero_bits, dtype=np.int32)).astype(np.float32)
+    return _thumbnail_from_page_ones(ones_per_page, width, height, palette)
+
+
+def _thumbnail_from_page_ones(ones_per_page: np.ndarray, width: int, height: int, palette: Palette | None = None) -> np.ndarray:
     mean_bit = ones_per_page / (256.0 * 8.0)  # 1=erased, 0=programmed-ish
     t_col = (1.0 - mean_bit)  # zero_ratio per page
 
     # sample pages to width
     xi = np.linspace(0, 255, width).astype(int)
-    col = t_col[xi][None, :]  # (1,width)
+    col = t_col[..., None, xi]  # (N, 1, width)
 
     # add fixed horizontal banding so it resembles captures
     y = np.linspace(0, 1, height)[:, None]
     stripes = (0.5 + 0.5 * np.sign(np.sin(2 * np.pi * 10 * y))) * 0.08  # subtle
     t = np.clip(0.10 + 0.90 * (0.85 * col + stripes), 0, 1)
+    if palette is not None:
+        return np.take(palette_lut(palette), (t * 255 + 0.5).astype(np.uint8), axis=0)
 
     img = _mix(GREEN, YELLOW, t[..., None])
     return img
 
 
 def sector_thumbnail(
-    sector_bytes: bytes,
+    sector_bytes: BufferLike,
     width: int = 128,
     height: int = 32,
     bitorder: str = "msb",
@@ -156,28 +342,48 @@ def _periphery_strip(height: int, width: int) -> np.ndarray:
 
 
 def sector_detailed_image(
-    sector_bytes: bytes,
+    sector_bytes: BufferLike,
+    height: int = 180,
+    with_ecc: bool = True,
+    bitorder: str = "msb",
+    orientation: str = "horizontal",
+    ecc: np.ndarray | None = None,
+    palette: Palette | None = None,
+) -> np.ndarray:
+    # ``ecc`` may carry a precomputed (10, 256) matrix, e.g. from the model's ECC index.
+    return sector_detailed_images(
+        as_u8_array(sector_bytes)[None, :], height, with_ecc, bitorder, orientation, None if ecc is None else ecc[None], palette
+    )[0]
+
+
+def sector_detailed_images(
+    sectors: np.ndarray,
     height: int = 180,
     with_ecc: bool = True,
     bitorder: str = "msb",
     orientation: str = "horizontal",
+    ecc: np.ndarray | None = None,
+    palette: Palette | None = None,
 ) -> np.ndarray:
+    """Batch ``sector_detailed_image``: (N, 65536) -> (N, height, w, 3); ``ecc`` is (N, 10, 256) if given."""
+    arr = _as_sector_rows(sectors)
+    n = arr.shape[0]
     # For detailed view we want it to look paper-like:
     core_w = 256
-    core = sector_band_image(sector_bytes, out_w=core_w, out_h=height, bitorder=bitorder, word_bits=256)
+    core = sector_band_images(arr, out_w=core_w, out_h=height, bitorder=bitorder, word_bits=256, palette=palette)
 
     if orientation == "vertical":
-        left = _periphery_strip(height, 6)
-        right = _periphery_strip(height, 6)
-        core = np.concatenate([left, core, right], axis=1)
+        strip = np.broadcast_to(_periphery_strip(height, 6).astype(np.uint8), (n, height, 6, 3))
+        core = np.concatenate([strip, core, strip], axis=2)
 
     if not with_ecc:
         return core
 
-    ecc = ecc_matrix_for_sector(sector_bytes)
-    ecc_h = np.repeat(ecc, repeats=max(1, height // 10), axis=0)[:height, :]
+    if ecc is None:
+        ecc = ecc_bits_batch(arr).reshape(n, -1, 10).transpose(0, 2, 1)
+    ecc_h = np.repeat(ecc, repeats=max(1, height // 10), axis=1)[:, :height, :]
     ecc_rgb = np.where(ecc_h[..., None] == 1, YELLOW, DARK)
-    return np.concatenate([ecc_rgb, core], axis=1)
+    return np.concatenate([ecc_rgb, core], axis=2)
 
 
 def thumbnail_hash(img: np.ndarray) -> str:
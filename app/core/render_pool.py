@@ -0,0 +1,163 @@
+"""Optional process-pool render backend for models whose bytes live in shared memory.
+
+Workers attach to the model's segment by name and read sectors in place, so a job carries only
+sector ids; pixels come back through a per-request shared result segment, not pickled arrays.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .addressing import CAPACITY_BYTES, SECTOR_SIZE, SECTORS_TOTAL
+from .model import SharedMemoryModel
+from .render import Palette, _band_vertical, sector_band_images
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # The creating process owns (and unlinks) the segment; keep attachers out of the resource
+    # tracker so a worker exiting does not unlink it or report it as leaked.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _attach_lock:  # the patch below is process-global
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+_segments: dict[str, tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _model_array(name: str, stale: tuple[str, ...] = ()) -> np.ndarray:
+    for old in stale:  # closed devices: drop the mapping so the segment's memory is freed
+        if old in _segments:
+            shm, arr = _segments.pop(old)
+            del arr
+            shm.close()
+    if name not in _segments:
+        shm = _attach(name)
+        _segments[name] = (shm, np.ndarray(CAPACITY_BYTES, dtype=np.uint8, buffer=shm.buf))
+    return _segments[name][1]
+
+
+def _cached_segments() -> list[str]:
+    return list(_segments)
+
+
+def _run_job(
+    model_name: str, out_name: str, shape: tuple, row0: int, sector_ids: list[int], kind: str, params: tuple, stale: tuple[str, ...]
+) -> None:
+    mem = _model_array(model_name, stale)
+    sectors = mem.reshape(SECTORS_TOTAL, SECTOR_SIZE)[sector_ids]
+    if kind == "band":
+        out_w, out_h, bitorder, palette = params
+        pixels = sector_band_images(sectors, out_w, out_h, bitorder, palette=palette)
+    else:
+        rows, cols, bitorder, word_bits = params
+        pixels, _ = _band_vertical(sectors, cols * 16, cols, rows, bitorder, word_bits)
+    out = _attach(out_name)
+    try:
+        dest = np.ndarray(shape, dtype=np.uint8, buffer=out.buf)
+        dest[row0 : row0 + len(sector_ids)] = pixels
+        del dest
+    finally:
+        out.close()
+
+
+class RenderResult:
+    """(N, ...) uint8 results in a shared segment, filled by workers; ``release`` frees it.
+
+    ``revisions`` holds each sector's generation at submit time, so callers can drop results
+    for sectors written while the job ran.
+    """
+
+    def __init__(self, shape: tuple, revisions: np.ndarray):
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))))
+        self._array = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+        self.revisions = revisions
+        self.futures: list[Future] = []
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures)
+
+    def result(self) -> np.ndarray:
+        for f in self.futures:
+            f.result()
+        return self._array
+
+    def release(self) -> None:
+        if self._array is None:
+            return
+        for f in self.futures:
+            f.cancel()
+        self._array = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class ProcessRenderPool:
+    """Renders sectors of ``SharedMemoryModel`` devices on worker processes.
+
+    NumPy's per-call overhead in the band renderer holds the GIL, so threads stop scaling after
+    a few cores; processes reading the shared model scale with the core count instead.
+    """
+
+    def __init__(self, workers: int | None = None, chunk: int = 8):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk = chunk
+        # spawn: never fork a process that may be running Qt threads.
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._models: dict[str, weakref.ref] = {}
+        self._stale: set[str] = set()
+
+    @staticmethod
+    def supports(model) -> bool:
+        return isinstance(model, SharedMemoryModel) and not model.closed
+
+    def _stale_names(self) -> tuple[str, ...]:
+        """Segments of closed devices; every job carries them so each worker unmaps them."""
+        for name, ref in list(self._models.items()):
+            model = ref()
+            if model is None or model.closed:
+                self._stale.add(name)
+                del self._models[name]
+        return tuple(sorted(self._stale))
+
+    def _submit(self, model, sector_ids, item_shape: tuple, kind: str, params: tuple) -> RenderResult:
+        if not self.supports(model):
+            raise ValueError("process rendering needs an open SharedMemoryModel")
+        self._models.setdefault(model.shm_name, weakref.ref(model))
+        stale = self._stale_names()
+        ids = [int(s) for s in sector_ids]
+        shape = (len(ids), *item_shape)
+        result = RenderResult(shape, model.sector_generation[ids].copy())
+        for i in range(0, len(ids), self.chunk):
+            args = (model.shm_name, result._shm.name, shape, i, ids[i : i + self.chunk], kind, params, stale)
+            result.futures.append(self._pool.submit(_run_job, *args))
+        return result
+
+    def band_images(
+        self, model, sector_ids, out_w: int, out_h: int, bitorder: str = "msb", palette: Palette | None = None
+    ) -> RenderResult:
+        """``sector_band_images`` of the given sectors: (N, out_h, out_w, 3)."""
+        return self._submit(model, sector_ids, (out_h, out_w, 3), "band", (out_w, out_h, bitorder, palette))
+
+    def band_counts(self, model, sector_ids, rows: int, cols: int, bitorder: str = "msb", word_bits: int = 256) -> RenderResult:
+        """Vertically pooled band ones-counts of the given sectors: (N, rows, cols)."""
+        return self._submit(model, sector_ids, (rows, cols), "counts", (rows, cols, bitorder, word_bits))
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,126 @@
+"""Table-driven extended Hamming SEC-DED code over 256-byte datasets."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .ecc_overlay import DATASET_SIZE
+from .utils import POPCOUNT8, BufferLike, as_u8_array
+
+DATA_BITS = DATASET_SIZE * 8
+CHECK_BITS = 12  # 2**12 >= 2048 data + 12 check + 1
+CODE_MASK = (1 << CHECK_BITS) - 1
+PARITY_BIT = 1 << CHECK_BITS
+STATUS_OK = 0
+STATUS_CORRECTED = 1
+STATUS_UNCORRECTABLE = 2
+_CHUNK_PAGES = 4096
+
+
+def _data_positions() -> np.ndarray:
+    """Hamming positions of the data bits: every integer >= 3 that is not a power of two."""
+    n = np.arange(1, DATA_BITS + CHECK_BITS + 1)
+    return n[(n & (n - 1)) != 0][:DATA_BITS].astype(np.uint16)
+
+
+_POSITIONS = _data_positions()
+
+
+def _byte_tables() -> np.ndarray:
+    """(256 byte columns * 256 values,) uint16: XOR of the positions of the set bits (MSB first)."""
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+    pos = _POSITIONS.reshape(DATASET_SIZE, 8)
+    tables = np.zeros((DATASET_SIZE, 256), dtype=np.uint16)
+    for t in range(8):
+        tables ^= np.where(bits[:, t][None, :] == 1, pos[:, t][:, None], 0).astype(np.uint16)
+    return tables.ravel()
+
+
+def _locator() -> np.ndarray:
+    loc = np.full(1 << CHECK_BITS, -1, dtype=np.int16)
+    loc[_POSITIONS] = np.arange(DATA_BITS, dtype=np.int16)
+    return loc
+
+
+_TABLES = _byte_tables()
+_COLUMN_BASE = (np.arange(DATASET_SIZE, dtype=np.intp) * 256)[None, :]
+_LOCATOR = _locator()
+
+
+def _parity16(x: np.ndarray) -> np.ndarray:
+    return (POPCOUNT8[x & 0xFF] ^ POPCOUNT8[x >> 8]) & 1
+
+
+def _encode_rows(rows: np.ndarray) -> np.ndarray:
+    syn = np.bitwise_xor.reduce(_TABLES[_COLUMN_BASE + rows], axis=1)
+    data_parity = POPCOUNT8[np.bitwise_xor.reduce(rows, axis=1)] & 1
+    overall = data_parity ^ _parity16(syn)
+    return syn | (overall.astype(np.uint16) << CHECK_BITS)
+
+
+def _rows(datasets: BufferLike) -> np.ndarray:
+    arr = as_u8_array(datasets)
+    if arr.size % DATASET_SIZE:
+        raise ValueError("buffer is not a whole number of datasets")
+    return arr.reshape(-1, DATASET_SIZE)
+
+
+def secded_encode(datasets: BufferLike) -> np.ndarray:
+    """(N,) uint16 codes: 12 Hamming check bits plus the overall parity bit at bit 12."""
+    rows = _rows(datasets)
+    out = np.empty(rows.shape[0], dtype=np.uint16)
+    for p0 in range(0, rows.shape[0], _CHUNK_PAGES):
+        out[p0 : p0 + _CHUNK_PAGES] = _encode_rows(rows[p0 : p0 + _CHUNK_PAGES])
+    return out
+
+
+@dataclass(frozen=True)
+class SecDedReport:
+    status: np.ndarray  # (pages,) STATUS_* per dataset
+
+    @property
+    def corrected(self) -> int:
+        return int(np.count_nonzero(self.status == STATUS_CORRECTED))
+
+    @property
+    def uncorrectable(self) -> int:
+        return int(np.count_nonzero(self.status == STATUS_UNCORRECTABLE))
+
+    def per_sector(self, pages_per_sector: int = 256) -> tuple[np.ndarray, np.ndarray]:
+        """(corrected, uncorrectable) dataset counts per sector."""
+        by_sector = self.status.reshape(-1, pages_per_sector)
+        return (by_sector == STATUS_CORRECTED).sum(axis=1), (by_sector == STATUS_UNCORRECTABLE).sum(axis=1)
+
+    def sector_status(self, pages_per_sector: int = 256) -> np.ndarray:
+        """Worst status per sector."""
+        return self.status.reshape(-1, pages_per_sector).max(axis=1)
+
+
+def secded_decode(datasets: BufferLike, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Classify each dataset against its stored code; returns (status, data bit to flip or -1)."""
+    diff = secded_encode(datasets) ^ np.asarray(codes, dtype=np.uint16)
+    syn = diff & CODE_MASK
+    parity_err = ((diff >> CHECK_BITS) & 1) ^ _parity16(syn)
+    data_bit = np.where(parity_err == 1, _LOCATOR[syn], -1).astype(np.int32)
+    single = parity_err == 1
+    # A single error in a check bit (or the parity bit) leaves the data intact.
+    check_only = single & ((syn & (syn - 1)) == 0)
+    status = np.full(syn.shape, STATUS_OK, dtype=np.uint8)
+    status[syn != 0] = STATUS_UNCORRECTABLE
+    status[single & ((data_bit >= 0) | check_only)] = STATUS_CORRECTED
+    status[single & (data_bit < 0) & ~check_only] = STATUS_UNCORRECTABLE
+    return status, data_bit
+
+
+def secded_correct(datasets: np.ndarray, codes: np.ndarray) -> SecDedReport:
+    """Correct single-bit errors in place in a writable uint8 buffer of datasets."""
+    rows = _rows(datasets)
+    if not rows.flags.writeable:
+        raise ValueError("datasets must be writable")
+    status, data_bit = secded_decode(rows, codes)
+    pages = np.flatnonzero(data_bit >= 0)
+    bits = data_bit[pages]
+    rows[pages, bits >> 3] ^= (0x80 >> (bits & 7)).astype(np.uint8)
+    return SecDedReport(status)
@@ -0,0 +1,65 @@
+"""Per-sector content digests kept in step with the model's sector generations."""
+
+from __future__ import annotations
+
+import hashlib
+
+import numpy as np
+
+from .addressing import SECTOR_SIZE, SECTORS_TOTAL, sector_start
+
+DIGEST_SIZE = 16
+
+
+def sector_digest(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+ERASED_DIGEST = sector_digest(b"\xFF" * SECTOR_SIZE)
+
+
+class SectorDigests:
+    """BLAKE2b-128 of every sector, for content-addressed caches (equal digest -> equal bytes).
+
+    Only sectors whose generation moved are rehashed, and erased sectors (known from the
+    model's statistics) take the shared erased digest without being read at all.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._digests = [ERASED_DIGEST] * SECTORS_TOTAL
+        self._generation = np.zeros(SECTORS_TOTAL, dtype=np.uint32)
+        self._ready = False
+
+    def refresh(self) -> int:
+        """Rehash stale sectors; returns how many were read."""
+        gen = self.model.sector_generation
+        stale = np.ones(SECTORS_TOTAL, dtype=bool) if not self._ready else gen != self._generation
+        if not stale.any():
+            return 0
+        erased = self.model.sector_erased
+        hashed = 0
+        for sid in np.flatnonzero(stale).tolist():
+            if erased[sid]:
+                self._digests[sid] = ERASED_DIGEST
+            else:
+                self._digests[sid] = sector_digest(self.model.read_view(sector_start(sid), SECTOR_SIZE))
+                hashed += 1
+        self._generation[:] = gen
+        self._ready = True
+        return hashed
+
+    @property
+    def digests(self) -> list[bytes]:
+        self.refresh()
+        return self._digests
+
+    def __getitem__(self, sector_id: int) -> bytes:
+        return self.digests[sector_id]
+
+    def groups(self) -> dict[bytes, list[int]]:
+        """Sector ids sharing each distinct digest."""
+        out: dict[bytes, list[int]] = {}
+        for sid, digest in enumerate(self.digests):
+            out.setdefault(digest, []).append(sid)
+        return out
@@ -0,0 +1,241 @@
+"""Streaming replay of captured MT25Q-style SPI command traces onto a MemoryModel.
+
+Trace format: one SPI transaction (chip-select window) per line, written as the
+MOSI bytes in hex (``02 00 10 00 AA BB``, ``0x02,0x00,...``). Blank lines and
+``#`` comments are ignored, so multi-GB captures are processed line by line.
+"""
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+from .addressing import CAPACITY_BYTES, MAX_ADDRESS, PAGE_SIZE, SECTOR_SIZE, sector_region, sectors_in_range, sub32_region, sub4_region
+from .bulk import BulkOp, data_op, erase_op
+
+WREN = 0x06
+WRDI = 0x04
+ENTER_4B = 0xB7
+EXIT_4B = 0xE9
+WRITE_EXT_ADDR = 0xC5
+PAGE_PROGRAM = 0x02
+PAGE_PROGRAM_4B = 0x12
+ERASE_4K = 0x20
+ERASE_4K_4B = 0x21
+ERASE_32K = 0x52
+ERASE_32K_4B = 0x5C
+ERASE_64K = 0xD8
+ERASE_64K_4B = 0xDC
+BULK_ERASE = (0xC7, 0x60, 0xC4)
+
+# opcode -> (region helper, forced 4-byte address)
+_ERASES = {
+    ERASE_4K: (sub4_region, False),
+    ERASE_4K_4B: (sub4_region, True),
+    ERASE_32K: (sub32_region, False),
+    ERASE_32K_4B: (sub32_region, True),
+    ERASE_64K: (sector_region, False),
+    ERASE_64K_4B: (sector_region, True),
+}
+
+
+@dataclass
+class ReplayStats:
+    commands: int = 0
+    programs: int = 0
+    erases: int = 0
+    ignored: int = 0
+    bytes_programmed: int = 0
+    bad_lines: int = 0
+    first_bad_line: int = 0  # 1-based line number of the first malformed line, 0 if none
+    sectors_touched: set[int] = field(default_factory=set)
+
+
+def parse_trace_line(line: str) -> bytes | None:
+    """MOSI bytes of one trace line, ``None`` for blank/comment lines; raises ValueError if malformed."""
+    text = line.split("#", 1)[0].replace(",", " ").replace("0x", "").replace("0X", "")
+    if not text.strip():
+        return None
+    return bytes.fromhex(text)
+
+
+class SpiReplay:
+    """Decodes SPI commands and applies them to ``model`` in batches.
+
+    Consecutive page programs are merged into one op of at most a sector, and a batch
+    is flushed every ``batch_ops`` ops or ``batch_bytes`` of queued program data, so
+    memory stays bounded whatever the trace length.
+    """
+
+    def __init__(self, model, batch_ops: int = 4096, require_wren: bool = True, batch_bytes: int = 16 << 20):
+        self.model = model
+        self.batch_ops = batch_ops
+        self.batch_bytes = batch_bytes
+        self.require_wren = require_wren
+        self.four_byte = False
+        self.ext_addr = 0
+        self.wel = False
+        self.stats = ReplayStats()
+        self._ops: list[BulkOp] = []
+        self._queued_bytes = 0
+        self._run_start = -1
+        self._run = bytearray()
+
+    def feed(self, command: bytes) -> None:
+        if not command:
+            return
+        self.stats.commands += 1
+        op = command[0]
+        if op == WREN:
+            self.wel = True
+        elif op == WRDI:
+            self.wel = False
+        elif op == ENTER_4B:
+            self.four_byte = True
+        elif op == EXIT_4B:
+            self.four_byte = False
+        elif op == WRITE_EXT_ADDR and len(command) > 1:
+            self.ext_addr = command[1]
+        elif op in (PAGE_PROGRAM, PAGE_PROGRAM_4B):
+            self._page_program(command, op == PAGE_PROGRAM_4B)
+        elif op in _ERASES:
+            helper, force_4b = _ERASES[op]
+            addr = self._address(command, force_4b)
+            if addr is not None and self._latch():
+                region = helper(addr)
+                self._queue_erase(region.start, region.size)
+        elif op in BULK_ERASE:
+            if self._latch():
+                self._queue_erase(0, CAPACITY_BYTES)
+        else:
+            self.stats.ignored += 1
+
+    def flush(self) -> None:
+        self._close_run()
+        if self._ops:
+            self._apply()
+
+    def replay(
+        self,
+        commands: Iterable[bytes],
+        on_frame: Callable[[ReplayStats], None] | None = None,
+        frame_every: int = 0,
+    ) -> ReplayStats:
+        """Replay ``commands``; with ``frame_every`` > 0, flush and call ``on_frame`` every N commands.
+
+        The whole replay is one undo step. Each 4KiB block's pre-image is captured once, however
+        often the trace rewrites it, so a multi-GB trace costs at most one image of the chip.
+        """
+        history = self.model.history
+        with history.group() if history is not None else nullcontext():
+            for i, command in enumerate(commands, 1):
+                self.feed(command)
+                if on_frame is not None and frame_every and i % frame_every == 0:
+                    self.flush()
+                    on_frame(self.stats)
+            self.flush()
+        if on_frame is not None:
+            on_frame(self.stats)
+        return self.stats
+
+    def bad_line(self, lineno: int, line: str) -> None:
+        self.stats.bad_lines += 1
+        if not self.stats.first_bad_line:
+            self.stats.first_bad_line = lineno
+
+    def _address(self, command: bytes, force_4b: bool) -> int | None:
+        width = 4 if (force_4b or self.four_byte) else 3
+        if len(command) < 1 + width:
+            self.stats.ignored += 1
+            return None
+        addr = int.from_bytes(command[1 : 1 + width], "big")
+        if width == 3:
+            addr |= self.ext_addr << 24
+        return addr & MAX_ADDRESS
+
+    def _latch(self) -> bool:
+        if self.require_wren and not self.wel:
+            self.stats.ignored += 1
+            return False
+        self.wel = False
+        return True
+
+    def _page_program(self, command: bytes, force_4b: bool) -> None:
+        addr = self._address(command, force_4b)
+        if addr is None or not self._latch():
+            return
+        width = 4 if (force_4b or self.four_byte) else 3
+        data = np.frombuffer(command, dtype=np.uint8)[1 + width :]
+        if data.size == 0:
+            return
+        page_start = addr & ~(PAGE_SIZE - 1)
+        off = addr - page_start
+        self.stats.programs += 1
+        self.stats.bytes_programmed += min(data.size, PAGE_SIZE)
+        self.stats.sectors_touched.add(page_start >> 16)
+        if off == 0 and data.size == PAGE_SIZE:
+            self._append_page(page_start, data.tobytes())
+            return
+        # Bytes wrap inside the page; only the last 256 latched bytes survive.
+        page = np.full(PAGE_SIZE, 0xFF, dtype=np.uint8)
+        keep = data[-PAGE_SIZE:]
+        first = data.size - keep.size
+        page[(off + first + np.arange(keep.size)) % PAGE_SIZE] = keep
+        self._append_page(page_start, page.tobytes())
+
+    def _append_page(self, page_start: int, page: bytes) -> None:
+        if self._run and page_start == self._run_start + len(self._run) and len(self._run) < SECTOR_SIZE:
+            self._run.extend(page)
+            return
+        self._close_run()
+        self._run_start = page_start
+        self._run = bytearray(page)
+
+    def _close_run(self) -> None:
+        if self._run:
+            # SPI page program only clears bits, whatever the model's enforce_nor default.
+            self._push(data_op(self._run_start, self._run, enforce_nor=True))
+            self._run = bytearray()
+
+    def _queue_erase(self, start: int, size: int) -> None:
+        self._close_run()
+        self.stats.erases += 1
+        self.stats.sectors_touched.update(sectors_in_range(start, size))
+        self._push(erase_op(start, size))
+
+    def _push(self, op: BulkOp) -> None:
+        self._ops.append(op)
+        if op.data is not None:
+            self._queued_bytes += len(op.data)
+        if len(self._ops) >= self.batch_ops or self._queued_bytes >= self.batch_bytes:
+            self._apply()
+
+    def _apply(self) -> None:
+        self.model.apply_batch(self._ops)
+        self._ops = []
+        self._queued_bytes = 0
+
+
+def iter_trace(path: str | Path, on_bad_line: Callable[[int, str], None] | None = None) -> Iterable[bytes]:
+    """Commands of a trace file; malformed lines (bad hex, non-ASCII bytes) are skipped and
+    passed to ``on_bad_line(lineno, line)`` so one corrupt line cannot abort a long replay."""
+    with open(path, "r", encoding="ascii", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            try:
+                command = parse_trace_line(line)
+            except ValueError:
+                if on_bad_line is not None:
+                    on_bad_line(lineno, line)
+                continue
+            if command is not None:
+                yield command
+
+
+def replay_trace(model, path: str | Path, **kwargs) -> ReplayStats:
+    frame_kwargs = {k: kwargs.pop(k) for k in ("on_frame", "frame_every") if k in kwargs}
+    replay = SpiReplay(model, **kwargs)
+    return replay.replay(iter_trace(path, replay.bad_line), **frame_kwargs)
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import base64
 import json
+import zlib
 from pathlib import Path
 
+import numpy as np
+
+BufferLike = bytes | bytearray | memoryview | np.ndarray
+
+POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
 
 def parse_int(text: str) -> int:
     text = text.strip()
@@ -15,3 +23,21 @@ def save_json(path: str | Path, data: dict) -> None:
 
 def load_json(path: str | Path) -> dict:
     return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def as_u8_array(buf: BufferLike) -> np.ndarray:
+    """uint8 array over bytes, memoryview or ndarray input without copying."""
+    if isinstance(buf, np.ndarray):
+        return buf if buf.dtype == np.uint8 else buf.view(np.uint8)
+    return np.frombuffer(buf, dtype=np.uint8)
+
+
+def encode_array(arr: np.ndarray) -> str:
+    """Compact JSON-safe encoding (zlib + base64) of a little-endian array."""
+    le = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    return base64.b64encode(zlib.compress(le.tobytes(), 6)).decode("ascii")
+
+
+def decode_array(text: str, dtype, shape) -> np.ndarray:
+    raw = zlib.decompress(base64.b64decode(text))
+    return np.frombuffer(raw, dtype=np.dtype(dtype).newbyteorder("<")).astype(dtype).reshape(shape)
@@ -0,0 +1,124 @@
+"""Workspace holding several device models under one memory budget."""
+
+from __future__ import annotations
+
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from .model import MappedMemoryModel, MemoryModel, SharedMemoryModel, SparseMemoryModel
+
+_device_keys = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class Device:
+    name: str
+    model: MemoryModel
+    key: int  # unique for the process lifetime; used to key render caches
+
+
+class Workspace:
+    """Named device models sharing one memory budget.
+
+    Sparse devices never store erased blocks, so identical lots cost only their programmed
+    data. The budget is checked when a device is added; later growth (sparse devices
+    allocating blocks, undo history) is only caught by ``enforce_budget``, which callers run
+    after writes. It trims undo history but never refuses writes or drops device data, so
+    a workspace can still end up over budget and callers must surface that.
+    """
+
+    def __init__(self, budget_bytes: int = 1 << 30):
+        self.budget_bytes = budget_bytes
+        self._devices: OrderedDict[str, Device] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._devices
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._devices)
+
+    def device(self, name: str) -> Device:
+        return self._devices[name]
+
+    def used_bytes(self) -> int:
+        return sum(d.model.nbytes + _history_bytes(d.model) for d in self._devices.values())
+
+    def over_budget(self) -> bool:
+        return self.used_bytes() > self.budget_bytes
+
+    def enforce_budget(self) -> bool:
+        """Trim undo history, oldest device first, until the workspace fits; False if it still does not."""
+        excess = self.used_bytes() - self.budget_bytes
+        for dev in self._devices.values():
+            history = dev.model.history
+            if excess <= 0:
+                break
+            if history is None or not history.stored_bytes:
+                continue
+            before = history.stored_bytes
+            history.trim(max(0, before - excess))
+            excess -= before - history.stored_bytes
+        return excess <= 0
+
+    def add(self, name: str, model: MemoryModel) -> Device:
+        if name in self._devices:
+            raise ValueError(f"device already exists: {name}")
+        if self.used_bytes() + model.nbytes > self.budget_bytes:
+            raise ValueError("workspace memory budget exceeded")
+        dev = Device(name, model, next(_device_keys))
+        self._devices[name] = dev
+        return dev
+
+    def new_device(self, name: str, backend: str = "sparse") -> Device:
+        if backend == "sparse":
+            model = SparseMemoryModel()
+        elif backend == "dense":
+            model = MemoryModel()
+        elif backend == "shared":
+            model = SharedMemoryModel()
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+        return self.add(name, model)
+
+    def open_dump(self, name: str, path: str | Path, backend: str = "mmap") -> Device:
+        if backend == "mmap":
+            model = MappedMemoryModel(path=str(path))
+        elif backend == "sparse":
+            model = SparseMemoryModel.from_dump(path)
+        elif backend == "shared":
+            model = SharedMemoryModel.from_dump(path)
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+        try:
+            return self.add(name, model)
+        except ValueError:
+            _close(model)
+            raise
+
+    def unique_name(self, base: str) -> str:
+        name, n = base, 2
+        while name in self._devices:
+            name, n = f"{base} ({n})", n + 1
+        return name
+
+    def remove(self, name: str) -> None:
+        _close(self._devices.pop(name).model)
+
+    def close(self) -> None:
+        for name in list(self._devices):
+            self.remove(name)
+
+
+def _history_bytes(model: MemoryModel) -> int:
+    return model.history.stored_bytes if model.history is not None else 0
+
+
+def _close(model: MemoryModel) -> None:
+    if isinstance(model, (MappedMemoryModel, SharedMemoryModel)):
+        model.close()
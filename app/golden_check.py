@@ -0,0 +1,93 @@
+"""Golden-image regression harness: record render digests of dumps, later check them bit-exactly.
+
+    python golden_check.py record golden/ dumps/ --preset --kinds thumb,band,detailed,pyramid0
+    python golden_check.py check golden/ dumps/ --preset --diff diffs/
+
+Sources are dump files (named by stem) and, with ``--preset``, the paper-like preset model.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from batch_render import collect_dumps, parse_sectors
+from core.golden import DEFAULT_KINDS, RENDERS, check_golden, record_golden
+from core.model import MappedMemoryModel, SparseMemoryModel
+from core.preset import apply_paper_like_preset
+from core.render import PALETTES
+
+PRESET_SOURCE = "paper-like"
+
+
+def open_sources(inputs: list[str], preset: bool) -> dict[str, object]:
+    sources: dict[str, object] = {}
+    for dump in collect_dumps(inputs):
+        if dump.stem in sources:
+            raise ValueError(f"two dumps named {dump.stem}")
+        sources[dump.stem] = MappedMemoryModel(path=str(dump))
+    if preset:
+        model = SparseMemoryModel()
+        apply_paper_like_preset(model)
+        sources[PRESET_SOURCE] = model
+    return sources
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("golden", help="golden directory (manifest.json + images/)")
+    parser.add_argument("inputs", nargs="*", help="dump files or directories searched for *.bin")
+    parser.add_argument("--preset", action="store_true", help=f"include the paper-like preset as source '{PRESET_SOURCE}'")
+    parser.add_argument("--kinds", default=",".join(DEFAULT_KINDS), help=f"record: comma list of {', '.join(RENDERS)}")
+    parser.add_argument("--sectors", default="all", help="record: all, programmed or ranges like 0-15,40")
+    parser.add_argument("--bitorder", choices=("msb", "lsb"), default="msb", help="record")
+    parser.add_argument("--palette", choices=sorted(PALETTES), default=None, help="record")
+    parser.add_argument("--no-images", action="store_true", help="record digests only (no diff images later)")
+    parser.add_argument("--diff", default=None, help="check: write diff images of mismatches here")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="render threads")
+    args = parser.parse_args(argv)
+
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    unknown = set(kinds) - set(RENDERS)
+    if unknown or not kinds:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown)) or '(none given)'}")
+    try:
+        sources = open_sources(args.inputs, args.preset)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    if not sources:
+        parser.error("no sources: give dumps and/or --preset")
+
+    t0 = time.perf_counter()
+    try:
+        if args.command == "record":
+            select = lambda model: parse_sectors(args.sectors, model.sector_programmed)
+            manifest = record_golden(
+                args.golden, sources, select, kinds, args.bitorder, args.palette, args.workers, not args.no_images
+            )
+            count = sum(len(d) for d in manifest["sources"].values())
+            print(f"recorded {count} digests from {len(sources)} sources in {time.perf_counter() - t0:.1f}s")
+            return 0
+        report = check_golden(args.golden, sources, args.diff, args.workers)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        for model in sources.values():
+            if isinstance(model, MappedMemoryModel):
+                model.close()
+    for key in report.mismatched:
+        print(f"MISMATCH {key}")
+    for name in report.missing:
+        print(f"MISSING {name} (golden source not checked)")
+    for path in report.diffs:
+        print(f"diff: {path}")
+    status = "ok" if report.ok else f"{len(report.mismatched)} mismatched"
+    print(f"checked {report.checked} digests in {time.perf_counter() - t0:.1f}s: {status}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import argparse
 import sys
 
 from PySide6.QtWidgets import QApplication
@@ -6,8 +7,11 @@ from ui.main_window import MainWindow
 
 
 def main():
-    app = QApplication(sys.argv)
-    win = MainWindow()
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--render-processes", type=int, default=0, help="render full-die passes on N worker processes")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    win = MainWindow(render_processes=args.render_processes)
     win.show()
     sys.exit(app.exec())
 
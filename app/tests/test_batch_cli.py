@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+
+from batch_render import BatchOptions, collect_dumps, main, output_dirs, parse_sectors, run_batch
+from core.addressing import SECTORS_TOTAL, sector_start
+from core.image_io import read_png
+from core.model import SparseMemoryModel
+from core.render import sector_band_images
+
+
+def _dump(path, sector=3):
+    m = SparseMemoryModel()
+    m.program(sector_start(sector), 4096, [{"type": "prng", "size_bytes": 4096, "value": str(sector)}])
+    m.write_dump(path)
+    return m
+
+
+def test_batch_renders_products_and_resumes(tmp_path, capsys):
+    src = tmp_path / "dumps"
+    src.mkdir()
+    model = _dump(src / "a.bin", 3)
+    _dump(src / "b.bin", 7)
+    out = tmp_path / "out"
+    args = [str(src), "-o", str(out), "--products", "thumbs,bands,detailed", "-j", "1"]
+    assert main(args) == 0
+
+    manifest = json.loads((out / "a" / "manifest.json").read_text())
+    assert manifest["outputs"] == ["thumbs.png", "bands.png", "detailed/sector_003.png"]
+    bands = read_png(out / "a" / "bands.png")
+    assert bands.shape == (SECTORS_TOTAL // 32 * 64, 32 * 256, 3)
+    expected = sector_band_images(model.read_view(sector_start(3), 65536)[None], 256, 64)[0]
+    assert np.array_equal(bands[:64, 3 * 256 : 4 * 256], expected)
+    assert not list(out.rglob("*.part*"))
+    capsys.readouterr()
+
+    assert not np.array_equal(read_png(out / "b" / "bands.png"), bands)
+    assert main(args[:-1] + ["4"]) == 0  # the job count is not a render option
+    assert "2 of 2 dumps already rendered" in capsys.readouterr().err
+    assert main(args + ["--force"]) == 0
+    assert "[2/2]" in capsys.readouterr().err
+
+
+def test_changed_options_or_source_rerender(tmp_path):
+    dump = tmp_path / "a.bin"
+    _dump(dump)
+    opts = BatchOptions(products=("thumbs",))
+    assert run_batch([dump], tmp_path / "out", opts, log=None) == 0
+    mtime = (tmp_path / "out" / "a" / "thumbs.png").stat().st_mtime_ns
+    assert run_batch([dump], tmp_path / "out", opts, log=None) == 0
+    assert (tmp_path / "out" / "a" / "thumbs.png").stat().st_mtime_ns == mtime
+    run_batch([dump], tmp_path / "out", BatchOptions(products=("thumbs",), palette="paper"), log=None)
+    assert (tmp_path / "out" / "a" / "thumbs.png").stat().st_mtime_ns != mtime
+
+
+def test_bad_dump_is_reported_and_others_continue(tmp_path, capsys):
+    (tmp_path / "bad.bin").write_bytes(b"\xff" * 100)
+    _dump(tmp_path / "good.bin")
+    assert main([str(tmp_path), "-o", str(tmp_path / "out"), "--products", "thumbs", "-j", "1"]) == 1
+    err = capsys.readouterr().err
+    assert "bad.bin: FAILED" in err and "good.bin: ok" in err
+    assert (tmp_path / "out" / "good" / "manifest.json").exists()
+    assert not (tmp_path / "out" / "bad" / "manifest.json").exists()
+
+
+def test_unexpected_errors_fail_only_their_dump(tmp_path, monkeypatch):
+    import batch_render
+
+    _dump(tmp_path / "a.bin")
+    _dump(tmp_path / "b.bin")
+    render_dump = batch_render.render_dump
+
+    def flaky(dump, out_dir, opts, threads=None):
+        if dump.stem == "a":
+            raise IndexError("boom")
+        return render_dump(dump, out_dir, opts, threads)
+
+    monkeypatch.setattr(batch_render, "render_dump", flaky)
+    dumps = [tmp_path / "a.bin", tmp_path / "b.bin"]
+    assert run_batch(dumps, tmp_path / "out", BatchOptions(products=("thumbs",)), log=None) == 1
+    assert (tmp_path / "out" / "b" / "manifest.json").exists()
+
+
+def test_dump_discovery_and_naming(tmp_path):
+    for d in ("x", "y"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "chip.bin").write_bytes(b"")
+    dumps = collect_dumps([str(tmp_path / "y"), str(tmp_path)])
+    assert [p.parent.name for p in dumps] == ["x", "y"]
+    assert [d.name for d in output_dirs(dumps, tmp_path)] == ["chip", "chip-2"]
+    assert parse_sectors("0-2,5,0x10", np.zeros(SECTORS_TOTAL, bool)) == [0, 1, 2, 5, 16]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from core.render import (
+    sector_band_image,
+    sector_band_images,
+    sector_detailed_image,
+    sector_detailed_images,
+    sector_thumbnail_fast,
+    sector_thumbnail_from_stats,
+    sector_thumbnails_fast,
+    sector_thumbnails_from_stats,
+)
+
+
+def _sectors(n=5):
+    data = np.random.default_rng(7).integers(0, 256, (n, 0x10000), dtype=np.uint8)
+    data[1] = 0xFF
+    data[2, ::3] = 0x00
+    return data
+
+
+def test_band_batch_matches_single():
+    data = _sectors()
+    for out_w, out_h, bitorder in [(256, 64, "msb"), (64, 360, "lsb"), (48, 4096, "msb")]:
+        batch = sector_band_images(data, out_w, out_h, bitorder)
+        assert batch.shape == (len(data), out_h, out_w, 3)
+        for sector, img in zip(data, batch):
+            assert np.array_equal(img, sector_band_image(sector, out_w, out_h, bitorder))
+
+
+def test_detailed_batch_matches_single():
+    data = _sectors()
+    for kwargs in [dict(height=64, with_ecc=False), dict(height=180, orientation="vertical"), dict(height=220, bitorder="lsb")]:
+        batch = sector_detailed_images(data, **kwargs)
+        for sector, img in zip(data, batch):
+            assert np.array_equal(img, sector_detailed_image(sector, **kwargs))
+
+
+def test_thumbnail_batches_match_single():
+    data = _sectors()
+    zero_bits = np.random.default_rng(8).integers(0, 2049, (4, 256))
+    for sector, img in zip(data, sector_thumbnails_fast(data, 48, 32)):
+        assert np.array_equal(img, sector_thumbnail_fast(sector, 48, 32))
+    for counts, img in zip(zero_bits, sector_thumbnails_from_stats(zero_bits, 48, 32)):
+        assert np.array_equal(img, sector_thumbnail_from_stats(counts, 48, 32))
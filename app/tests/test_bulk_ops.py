@@ -0,0 +1,36 @@
+import pytest
+
+from core.bulk import erase_op, program_op
+from core.model import MemoryModel
+
+
+def test_batch_applies_ops_in_order_with_nor_rule():
+    m = MemoryModel()
+    stats = m.apply_batch([
+        program_op(0x0, 0x10000, [{"type": "fill", "size_bytes": 0x10000, "value": 0x0F}]),
+        program_op(0x0, 0x10, [{"type": "fill", "size_bytes": 0x10, "value": 0xF3}]),
+        erase_op(0x8000, 0x8000),
+    ])
+    assert stats.ops == 3
+    assert stats.bytes_total == 0x10000 + 0x10 + 0x8000
+    assert stats.mb_per_s > 0
+    assert m.read(0x0, 0x10) == b"\x03" * 0x10
+    assert m.read(0x10, 4) == b"\x0F" * 4
+    assert m.read(0x8000, 4) == b"\xFF" * 4
+
+
+def test_batch_without_nor_overwrites():
+    m = MemoryModel()
+    m.program(0x100, 4, [{"type": "fill", "size_bytes": 4, "value": 0x00}])
+    m.program(0x100, 4, [{"type": "hex", "size_bytes": 4, "value": "12 34"}], enforce_nor=False)
+    assert m.read(0x100, 4) == b"\x12\x34\x12\x34"
+
+
+def test_batch_validates_before_applying():
+    m = MemoryModel()
+    with pytest.raises(ValueError):
+        m.apply_batch([
+            program_op(0x0, 4, [{"type": "fill", "size_bytes": 4, "value": 0}]),
+            erase_op(0x01FF_FFFF, 2),
+        ])
+    assert m.read(0x0, 4) == b"\xFF" * 4
@@ -0,0 +1,22 @@
+from core.addressing import sectors_in_range
+from core.model import MemoryModel
+
+
+def test_generations_track_exactly_the_touched_pages_and_sectors():
+    m = MemoryModel()
+    m.program(0x1_00F0, 0x20, [{"type": "fill", "size_bytes": 0x20, "value": 0}])
+    assert m.page_generation[0xFF:0x103].tolist() == [0, 1, 1, 0]
+    assert int(m.page_generation.sum()) == 2
+    assert m.sector_generation[:3].tolist() == [0, 1, 0]
+
+
+def test_journal_coalesces_bursts_and_direct_writes():
+    m = MemoryModel()
+    for page in range(16):
+        m.program(page * 0x100, 0x100, [{"type": "fill", "size_bytes": 0x100, "value": 0}])
+    m.mem[0x50000] = 0x00
+    m.mark_dirty(0x50000, 1)
+    m.erase(0x800, 0x100)
+    assert m.drain_dirty() == [(0x0, 0x1000), (0x50000, 1)]
+    assert m.drain_dirty() == []
+    assert list(sectors_in_range(0xFFFF, 2)) == [0, 1]
@@ -0,0 +1,36 @@
+import numpy as np
+
+from core.ecc_overlay import ecc_for_dataset, ecc_matrix_for_sector
+from core.model import MemoryModel, SparseMemoryModel
+
+
+def test_index_tracks_programs_incrementally():
+    m = MemoryModel(enforce_nor=False)
+    index = m.ecc_index
+    assert index.refresh() == 131072
+    m.program(0x30000 + 0x400, 0x100, [{"type": "text", "value": "hello", "size_bytes": 0x100}])
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+    assert np.array_equal(index.bits(0x304), ecc_for_dataset(m.read_view(0x30400, 0x100))[None])
+    assert np.array_equal(index.sector_matrix(3), ecc_matrix_for_sector(m.read_view(0x30000, 0x10000)))
+    assert index.mismatched_pages().size == 0
+
+
+def test_syndromes_find_untracked_bit_flips():
+    m = SparseMemoryModel(enforce_nor=False)
+    m.program(0, 0x2000, [{"type": "prng", "value": 9, "size_bytes": 0x2000}])
+    index = m.ecc_index
+    readback = np.frombuffer(m.read(0, 0x2000), dtype=np.uint8).copy()
+    readback[0x1234] ^= 0x10
+    assert index.mismatched_pages(readback).tolist() == [0x12]
+    m._write(0, np.array([0x00], dtype=np.uint8), True)  # storage primitive: bypasses change tracking
+    assert index.mismatched_pages().tolist() == [0]
+
+
+def test_index_round_trips_through_json():
+    m = MemoryModel(enforce_nor=False)
+    m.program(0x100, 0x100, [{"type": "fill", "value": 0x5A, "size_bytes": 0x100}])
+    meta = m.ecc_index.to_json()
+    other = MemoryModel(enforce_nor=False)
+    other.ecc_index.restore(meta)
+    assert other.ecc_index.mismatched_pages().tolist() == [1]
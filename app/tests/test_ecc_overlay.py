@@ -1,4 +1,6 @@
-from core.ecc_overlay import ecc_for_dataset
+import numpy as np
+
+from core.ecc_overlay import ecc_for_chip, ecc_for_dataset, ecc_matrix_for_sector
 
 
 def test_ecc_deterministic():
@@ -7,3 +9,30 @@ def test_ecc_deterministic():
     e2 = ecc_for_dataset(d)
     assert e1.tolist() == e2.tolist()
     assert len(e1) == 10
+
+
+def _reference_ecc(dataset_bytes):
+    bits = np.unpackbits(np.frombuffer(dataset_bytes, dtype=np.uint8))
+    idx = np.arange(bits.size)
+    sec = np.array([np.bitwise_xor.reduce(bits[idx % 9 == k]) for k in range(9)], dtype=np.uint8)
+    ded = np.bitwise_xor.reduce(bits) ^ np.bitwise_xor.reduce(sec)
+    return np.concatenate([[ded], sec]).astype(np.uint8)
+
+
+def test_batch_matches_reference():
+    rng = np.random.default_rng(3)
+    sector = rng.integers(0, 256, 0x10000, dtype=np.uint8)
+    sector[:0x100] = 0xFF
+    sector[0x100:0x200] = 0x00
+    expected = np.stack([_reference_ecc(sector[p * 256 : (p + 1) * 256].tobytes()) for p in range(256)], axis=1)
+    assert np.array_equal(ecc_matrix_for_sector(sector), expected)
+    assert np.array_equal(ecc_for_dataset(sector[:37]), _reference_ecc(sector[:37].tobytes()))
+
+
+def test_chip_entry_point_matches_sector_matrices():
+    rng = np.random.default_rng(4)
+    chip = rng.integers(0, 256, 4 * 0x10000, dtype=np.uint8)
+    bits = ecc_for_chip(chip, chunk_datasets=300)
+    assert bits.shape == (1024, 10)
+    for sid in range(4):
+        assert np.array_equal(bits[sid * 256 : (sid + 1) * 256].T, ecc_matrix_for_sector(chip[sid * 0x10000 : (sid + 1) * 0x10000]))
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from core.model import MemoryModel
+from core import patterns
+from core.patterns import build_pattern_bytes
+
+
+def _file_seg(path, size, **opts):
+    return [{"type": "file", "value": str(path), "size_bytes": size, **opts}]
+
+
+def test_binary_file_slice_pads_with_erased(tmp_path):
+    blob = os.urandom(3000)
+    path = tmp_path / "fw.bin"
+    path.write_bytes(blob)
+    assert build_pattern_bytes(_file_seg(path, 4000), 4000) == blob + b"\xFF" * 1000
+    assert build_pattern_bytes(_file_seg(path, 200, offset="0x10", length=100), 200) == blob[16:116] + b"\xFF" * 100
+
+
+def test_hex_text_file(tmp_path):
+    path = tmp_path / "golden.hex"
+    path.write_text("DE AD\nBE EF\n0x01, 0x02\n")
+    assert build_pattern_bytes(_file_seg(path, 8), 8) == bytes.fromhex("DEADBEEF0102FFFF")
+    path.write_text("A B C\n")
+    assert build_pattern_bytes(_file_seg(path, 3), 3) == b"\x0A\x0B\x0C"
+
+
+def test_txt_files_are_binary_unless_hex_format_is_requested(tmp_path):
+    from core.patterns import _compile
+
+    path = tmp_path / "notes.txt"
+    path.write_text("hello, flash\n")
+    assert build_pattern_bytes(_file_seg(path, 16), 16) == b"hello, flash\n" + b"\xFF" * 3
+    path.write_text("01 02")
+    cached = _compile.cache_info().currsize
+    assert build_pattern_bytes(_file_seg(path, 2, format="hex"), 2) == b"\x01\x02"
+    assert _compile.cache_info().currsize == cached  # decoded payloads are not cached
+    with pytest.raises(ValueError):
+        build_pattern_bytes(_file_seg(path, 2, format="ihex"), 2)
+
+
+def test_program_firmware_blob_streams_from_file(tmp_path):
+    blob = os.urandom(1 << 22) * 4
+    path = tmp_path / "fw.bin"
+    path.write_bytes(blob)
+    m = MemoryModel(enforce_nor=False)
+    m.program(0x100000, len(blob), _file_seg(path, len(blob)))
+    assert m.read(0x100000, len(blob)) == blob
+
+
+def test_missing_file_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        build_pattern_bytes(_file_seg(tmp_path / "nope.bin", 16), 16)
+
+
+def test_hex_file_is_decoded_once_per_program(tmp_path, monkeypatch):
+    path = tmp_path / "golden.hex"
+    path.write_text("DE AD BE EF\n")
+    reads = []
+    monkeypatch.setattr(patterns, "_read_hex_text", lambda p, read=patterns._read_hex_text: reads.append(p) or read(p))
+    m = MemoryModel()
+    m.program(0, 4, _file_seg(path, 4))
+    assert m.read(0, 4) == bytes.fromhex("DEADBEEF") and len(reads) == 1
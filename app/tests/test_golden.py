@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.addressing import sector_start
+from core.golden import RENDERS, check_golden, diff_image, image_digest, record_golden, render_digests, render_kind
+from core.image_io import PngStreamWriter, read_png
+from core.model import MemoryModel
+from core.preset import apply_paper_like_preset
+
+
+def _model():
+    m = MemoryModel()
+    apply_paper_like_preset(m)
+    return m
+
+
+def test_digests_cover_kinds_and_dedupe_matches_full_render():
+    m = _model()
+    kinds = tuple(RENDERS)
+    fast = render_digests(m, range(20), kinds, workers=2)
+    full = render_digests(m, range(20), kinds, workers=1, dedupe=False)
+    assert fast == full and len(fast) == 20 * len(kinds)
+    assert fast["band/000"] == fast["band/012"] and fast["band/000"] != fast["band/001"]
+    assert fast["band/016"] == image_digest(render_kind(m, "band", [16])[0])
+    assert image_digest(np.zeros((2, 3, 3), np.uint8)) != image_digest(np.zeros((3, 2, 3), np.uint8))
+    with pytest.raises(ValueError):
+        render_digests(m, [0], ("nope",))
+
+
+def test_record_then_check_reports_mismatch_with_diff(tmp_path):
+    m = _model()
+    manifest = record_golden(tmp_path / "golden", {"preset": m}, range(16), ("thumb", "band"), workers=1)
+    assert json.loads((tmp_path / "golden" / "manifest.json").read_text()) == manifest
+    assert check_golden(tmp_path / "golden", {"preset": m}).ok
+
+    m.program(sector_start(5), 4, [{"type": "fill", "size_bytes": 4, "value": 0x00}])
+    report = check_golden(tmp_path / "golden", {"preset": m}, tmp_path / "diff")
+    assert not report.ok and report.checked == 32
+    assert report.mismatched == ["preset:band/005", "preset:thumb/005"]
+    diff = read_png(report.diffs[0])
+    assert diff.shape == (64, 3 * 256 + 4, 3)
+    assert (diff[:, 516:] != [235, 235, 235]).any(axis=2).sum() > 0
+
+    assert check_golden(tmp_path / "golden", {}).missing == ["preset"]
+
+
+def test_diff_image_marks_single_level_changes():
+    a = np.full((4, 5, 3), 100, np.uint8)
+    b = a.copy()
+    b[1, 2, 0] = 101
+    heat = diff_image(a, b)[:, 14:]
+    assert (heat[1, 2] != [235, 235, 235]).all() and (heat[0, 0] == [235, 235, 235]).all()
+
+
+def test_read_png_round_trips_writer_output(tmp_path):
+    img = np.random.default_rng(0).integers(0, 256, (7, 5, 3), dtype=np.uint8)
+    with PngStreamWriter(tmp_path / "a.png", 5, 7) as w:
+        w.write_rows(img[:3])
+        w.write_rows(img[3:])
+    assert np.array_equal(read_png(tmp_path / "a.png"), img)
@@ -0,0 +1,41 @@
+from core.addressing import CAPACITY_BYTES
+from core.model import MappedMemoryModel, MemoryModel, SparseMemoryModel
+
+
+def _dump(tmp_path, model):
+    path = tmp_path / "dump.bin"
+    model.write_dump(path)
+    return path
+
+
+def test_copy_on_write_overlay_only_reaches_file_on_flush(tmp_path):
+    src = SparseMemoryModel()
+    src.program(0x20000, 4, [{"type": "hex", "size_bytes": 4, "value": "DE AD BE EF"}])
+    path = _dump(tmp_path, src)
+    assert path.stat().st_size == CAPACITY_BYTES
+
+    m = MappedMemoryModel(path=str(path))
+    assert m.read(0x20000, 4) == b"\xDE\xAD\xBE\xEF"
+    m.program(0x1000, 2, [{"type": "fill", "size_bytes": 2, "value": 0x00}])
+    m.erase(0x20000, 0x1000)
+    assert m.pending_blocks == 2
+    with open(path, "rb") as f:
+        f.seek(0x1000)
+        assert f.read(2) == b"\xFF\xFF"
+    m.flush()
+    m.close()
+
+    reloaded = MappedMemoryModel(path=str(path))
+    assert reloaded.read(0x1000, 2) == b"\x00\x00"
+    assert reloaded.read(0x20000, 4) == b"\xFF" * 4
+    reloaded.close()
+
+
+def test_write_through_mode_updates_file(tmp_path):
+    path = _dump(tmp_path, MemoryModel())
+    m = MappedMemoryModel(path=str(path), write_through=True)
+    m.program(0x0, 3, [{"type": "text", "size_bytes": 3, "value": "abc"}])
+    m.flush()
+    m.close()
+    with open(path, "rb") as f:
+        assert f.read(3) == b"abc"
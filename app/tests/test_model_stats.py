@@ -0,0 +1,44 @@
+import numpy as np
+
+from core.addressing import sector_start
+from core.model import MappedMemoryModel, MemoryModel, SparseMemoryModel
+from core.render import sector_state_summary, sector_thumbnail_fast, sector_thumbnail_from_stats
+
+
+def _exercise(m):
+    m.program(sector_start(3), 0x10000, [{"type": "text", "size_bytes": 0x10000, "value": "Data Rec"}])
+    m.program(sector_start(4) + 0x10, 3, [{"type": "fill", "size_bytes": 3, "value": 0x0F}])
+    m.erase(sector_start(3) + 0x8000, 0x8000)
+
+
+def test_incremental_stats_match_full_recompute():
+    for cls in (MemoryModel, SparseMemoryModel):
+        m = cls()
+        _exercise(m)
+        incremental = (m.page_programmed.copy(), m.page_zero_bits.copy(), m.sector_programmed.copy(), m.sector_zero_bits.copy())
+        m.recompute_stats()
+        for a, b in zip(incremental, (m.page_programmed, m.page_zero_bits, m.sector_programmed, m.sector_zero_bits)):
+            assert np.array_equal(a, b)
+        assert int(m.sector_programmed[4]) == 3
+        assert int(m.sector_zero_bits[4]) == 12
+        assert m.sector_erased.sum() == 510
+        erased, ratio = sector_state_summary(m.read_view(sector_start(3), 0x10000))
+        assert not erased and ratio == m.sector_programmed[3] / 0x10000
+
+
+def test_mapped_model_computes_stats_on_demand(tmp_path):
+    src = MemoryModel()
+    _exercise(src)
+    path = tmp_path / "dump.bin"
+    src.write_dump(path)
+    m = MappedMemoryModel(path=str(path))
+    assert np.array_equal(m.page_zero_bits, src.page_zero_bits)
+    m.close()
+
+
+def test_thumbnail_from_stats_matches_byte_scan():
+    m = MemoryModel()
+    _exercise(m)
+    data = m.read_view(sector_start(3), 0x10000)
+    from_stats = sector_thumbnail_from_stats(m.page_zero_bits[3 * 256 : 4 * 256], 48, 32)
+    assert np.array_equal(from_stats, sector_thumbnail_fast(data, 48, 32))
@@ -0,0 +1,74 @@
+import struct
+
+import numpy as np
+import pytest
+
+from core.addressing import sector_start
+from core.image_io import PngStreamWriter, TiffStreamWriter, open_image_writer, read_png
+from core.layout import SceneLayout, section8x2_scene_size, section8x2_scene_xy
+from core.model import MemoryModel
+from core.mosaic import BACKGROUND, STRIP, mosaic_tiles, render_mosaic, render_mosaic_tile
+
+
+def read_tiff(path):
+    data = open(path, "rb").read()
+    (ifd,) = struct.unpack("<I", data[4:8])
+    (count,) = struct.unpack("<H", data[ifd : ifd + 2])
+    tags = {}
+    for i in range(count):
+        tag, kind, n, value = struct.unpack("<HHII", data[ifd + 2 + 12 * i : ifd + 14 + 12 * i])
+        tags[tag] = (kind, n, value & 0xFFFF if kind == 3 and n == 1 else value)
+    w, h = tags[256][2], tags[257][2]
+    _, n, off = tags[273]
+    _, _, cnt = tags[279]
+    offsets = [off] if n == 1 else struct.unpack(f"<{n}I", data[off : off + 4 * n])
+    counts = [cnt] if n == 1 else struct.unpack(f"<{n}I", data[cnt : cnt + 4 * n])
+    pixels = b"".join(data[o : o + c] for o, c in zip(offsets, counts))
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(h, w, 3)
+
+
+@pytest.mark.parametrize("cls,name", [(PngStreamWriter, "a.png"), (TiffStreamWriter, "a.tif")])
+def test_stream_writers_roundtrip(tmp_path, cls, name):
+    img = np.random.default_rng(1).integers(0, 256, (150, 37, 3), dtype=np.uint8)
+    with cls(tmp_path / name, 37, 150) as w:
+        for r in range(0, 150, 41):
+            w.write_rows(img[r : r + 41])
+    back = read_png(tmp_path / name) if name.endswith(".png") else read_tiff(tmp_path / name)
+    assert np.array_equal(back, img)
+
+
+def test_writer_rejects_short_image_and_unknown_format(tmp_path):
+    w = PngStreamWriter(tmp_path / "short.png", 4, 4)
+    w.write_rows(np.zeros((2, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        w.close()
+    with pytest.raises(ValueError):
+        open_image_writer(tmp_path / "x.bmp", 4, 4)
+
+
+def test_mosaic_tiles_follow_scene_layout():
+    cfg = SceneLayout()
+    w, h, tiles = mosaic_tiles(2.0, cfg, 16)
+    sw, sh = section8x2_scene_size(cfg, 16)
+    assert (w, h) == (round(sw * 2), round(sh * 2)) and len(tiles) == 512
+    for t in tiles:
+        x, y = section8x2_scene_xy(cfg, t.sector_id, 16)
+        assert (t.x0, t.y0) == (round(x * 2), round(y * 2))
+        assert 0 <= t.x0 < t.x1 <= w and 0 <= t.y0 < t.y1 <= h
+    _, _, fewer = mosaic_tiles(1.0, cfg, 4)
+    assert len(fewer) == 128 and all(t.sector_id % 16 < 4 for t in fewer)
+
+
+@pytest.mark.parametrize("lod", [0, 1, 2])
+def test_render_mosaic_places_every_tile(tmp_path, lod):
+    m = MemoryModel()
+    m.program(sector_start(37), 0x10000, [{"type": "prng", "value": "1", "size_bytes": 0x10000}])
+    w, h = render_mosaic(m, tmp_path / "die.png", lod=lod, scale=1.0, band_rows=50, workers=2)
+    img = read_png(tmp_path / "die.png")
+    assert img.shape == (h, w, 3)
+    _, _, tiles = mosaic_tiles(1.0)
+    for t in tiles[::37] + [tiles[37]]:
+        assert np.array_equal(img[t.y0 : t.y1, t.x0 : t.x1], render_mosaic_tile(m, t, lod))
+    assert (img[0, 0] == BACKGROUND).all()
+    assert (img == STRIP).all(axis=2).any()
+    assert not np.array_equal(render_mosaic_tile(m, tiles[37], lod), render_mosaic_tile(m, tiles[36], lod))
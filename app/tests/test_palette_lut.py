@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from core.render import BAND_SHADES, PALETTES, palette_lut, sector_band_images, sector_detailed_images, sector_thumbnails_from_stats
+
+
+@pytest.mark.parametrize("out_w,out_h", [(256, 64), (44, 30), (440, 300), (64, 16), (128, 4096)])
+def test_paper_lut_matches_float_renderer_within_one_level(out_w, out_h):
+    rng = np.random.default_rng(3)
+    sectors = rng.integers(0, 256, (3, 0x10000), dtype=np.uint8)
+    sectors[0] = 0xFF
+    sectors[1, ::5] = 0x00
+    ref = sector_band_images(sectors, out_w, out_h)
+    lut = sector_band_images(sectors, out_w, out_h, palette=PALETTES["paper"])
+    assert lut.shape == ref.shape and lut.dtype == np.uint8
+    assert np.abs(lut.astype(int) - ref).max() <= 1
+
+
+def test_palette_lut_layout_and_shading():
+    pal = PALETTES["colorblind"]
+    lut = palette_lut(pal, BAND_SHADES)
+    assert lut.shape == (512, 3) and not lut.flags.writeable
+    assert tuple(lut[256]) == pal.erased and tuple(lut[511]) == pal.programmed
+    assert (lut[:256] <= lut[256:]).all()
+    assert palette_lut(pal, BAND_SHADES) is lut
+
+
+def test_palette_pixels_come_from_its_lut():
+    rng = np.random.default_rng(4)
+    sectors = rng.integers(0, 256, (2, 0x10000), dtype=np.uint8)
+    cb = sector_detailed_images(sectors, height=64, with_ecc=False, palette=PALETTES["colorblind"])
+    key = lambda rgb: rgb.reshape(-1, 3).astype(np.int64) @ np.array([1 << 16, 1 << 8, 1])
+    assert np.isin(key(cb), key(palette_lut(PALETTES["colorblind"], BAND_SHADES))).all()
+
+    zero_bits = rng.integers(0, 2049, (4, 256))
+    ref = sector_thumbnails_from_stats(zero_bits, 48, 32)
+    assert np.abs(sector_thumbnails_from_stats(zero_bits, 48, 32, PALETTES["paper"]).astype(int) - ref).max() <= 1
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from core.bulk import program_op
+from core.model import MemoryModel
+from core.patterns import build_pattern_bytes, compile_pattern, segment_to_bytes
+
+
+def _reference(segments, target):
+    out = bytearray()
+    for seg in segments:
+        size = int(seg["size_bytes"])
+        if size > 0:
+            out.extend(segment_to_bytes(seg["type"], seg.get("value", ""), size))
+    out.extend([0xFF] * max(0, target - len(out)))
+    return bytes(out[:target])
+
+
+SEGMENTS = [
+    {"type": "text", "value": "ABC", "size_bytes": 10},
+    {"type": "hex", "value": "DE AD BE EF 01", "size_bytes": 7},
+    {"type": "fill", "value": "0x5A", "size_bytes": 0},
+    {"type": "hex", "value": "", "size_bytes": 3},
+    {"type": "fill", "value": 0, "size_bytes": 5},
+]
+
+
+@pytest.mark.parametrize("target", [0, 1, 9, 17, 25, 100])
+def test_build_matches_reference(target):
+    assert build_pattern_bytes(SEGMENTS, target) == _reference(SEGMENTS, target)
+
+
+def test_chunks_concatenate_to_full_pattern():
+    segs = [{"type": "text", "value": "0123456789", "size_bytes": 1000}, {"type": "fill", "value": 7, "size_bytes": 333}]
+    plan = compile_pattern(segs)
+    chunks = b"".join(c.tobytes() for c in plan.iter_chunks(1500, chunk_size=64))
+    assert chunks == _reference(segs, 1500)
+    dest = np.zeros(100, dtype=np.uint8)
+    plan.write_into(dest, 995)
+    assert dest.tobytes() == _reference(segs, 1095)[995:]
+
+
+def test_identical_specs_share_plan():
+    a = compile_pattern([{"type": "hex", "value": "AA 55", "size_bytes": 8}])
+    b = compile_pattern([{"type": "hex", "value": "AA 55", "size_bytes": 8}])
+    assert a is b
+
+
+def test_streamed_program_matches_pattern():
+    m = MemoryModel(enforce_nor=False)
+    segs = [{"type": "text", "value": "xyz", "size_bytes": (1 << 20) + 5}]
+    m.program(100, (3 << 20) + 1, segs)
+    assert m.read(100, (3 << 20) + 1) == _reference(segs, (3 << 20) + 1)
+
+
+def test_invalid_pattern_rejected_before_any_write():
+    m = MemoryModel(enforce_nor=False)
+    bad = {"type": "fill", "value": "0x1FF", "size_bytes": 4}
+    with pytest.raises(ValueError):
+        m.apply_batch([program_op(0, 4, [{"type": "fill", "value": 0, "size_bytes": 4}]), program_op(8, 4, [bad])])
+    assert m.read(0, 4) == b"\xFF" * 4
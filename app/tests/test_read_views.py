@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from core.ecc_overlay import ecc_matrix_for_sector
+from core.model import MemoryModel, SparseMemoryModel
+from core.render import sector_band_image
+
+
+def test_read_view_aliases_storage_and_is_read_only():
+    m = MemoryModel()
+    view = m.read_view(0x100, 4)
+    snap = m.snapshot(0x100, 4)
+    m.program(0x100, 4, [{"type": "fill", "size_bytes": 4, "value": 0x12}])
+    assert view.tobytes() == b"\x12" * 4
+    assert snap.tobytes() == b"\xFF" * 4
+    with pytest.raises(ValueError):
+        view[0] = 0
+    with pytest.raises(ValueError):
+        snap[0] = 0
+
+
+def test_sparse_read_view_within_and_across_blocks():
+    m = SparseMemoryModel()
+    m.program(0xFFE, 4, [{"type": "hex", "size_bytes": 4, "value": "01 02 03 04"}])
+    assert m.read_view(0xFFE, 4).tobytes() == b"\x01\x02\x03\x04"
+    assert m.read_view(0x2000, 2).tobytes() == b"\xFF\xFF"
+    assert m.block_count == 2
+
+
+def test_sparse_read_view_is_a_snapshot():
+    m = SparseMemoryModel()
+    erased = m.read_view(0x1000, 4)
+    m.program(0x1000, 4, [{"type": "fill", "size_bytes": 4, "value": 0x00}])
+    programmed = m.read_view(0x1000, 4)
+    m.erase(0x1000, 0x1000)
+    assert erased.tobytes() == b"\xFF" * 4 and programmed.tobytes() == b"\x00" * 4
+    with pytest.raises(ValueError):
+        programmed[0] = 1
+
+
+def test_render_paths_accept_views():
+    m = MemoryModel()
+    m.program(0x0, 0x10000, [{"type": "text", "size_bytes": 0x10000, "value": "Data"}])
+    view = m.read_view(0x0, 0x10000)
+    raw = m.read(0x0, 0x10000)
+    assert np.array_equal(sector_band_image(view, 64, 64), sector_band_image(raw, 64, 64))
+    assert np.array_equal(ecc_matrix_for_sector(view), ecc_matrix_for_sector(raw))
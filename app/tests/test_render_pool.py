@@ -0,0 +1,105 @@
+import gc
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from core.addressing import SECTOR_SIZE, sector_start
+from core.model import MemoryModel, SharedMemoryModel
+from core.mosaic import render_mosaic
+from core.pyramid import LEVELS, SectorPyramid
+from core.render import PALETTES, sector_band_images
+from core.render_pool import ProcessRenderPool, _cached_segments
+from core.workspace import Workspace
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessRenderPool(workers=1, chunk=2)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def shared():
+    m = SharedMemoryModel(enforce_nor=False)
+    m.program(sector_start(1), 4 * SECTOR_SIZE, [{"type": "prng", "value": "7", "size_bytes": 4 * SECTOR_SIZE}])
+    yield m
+    m.close()
+
+
+def test_band_images_match_in_process_render(pool, shared):
+    ids = [0, 1, 3, 4, 300]
+    sectors = np.stack([shared.read_view(sector_start(s), SECTOR_SIZE) for s in ids])
+    for palette in (None, PALETTES["paper"]):
+        result = pool.band_images(shared, ids, 44, 30, "lsb", palette)
+        try:
+            assert np.array_equal(result.result(), sector_band_images(sectors, 44, 30, "lsb", palette=palette))
+            assert result.revisions.tolist() == [0, 1, 1, 1, 0]
+        finally:
+            result.release()
+
+
+def test_pyramid_build_on_workers_matches_local(pool, shared):
+    remote, local = SectorPyramid(shared), SectorPyramid(shared)
+    remote.refresh(pool)
+    for level in range(LEVELS):
+        assert np.array_equal(remote.counts(range(512), level), local.counts(range(512), level))
+
+
+def test_mosaic_with_processes_is_identical(pool, shared, tmp_path):
+    render_mosaic(shared, tmp_path / "a.tif", lod=2, scale=1.0, processes=pool)
+    render_mosaic(shared, tmp_path / "b.tif", lod=2, scale=1.0)
+    assert (tmp_path / "a.tif").read_bytes() == (tmp_path / "b.tif").read_bytes()
+
+
+def test_pool_rejects_private_models(pool):
+    assert not pool.supports(MemoryModel())
+    with pytest.raises(ValueError):
+        pool.band_counts(MemoryModel(), [0], 64, 128)
+
+
+def test_shared_backend_in_workspace():
+    ws = Workspace()
+    model = ws.new_device("s", backend="shared").model
+    model.program(0, 4, [{"type": "hex", "value": "00", "size_bytes": 4}])
+    assert model.read(0, 6) == b"\x00" * 4 + b"\xff" * 2
+    ws.close()
+    assert not ProcessRenderPool.supports(model)
+
+
+def _run(result):
+    try:
+        result.result()
+    finally:
+        result.release()
+
+
+def test_shared_dump_backend_and_closed_segments_are_dropped(pool, tmp_path):
+    src = MemoryModel()
+    src.program(sector_start(2), 4, [{"type": "hex", "value": "12 34", "size_bytes": 4}])
+    src.write_dump(tmp_path / "d.bin")
+    ws = Workspace()
+    model = ws.open_dump("d", tmp_path / "d.bin", backend="shared").model
+    assert pool.supports(model) and not model.closed
+    assert model.read(sector_start(2), 4) == b"\x12\x34\x12\x34" and int(model.sector_programmed[2]) == 4
+
+    _run(pool.band_counts(model, [2], 64, 128))
+    assert model.shm_name in pool._pool.submit(_cached_segments).result()
+    ws.close()
+    assert model.closed and not pool.supports(model)
+    other = SharedMemoryModel()
+    try:
+        _run(pool.band_counts(other, [0], 64, 128))
+        assert pool._pool.submit(_cached_segments).result() == [other.shm_name]
+    finally:
+        other.close()
+
+
+def test_unclosed_shared_model_is_unlinked_when_collected():
+    model = SharedMemoryModel()
+    name = model.shm_name
+    del model
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
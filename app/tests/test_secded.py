@@ -0,0 +1,51 @@
+import numpy as np
+
+from core.model import MemoryModel
+from core.secded import STATUS_CORRECTED, STATUS_OK, STATUS_UNCORRECTABLE, secded_correct, secded_encode
+
+
+def _pages(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, n * 256, dtype=np.uint8)
+
+
+def test_single_errors_corrected_anywhere():
+    clean = _pages(1)
+    codes = secded_encode(clean)
+    for bit in range(0, 2048, 7):
+        data = clean.copy()
+        data[bit >> 3] ^= 0x80 >> (bit & 7)
+        report = secded_correct(data, codes)
+        assert report.status.tolist() == [STATUS_CORRECTED]
+        assert np.array_equal(data, clean)
+
+
+def test_check_bit_errors_and_double_errors():
+    clean = _pages(4, seed=1)
+    codes = secded_encode(clean)
+    data = clean.copy()
+    bad_codes = codes.copy()
+    bad_codes[0] ^= 1 << 5  # check bit
+    bad_codes[1] ^= 1 << 12  # overall parity bit
+    data[2 * 256 + 10] ^= 0x11  # two bits in one dataset
+    report = secded_correct(data, bad_codes)
+    assert report.status.tolist() == [STATUS_CORRECTED, STATUS_CORRECTED, STATUS_UNCORRECTABLE, STATUS_OK]
+    assert np.array_equal(data[:512], clean[:512])
+    assert report.corrected == 2 and report.uncorrectable == 1
+
+
+def test_index_corrects_dump_and_model():
+    m = MemoryModel(enforce_nor=False)
+    m.program(0x10000, 0x10000, [{"type": "prng", "value": 5, "size_bytes": 0x10000}])
+    dump = np.frombuffer(m.read(0, 0x40000), dtype=np.uint8).copy()
+    dump[0x10005] ^= 0x04
+    dump[0x30000] ^= 0x03
+    report = m.ecc_index.correct(dump)
+    corrected, uncorrectable = report.per_sector()
+    assert corrected.tolist() == [0, 1, 0, 0] and uncorrectable.tolist() == [0, 0, 0, 1]
+    assert dump[0x10005] == m.read(0x10005, 1)[0]
+
+    original = m.read(0x1FF00, 1)[0]
+    m._write(0x1FF00, np.array([original ^ 0x40], dtype=np.uint8), False)  # untracked flip
+    report = m.ecc_index.correct()
+    assert report.corrected == 1 and m.read(0x1FF00, 1)[0] == original
+    assert m.ecc_index.correct().corrected == 0
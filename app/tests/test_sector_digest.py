@@ -0,0 +1,36 @@
+from core.addressing import SECTOR_SIZE, sector_start
+from core.model import MemoryModel, SparseMemoryModel
+from core.preset import apply_paper_like_preset
+from core.sector_digest import ERASED_DIGEST, sector_digest
+
+
+def test_erased_sectors_share_digest_without_hashing():
+    m = MemoryModel()
+    digests = m.sector_digests
+    assert digests.refresh() == 0
+    assert set(digests.digests) == {ERASED_DIGEST}
+    assert digests.refresh() == 0
+
+
+def test_digest_tracks_writes_incrementally():
+    m = SparseMemoryModel()
+    digests = m.sector_digests
+    digests.refresh()
+    m.program(sector_start(3), 0x100, [{"type": "prng", "value": "9", "size_bytes": 0x100}])
+    m.program(sector_start(9), 0x100, [{"type": "prng", "value": "9", "size_bytes": 0x100}])
+    assert digests.refresh() == 2
+    assert digests[3] == digests[9] == sector_digest(m.read_view(sector_start(3), SECTOR_SIZE))
+    assert digests[3] != ERASED_DIGEST and digests[4] == ERASED_DIGEST
+    m.erase(sector_start(9), SECTOR_SIZE)
+    assert digests.refresh() == 0 and digests[9] == ERASED_DIGEST
+    m.undo()
+    assert digests[9] == digests[3]
+
+
+def test_preset_duplicate_pairs_group_together():
+    m = MemoryModel()
+    apply_paper_like_preset(m)
+    groups = m.sector_digests.groups()
+    for a, b in [(0, 12), (7, 10), (5, 8), (6, 11)]:
+        assert b in groups[m.sector_digests[a]]
+    assert len(groups) < 512
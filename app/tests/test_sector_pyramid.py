@@ -0,0 +1,41 @@
+import numpy as np
+
+from core.addressing import SECTOR_SIZE, sector_start
+from core.model import MemoryModel
+from core.pyramid import COLUMNS_TOTAL, LEVELS, SectorPyramid, level_denominator, level_shape
+from core.render import PALETTES, band_images_from_counts, sector_band_images
+
+
+def _model():
+    m = MemoryModel(enforce_nor=False)
+    m.program(sector_start(2), 3 * SECTOR_SIZE, [{"type": "prng", "value": "5", "size_bytes": 3 * SECTOR_SIZE}])
+    return m
+
+
+def test_every_level_renders_like_a_direct_band_pool():
+    m = _model()
+    sectors = np.stack([m.read_view(sector_start(s), SECTOR_SIZE) for s in (0, 2, 4)])
+    for bitorder in ("msb", "lsb"):
+        pyramid = m.sector_pyramid(bitorder)
+        for level in range(LEVELS):
+            h, w = level_shape(level)
+            counts = pyramid.counts([0, 2, 4], level)
+            assert counts.shape == (3, h, w)
+            for palette in (None, PALETTES["paper"]):
+                img = band_images_from_counts(counts, level_denominator(level), w, palette)
+                assert np.array_equal(img, sector_band_images(sectors, w, h, bitorder, palette=palette))
+
+
+def test_page_writes_update_only_their_columns():
+    m = _model()
+    pyramid = m.sector_pyramid()
+    assert pyramid.refresh() == COLUMNS_TOTAL and pyramid.refresh() == 0
+    m.program(sector_start(3) + 0x300, 0x100, [{"type": "hex", "value": "00", "size_bytes": 0x100}])
+    m.program(sector_start(9), 0x800, [{"type": "prng", "value": "1", "size_bytes": 0x800}])
+    assert pyramid.refresh() == 1 + 4
+    fresh = SectorPyramid(m)
+    for level in range(LEVELS):
+        assert np.array_equal(pyramid.counts(range(512), level), fresh.counts(range(512), level))
+    m.undo()
+    assert pyramid.refresh() == 8  # undo restores the whole 4 KiB block
+    assert np.array_equal(pyramid.counts([9], 0), SectorPyramid(m).counts([9], 0))
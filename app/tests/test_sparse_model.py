@@ -0,0 +1,28 @@
+from core.addressing import SUB4_SIZE
+from core.model import MemoryModel, SparseMemoryModel
+
+
+def test_sparse_matches_dense_contract():
+    dense, sparse = MemoryModel(), SparseMemoryModel()
+    seg = [{"type": "text", "size_bytes": 0x3000, "value": "Data"}]
+    for m in (dense, sparse):
+        m.program(0x0FF0, 0x3000, seg)
+        m.program(0x1000, 0x10, [{"type": "fill", "size_bytes": 0x10, "value": 0x0F}])
+        m.erase(0x2000, 0x1000)
+    assert sparse.read(0x0, 0x5000) == dense.read(0x0, 0x5000)
+    assert sparse.block_count == 3
+
+
+def test_sparse_erase_frees_blocks_and_erased_data_allocates_nothing():
+    m = SparseMemoryModel()
+    m.program(0x0, 0x100, [{"type": "fill", "size_bytes": 0x100, "value": 0xFF}])
+    assert m.block_count == 0
+    m.program(0x10000, 0x10000, [{"type": "fill", "size_bytes": 0x10000, "value": 0x00}])
+    assert m.block_count == 0x10000 // SUB4_SIZE
+    m.erase(0x10000, 0x8000)
+    assert m.block_count == 8
+    m.erase(0x18000, 0x10)
+    assert m.block_count == 8
+    m.erase(0x18000, 0x8000)
+    assert m.block_count == 0
+    assert m.read(0x10000, 0x10) == b"\xFF" * 0x10
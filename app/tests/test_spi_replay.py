@@ -0,0 +1,89 @@
+from core.addressing import SECTOR_SIZE
+from core.model import MemoryModel
+from core.spi_replay import SpiReplay, parse_trace_line, replay_trace
+
+
+def test_parse_trace_line_accepts_prefixes_and_comments():
+    assert parse_trace_line("0x02, 0x00 0x10 00 aa  # program") == b"\x02\x00\x10\x00\xAA"
+    assert parse_trace_line("   # only a comment") is None
+
+
+def test_replay_programs_erases_and_honours_wren(tmp_path):
+    m = MemoryModel()
+    m.program(0x2000, 4, [{"type": "fill", "size_bytes": 4, "value": 0}])
+    trace = tmp_path / "trace.txt"
+    trace.write_text(
+        "\n".join([
+            "02 00 01 00 11",          # ignored: no WREN
+            "06", "02 00 01 00 11 22",
+            "06", "02 00 01 FE 01 02 03",  # wraps inside the page
+            "06", "20 00 20 10",       # 4KiB erase of 0x2000
+            "B7", "06", "02 01 00 00 00 AB",  # 4-byte address mode
+            "E9", "06", "12 00 00 03 00 CD",  # 4-byte opcode in 3-byte mode
+            "03 00 00 00",             # read: ignored
+        ])
+    )
+    frames = []
+    stats = replay_trace(m, trace, on_frame=lambda s: frames.append(s.commands), frame_every=4)
+    # third byte of the wrapped program lands on 0x100: 0x11 & 0x03
+    assert m.read(0x100, 2) == b"\x01\x22"
+    assert m.read(0x1FE, 2) == b"\x01\x02"
+    assert m.read(0x1_000_000, 1) == b"\xAB"
+    assert m.read(0x300, 1) == b"\xCD"
+    assert m.read(0x2000, 4) == b"\xFF" * 4
+    assert stats.programs == 4 and stats.erases == 1 and stats.ignored == 2
+    assert stats.sectors_touched == {0, 0x100}
+    assert frames == [4, 8, 12, 14]
+
+
+def test_sequential_page_programs_merge_and_bulk_erase():
+    m = MemoryModel()
+    replay = SpiReplay(m, require_wren=False)
+    pages = [bytes([0x02, 0x00, p, 0x00]) + bytes([p]) * 256 for p in range(16)]
+    replay.replay(pages)
+    assert m.read(0xF00, 1) == b"\x0F"
+    assert m.drain_dirty() == [(0, 0x1000)]
+    replay.replay([b"\xC7"])
+    assert int(m.sector_programmed.sum()) == 0
+    assert m.read(0, SECTOR_SIZE) == b"\xFF" * SECTOR_SIZE
+
+
+def test_partial_page_programs_only_clear_bits_on_non_nor_model():
+    m = MemoryModel(enforce_nor=False)
+    replay = SpiReplay(m, require_wren=False)
+    replay.replay([b"\x02\x00\x00\x00" + b"\x00" * 4, b"\x02\x00\x00\x08" + b"\x00" * 4])
+    assert m.read(0, 12) == b"\x00" * 4 + b"\xFF" * 4 + b"\x00" * 4
+
+
+def test_runs_are_capped_at_a_sector_and_batches_by_bytes():
+    m = MemoryModel()
+    replay = SpiReplay(m, require_wren=False, batch_bytes=2 * SECTOR_SIZE)
+    flushed = []
+    apply_batch = m.apply_batch
+    m.apply_batch = lambda ops: flushed.append([op.size for op in ops]) or apply_batch(ops)
+    for p in range(3 * SECTOR_SIZE // 256):
+        replay.feed(b"\x02" + (p * 256).to_bytes(3, "big") + b"\x00" * 256)
+    assert flushed == [[SECTOR_SIZE, SECTOR_SIZE]]
+    replay.flush()
+    assert flushed[-1] == [SECTOR_SIZE]
+    assert (m.sector_programmed[:3] == SECTOR_SIZE).all()
+
+
+def test_malformed_lines_are_counted_and_skipped(tmp_path):
+    m = MemoryModel()
+    trace = tmp_path / "trace.txt"
+    trace.write_bytes(b"06\n02 00 00 00 11\n02 00 0G 00 22\n\xff\xfe\n06\n02 00 00 01 33\n")
+    stats = replay_trace(m, trace)
+    assert m.read(0, 2) == b"\x11\x33"
+    assert stats.bad_lines == 2 and stats.first_bad_line == 3 and stats.programs == 2
+
+
+def test_replay_is_one_undo_step_and_keeps_earlier_history():
+    m = MemoryModel()
+    m.program(0x3000, 2, [{"type": "fill", "size_bytes": 2, "value": 0x0F}])
+    pages = [b"\x02" + (p * 256).to_bytes(3, "big") + b"\x00" * 256 for p in range(40)]
+    SpiReplay(m, require_wren=False, batch_ops=2).replay(pages + [b"\x20\x00\x30\x00"])
+    assert m.read(0x3000, 2) == b"\xFF\xFF"
+    assert m.undo()
+    assert m.read(0, 4) == b"\xFF" * 4 and m.read(0x3000, 2) == b"\x0F\x0F"
+    assert m.undo() and not m.undo()
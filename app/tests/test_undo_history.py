@@ -0,0 +1,71 @@
+import pytest
+
+from core.addressing import SECTOR_SIZE, sector_start
+from core.bulk import data_op
+from core.history import UndoHistory
+from core.model import MemoryModel, SparseMemoryModel
+
+
+def _fill(value, size=SECTOR_SIZE):
+    return [{"type": "fill", "size_bytes": size, "value": value}]
+
+
+def test_undo_redo_restores_content_and_bumps_generations():
+    for cls in (MemoryModel, SparseMemoryModel):
+        m = cls()
+        m.program(sector_start(2), SECTOR_SIZE, _fill(0x0F))
+        m.program(sector_start(2) + 0x10, 4, _fill(0x00, 4))
+        m.drain_dirty()
+        gen = int(m.sector_generation[2])
+
+        assert m.undo()
+        assert m.read(sector_start(2) + 0x10, 4) == b"\x0F" * 4
+        assert m.drain_dirty() == [(sector_start(2), 0x1000)]
+        assert int(m.sector_generation[2]) == gen + 1
+        assert m.undo()
+        assert m.read(sector_start(2), 4) == b"\xFF" * 4
+        assert not m.undo()
+
+        assert m.redo() and m.redo()
+        assert m.read(sector_start(2) + 0x10, 4) == b"\x00" * 4
+        assert int(m.sector_programmed[2]) == SECTOR_SIZE
+
+
+def test_pre_images_are_deduplicated_and_compressed():
+    m = MemoryModel()
+    m.program(0, 0x100000, _fill(0x00, 0x100000))
+    # 256 erased pre-images collapse into a single tiny compressed blob.
+    assert m.history.stored_bytes < 256
+
+
+def test_budget_evicts_oldest_steps_first():
+    m = MemoryModel()
+    m.history = UndoHistory(budget_bytes=2 * 0x1000, compress=False)
+    for value in (0x0F, 0x07, 0x03):
+        m.program(0, 1, _fill(value, 1))
+    assert m.history.stored_bytes <= 2 * 0x1000
+    assert m.undo() and m.undo()
+    assert not m.undo()
+    assert m.read(0, 1) == b"\x0F"
+
+
+def test_failing_batch_commits_partial_step_for_undo():
+    m = MemoryModel()
+    write = m._write
+    calls = []
+
+    def flaky(start, data, nor):
+        calls.append(start)
+        if len(calls) == 2:
+            raise OSError("device gone")
+        write(start, data, nor)
+
+    m._write = flaky
+    with pytest.raises(OSError):
+        m.apply_batch([data_op(0, b"\x00" * 4), data_op(0x2000, b"\x00" * 4)])
+    assert m.history._pending is None and m.history.can_undo
+    assert int(m.sector_programmed[0]) == 4
+    m._write = write
+    assert m.undo()
+    assert m.read(0, 4) == b"\xFF" * 4
+    assert m.history.can_redo and not m.undo()
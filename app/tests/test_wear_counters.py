@@ -0,0 +1,35 @@
+import numpy as np
+
+from core.model import MemoryModel
+from core.render import WEAR_COLD, WEAR_HOT, wear_heatmap_colors
+from core.spi_replay import SpiReplay
+from core.utils import decode_array, encode_array
+
+
+def test_wear_counters_count_ops_per_4k_block():
+    m = MemoryModel()
+    m.erase(0x0, 0x10000)
+    m.erase(0x0, 0x1000)
+    m.program(0x0FFF, 2, [{"type": "fill", "size_bytes": 2, "value": 0}])
+    SpiReplay(m, require_wren=False).replay([b"\x20\x00\x20\x00"])
+    assert m.block_erase_count[:4].tolist() == [2, 1, 2, 1]
+    assert m.block_program_count[:3].tolist() == [1, 1, 0]
+    assert int(m.block_erase_count.sum()) == 16 + 1 + 1
+
+
+def test_wear_arrays_roundtrip_and_heatmap():
+    counts = np.arange(8192, dtype=np.uint32) * 3
+    assert np.array_equal(decode_array(encode_array(counts), np.uint32, 8192), counts)
+    colors = wear_heatmap_colors(np.array([0, 5, 10]))
+    assert colors.shape == (3, 3) and colors.dtype == np.uint8
+    assert colors[0].tolist() == WEAR_COLD.tolist() and colors[2].tolist() == WEAR_HOT.tolist()
+
+
+def test_program_wear_counts_pages_whatever_the_batching():
+    merged, scattered = MemoryModel(), MemoryModel()
+    pages = [b"\x02" + (p * 256).to_bytes(3, "big") + b"\x00" * 256 for p in range(16)]
+    SpiReplay(merged, require_wren=False).replay(pages)
+    SpiReplay(scattered, require_wren=False).replay(pages[::-1])
+    assert merged.block_program_count[0] == scattered.block_program_count[0] == 16
+    merged.program(0, 0x2000, [{"type": "fill", "size_bytes": 0x2000, "value": 0}])
+    assert merged.block_program_count[:3].tolist() == [32, 16, 0]
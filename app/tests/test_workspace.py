@@ -0,0 +1,57 @@
+import pytest
+
+from core.addressing import CAPACITY_BYTES, SUB4_SIZE
+from core.model import MemoryModel, SparseMemoryModel
+from core.workspace import Workspace
+
+
+def test_workspace_budget_and_device_keys(tmp_path):
+    ws = Workspace(budget_bytes=CAPACITY_BYTES + 16 * SUB4_SIZE)
+    a = ws.new_device("a", backend="dense")
+    b = ws.new_device("b")
+    assert a.key != b.key
+    b.model.program(0, 2 * SUB4_SIZE, [{"type": "fill", "size_bytes": 2 * SUB4_SIZE, "value": 0}])
+    assert ws.used_bytes() >= CAPACITY_BYTES + 2 * SUB4_SIZE
+    with pytest.raises(ValueError, match="budget"):
+        ws.new_device("c", backend="dense")
+    with pytest.raises(ValueError, match="exists"):
+        ws.new_device("a")
+    assert ws.unique_name("a") == "a (2)"
+
+    path = tmp_path / "lot.bin"
+    b.model.write_dump(path)
+    mapped = ws.open_dump("mapped", path)
+    assert mapped.model.nbytes == 0
+    assert mapped.model.read(0, 4) == b"\x00" * 4
+    ws.close()
+    assert len(ws) == 0
+
+
+def _random(model, seed, blocks=8):
+    size = blocks * SUB4_SIZE
+    model.program(0, size, [{"type": "prng", "size_bytes": size, "value": str(seed)}], enforce_nor=False)
+
+
+def test_enforce_budget_trims_history_then_reports_overrun():
+    ws = Workspace(budget_bytes=20 * SUB4_SIZE)
+    dev = ws.new_device("a")
+    for seed in range(1, 4):  # random pre-images barely compress
+        _random(dev.model, seed)
+    assert ws.over_budget()
+    assert ws.enforce_budget() and not ws.over_budget()
+    assert dev.model.history.can_undo  # only the oldest steps went
+
+    dev.model.program(0x100000, 16 * SUB4_SIZE, [{"type": "fill", "size_bytes": 16 * SUB4_SIZE, "value": 0}])
+    assert not ws.enforce_budget()  # device data is never dropped
+    assert dev.model.history.stored_bytes == 0 and ws.over_budget()
+
+
+def test_sparse_from_dump_keeps_only_programmed_blocks(tmp_path):
+    src = MemoryModel()
+    src.program(0x12345, 3, [{"type": "text", "size_bytes": 3, "value": "abc"}])
+    path = tmp_path / "dump.bin"
+    src.write_dump(path)
+    m = SparseMemoryModel.from_dump(path)
+    assert m.block_count == 1
+    assert m.read(0x12345, 3) == b"abc"
+    assert int(m.sector_programmed[1]) == 3
@@ -8,10 +8,12 @@ from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
 from PySide6.QtGui import QAction, QBrush, QColor, QImage, QPainter, QPen, QPixmap
 from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem, QGraphicsScene, QGraphicsView, QMenu
 
-from core.addressing import SECTOR_SIZE, sector_start
-from core.layout import SceneLayout
+from core.addressing import sector_start
+from core.layout import SceneLayout, section8x2_array_width, section8x2_geometry, section8x2_scene_size, section8x2_xy
 from core.lod_cache import LODCache
-from core.render import sector_detailed_image, sector_state_summary, sector_thumbnail, sector_thumbnail_fast
+from core.pyramid import level_denominator, level_for_rows
+from core.render import PALETTES, band_images_from_counts, sector_state_colors, wear_heatmap_colors
+from core.secded import STATUS_CORRECTED, STATUS_UNCORRECTABLE
 
 
 @dataclass
@@ -25,28 +27,40 @@ class Selection:
 
 
 class RenderSignals(QObject):
-    rendered = Signal(int, int, QPixmap)
+    rendered = Signal(object)  # list of (cache key, QImage)
+
+
+# Tiles per RenderTask: pyramid tiles are at most 64x128 cells.
+BATCH_SIZE = 64
 
 
 class RenderTask(QRunnable):
-    def __init__(self, sector_id: int, revision: int, lod: int, bytes_data: bytes, bitorder: str, signals: RenderSignals):
+    """Renders a batch of same-level tiles from their pyramid counts in a single vectorized pass.
+
+    The pyramid is refreshed here, off the GUI thread; tiles of sectors written since scheduling
+    come back as ``None`` rather than being cached under their old content digest.
+    """
+
+    def __init__(self, keys: list[tuple], pyramid, sector_ids: list[int], revisions: np.ndarray, signals: RenderSignals, pool=None):
         super().__init__()
-        self.sector_id = sector_id
-        self.revision = revision
-        self.lod = lod
-        self.bytes_data = bytes_data
-        self.bitorder = bitorder
+        self.keys = keys  # (sector digest, bitorder, palette, pyramid level)
+        self.pyramid = pyramid
+        self.sector_ids = sector_ids
+        self.revisions = revisions  # sector generations the keys' digests belong to
         self.signals = signals
+        self.pool = pool
 
     def run(self):
-        if self.lod == 1:
-            arr = sector_thumbnail_fast(self.bytes_data, width=48, height=32)
-        else:
-            arr = sector_detailed_image(self.bytes_data, height=64, with_ecc=False, bitorder=self.bitorder)
-        arr = np.ascontiguousarray(arr, dtype=np.uint8)
-        h, w, _ = arr.shape
-        img = QImage(arr.data, w, h, 3 * w, QImage.Format_RGB888)
-        self.signals.rendered.emit(self.sector_id, self.revision, QPixmap.fromImage(img.copy()))
+        _, _, palette, level = self.keys[0]
+        data = self.pyramid.counts(self.sector_ids, level, self.pool)
+        current = self.pyramid.revisions(self.sector_ids) == self.revisions
+        palette = PALETTES.get(palette)  # None keeps the float reference renderer
+        arrs = band_images_from_counts(data, level_denominator(level), data.shape[2], palette)
+        arrs = np.ascontiguousarray(arrs, dtype=np.uint8)
+        _, h, w, _ = arrs.shape
+        # QImage (not QPixmap) off the GUI thread; copy() detaches from the NumPy buffer.
+        images = [QImage(arr.data, w, h, 3 * w, QImage.Format_RGB888).copy() if ok else None for arr, ok in zip(arrs, current)]
+        self.signals.rendered.emit(list(zip(self.keys, images)))
 
 
 class SectorItem(QGraphicsRectItem):
@@ -116,17 +130,21 @@ class DieView(QGraphicsView):
 
         self.layout_cfg = SceneLayout()
         self._items: dict[int, SectorItem] = {}
-        self._revisions = [0] * 512
         self._cache = LODCache(max_items=4096)
         self._hit = 0
         self._miss = 0
-        self._queued = set()
+        self._queued: dict[tuple, set[int]] = {}  # content key -> sectors waiting for it
+        self._tile_keys: dict[int, tuple] = {}  # sector -> content key it should show
         self.thread_pool = QThreadPool.globalInstance()
+        self.render_pool = None  # optional core.render_pool.ProcessRenderPool for full-die pyramid builds
         self.signals = RenderSignals()
         self.signals.rendered.connect(self._on_rendered)
 
         self.bitorder = "msb"
+        self.palette: str | None = None  # key of core.render.PALETTES; None renders without a LUT
         self.show_ecc = True
+        self.wear_overlay: str | None = None  # None, "erase" or "program"
+        self.ecc_status: np.ndarray | None = None  # worst SEC-DED status per sector of the last check
         self._selection: Selection | None = None
         self._pick_row_mode = False
         self._pick_col_mode = False
@@ -153,13 +171,7 @@ class DieView(QGraphicsView):
 
 
     def _layout_geometry(self, cfg: SceneLayout) -> tuple[int, int, int, int]:
-        row_pitch = cfg.tile_h + cfg.tile_gap
-        vis_rows = max(1, min(16, int(self.visible_rows_per_column)))
-        array_h = vis_rows * row_pitch - cfg.tile_gap
-        array0_origin_y = cfg.margin
-        central_strip_y = array0_origin_y + array_h + cfg.array_gap
-        array1_origin_y = central_strip_y + cfg.central_strip_h + cfg.array_gap
-        return array0_origin_y, central_strip_y, array1_origin_y, row_pitch
+        return section8x2_geometry(cfg, self.visible_rows_per_column)
 
     def _apply_visibility_and_layout(self):
         cfg = self.layout_cfg
@@ -172,8 +184,7 @@ class DieView(QGraphicsView):
             item.setVisible(row < vis_rows)
         if self._strip_item is not None:
             self._strip_item.setRect(cfg.margin, central_strip_y, self._array_width(cfg), cfg.central_strip_h)
-        array_h = vis_rows * row_pitch - cfg.tile_gap
-        self.setSceneRect(0, 0, self._array_width(cfg) + cfg.margin * 2, array1_origin_y + array_h + cfg.margin)
+        self.setSceneRect(0, 0, *section8x2_scene_size(cfg, vis_rows))
 
     def set_visible_rows_per_column(self, rows: int):
         self.visible_rows_per_column = max(1, min(16, int(rows)))
@@ -181,21 +192,10 @@ class DieView(QGraphicsView):
         self.refresh_visible()
 
     def _array_width(self, cfg: SceneLayout) -> int:
-        section_w = 2 * cfg.tile_w + cfg.tile_gap
-        return 8 * section_w + 7 * cfg.block_gap
+        return section8x2_array_width(cfg)
 
     def _sector_scene_xy(self, cfg: SceneLayout, sector_id: int, include_row: bool = False):
-        # 8 section columns, 2 physical columns per section, 16 rows contiguous.
-        array_idx = 0 if sector_id < 256 else 1
-        in_array = sector_id if array_idx == 0 else sector_id - 256
-        section_idx = in_array // 32
-        local = in_array % 32
-        group = local // 16
-        row = local % 16
-        col_in_section = 1 - group
-
-        section_w = 2 * cfg.tile_w + cfg.tile_gap
-        x = cfg.margin + section_idx * (section_w + cfg.block_gap) + col_in_section * (cfg.tile_w + cfg.tile_gap)
+        x, row = section8x2_xy(cfg, sector_id)
         y = row * (cfg.tile_h + cfg.tile_gap)
         return (x, y, row) if include_row else (x, y)
 
@@ -330,48 +330,105 @@ class DieView(QGraphicsView):
         self.rotate(deg)
         self.refresh_visible()
 
-    def update_sector_revision(self, sector_id: int):
-        self._revisions[sector_id] += 1
+    def set_model(self, model):
+        """Show another device; tiles are cached by content, so switching back (or to a clone) is instant."""
+        self.model = model
+        self.ecc_status = None
+        self.refresh_visible(force=True)
+
+    def set_wear_overlay(self, kind: str | None):
+        self.wear_overlay = kind
+        self.refresh_visible(force=True)
+
+    def set_palette(self, name: str | None):
+        self.palette = name
+        self.refresh_visible(force=True)
+
+    def set_ecc_status(self, status: np.ndarray | None):
+        self.ecc_status = status
+        self.refresh_visible(force=True)
+
+    def _wear_colors(self) -> np.ndarray | None:
+        if self.wear_overlay is None:
+            return None
+        counts = self.model.block_erase_count if self.wear_overlay == "erase" else self.model.block_program_count
+        return wear_heatmap_colors(counts.reshape(512, -1).sum(axis=1))
 
     def refresh_visible(self, force: bool = False):
-        lod = self._current_lod()
+        lod = self.current_lod()
+        wear = self._wear_colors() if lod == 0 else None
+        state = sector_state_colors(self.model.sector_programmed) if lod == 0 else None
+        digests = self.model.sector_digests.digests if lod else None
+        level = self._pyramid_level()
+        pending: list[tuple] = []
         for sector_id, item in self._items.items():
             if not item.isVisible():
                 continue
             if not force and not self._is_item_visible(item):
                 continue
-            rev = self._revisions[sector_id]
             if lod == 0:
-                sbytes = self.model.read(sector_start(sector_id), SECTOR_SIZE)
-                erased, ratio = sector_state_summary(sbytes)
-                color = QColor(70, 140, 70) if erased else QColor(120 + int(120 * ratio), 170, 70)
+                color = QColor(*(int(c) for c in state[sector_id]))
+                if wear is not None:
+                    color = QColor(*(int(c) for c in wear[sector_id]))
+                if self.ecc_status is not None and self.ecc_status[sector_id] == STATUS_UNCORRECTABLE:
+                    color = QColor(210, 40, 40)
+                elif self.ecc_status is not None and self.ecc_status[sector_id] == STATUS_CORRECTED:
+                    color = QColor(240, 150, 30)
+                self._tile_keys.pop(sector_id, None)
                 item.set_pixmap(None)
                 item.setBrush(QBrush(color))
                 continue
-            key = (sector_id, self.bitorder, lod, rev)
+            # Tiles are keyed by content, so identical sectors (on any device) share one render.
+            key = (digests[sector_id], self.bitorder, self.palette, level)
+            self._tile_keys[sector_id] = key
             cached = self._cache.get(key)
             if cached is not None:
                 self._hit += 1
                 item.set_pixmap(cached)
             else:
                 self._miss += 1
-                if key not in self._queued:
-                    self._queued.add(key)
-                    sbytes = self.model.read(sector_start(sector_id), SECTOR_SIZE)
-                    self.thread_pool.start(RenderTask(sector_id, rev, lod, sbytes, self.bitorder, self.signals))
+                waiting = self._queued.get(key)
+                if waiting is None:
+                    self._queued[key] = {sector_id}
+                    pending.append((key, sector_id))
+                else:
+                    waiting.add(sector_id)
+        if pending:
+            self._schedule(level, pending)
         self._emit_stats()
 
-    def _on_rendered(self, sector_id: int, revision: int, pixmap: QPixmap):
-        lod = 1 if pixmap.height() <= 32 else 2
-        key = (sector_id, self.bitorder, lod, revision)
-        self._cache.put(key, pixmap)
-        self._queued.discard(key)
-        item = self._items.get(sector_id)
-        if item and self._revisions[sector_id] == revision:
-            item.set_pixmap(pixmap)
+    def _schedule(self, level: int, pending: list[tuple]):
+        """Batch missing tiles of one pyramid level; the pyramid is refreshed by the render tasks."""
+        pyramid = self.model.sector_pyramid(self.bitorder)
+        for i in range(0, len(pending), BATCH_SIZE):
+            batch = pending[i : i + BATCH_SIZE]
+            ids = [sector_id for _, sector_id in batch]
+            task = RenderTask([key for key, _ in batch], pyramid, ids, self.model.sector_generation[ids].copy(), self.signals, self.render_pool)
+            self.thread_pool.start(task)
+
+    def _on_rendered(self, tiles: list):
+        retry: list[tuple] = []
+        for key, image in tiles:
+            if image is None:
+                # Written while rendering: render again for sectors still showing this content.
+                waiting = {s for s in self._queued.pop(key, ()) if self._tile_keys.get(s) == key}
+                if waiting:
+                    self._queued[key] = waiting
+                    retry.append((key, next(iter(waiting))))
+                continue
+            pixmap = QPixmap.fromImage(image)
+            self._cache.put(key, pixmap)
+            for sector_id in self._queued.pop(key, ()):
+                # Skip sectors that changed (or a device that was switched) while rendering.
+                if self._tile_keys.get(sector_id) == key:
+                    self._items[sector_id].set_pixmap(pixmap)
+        for key, sector_id in retry:
+            self._schedule(key[3], [(key, sector_id)])
         self._emit_stats()
 
-    def _current_lod(self) -> int:
+    def current_lod(self) -> int:
+        """Tile detail at the current zoom: 0 flat state colours; 1 and 2 pyramid band images at the
+        level matching the zoom (mosaic export renders LOD 2 from sector bytes at full resolution)."""
         scale = self.transform().m11()
         if scale < 0.45:
             return 0
@@ -379,6 +436,10 @@ class DieView(QGraphicsView):
             return 1
         return 2
 
+    def _pyramid_level(self) -> int:
+        """Coarsest pyramid level that still has a cell row per on-screen pixel of a tile."""
+        return level_for_rows(self.layout_cfg.tile_h * self.transform().m11())
+
     def _is_item_visible(self, item: QGraphicsItem) -> bool:
         rect = self.mapToScene(self.viewport().rect()).boundingRect()
         return rect.intersects(item.sceneBoundingRect())
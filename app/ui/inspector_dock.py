@@ -2,14 +2,12 @@ from __future__ import annotations
 
 from PySide6.QtWidgets import QDockWidget, QLabel, QTextEdit, QVBoxLayout, QWidget
 
-from core.addressing import dataset_address
-from core.ecc_overlay import ecc_for_dataset
-
 
 class InspectorDock(QDockWidget):
     def __init__(self, model, parent=None):
         super().__init__("Inspector", parent)
         self.model = model
+        self.secded_report = None  # last SEC-DED check of the current device
         body = QWidget()
         lay = QVBoxLayout(body)
         self.sel_label = QLabel("Selection: none")
@@ -27,14 +25,23 @@ class InspectorDock(QDockWidget):
         end = int(info.get("end", start + int(info.get("size", 0x10000)) - 1))
         self.sel_label.setText(f"Selection: {info.get('level', 'sector')} sector={sector_id} 0x{start:06X}..0x{end:06X}")
 
+        programmed = int(self.model.sector_programmed[sector_id])
+        zero_bits = int(self.model.sector_zero_bits[sector_id])
+        self.sel_label.setText(
+            f"{self.sel_label.text()}\nprogrammed bytes={programmed} ({programmed / 0x10000:.1%}) zero bits={zero_bits}"
+        )
+        if self.secded_report is not None:
+            corrected, uncorrectable = self.secded_report.per_sector()
+            self.sel_label.setText(
+                f"{self.sel_label.text()}\nSEC-DED: corrected={int(corrected[sector_id])} "
+                f"uncorrectable={int(uncorrectable[sector_id])}"
+            )
+
         sample = self.model.read(start, min(32, end - start + 1))
         hexs = " ".join(f"{b:02X}" for b in sample)
         ascii_txt = "".join(chr(b) if 32 <= b < 127 else "." for b in sample)
         self.hex_view.setPlainText(f"addr 0x{start:06X}:\n{hexs}\n{ascii_txt}")
 
-        lines = []
-        for p in range(16):
-            ds_start, _ = dataset_address(sector_id, p)
-            bits = ecc_for_dataset(self.model.read(ds_start, 0x100))
-            lines.append(f"{p:03d}: {''.join(str(int(x)) for x in bits)}")
+        bits = self.model.ecc_index.bits(sector_id * 256, 16)
+        lines = [f"{p:03d}: {''.join(str(int(x)) for x in row)}" for p, row in enumerate(bits)]
         self.ecc_view.setPlainText("\n".join(lines))
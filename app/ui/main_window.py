@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction
-from PySide6.QtWidgets import QFileDialog, QLabel, QMainWindow, QSpinBox, QToolBar
+from pathlib import Path
 
-from core.model import MemoryModel
+import numpy as np
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtWidgets import QApplication, QComboBox, QFileDialog, QLabel, QMainWindow, QProgressDialog, QSpinBox, QToolBar
+
+from core.addressing import sectors_in_range
+from core.model import MemoryModel, SharedMemoryModel
+from core.mosaic import render_mosaic
 from core.preset import apply_paper_like_preset, validate_paper_like_hashes
-from core.utils import load_json, save_json
+from core.render import PALETTES
+from core.render_pool import ProcessRenderPool
+from core.spi_replay import replay_trace
+from core.utils import decode_array, encode_array, load_json, save_json
+from core.workspace import Device, Workspace
 from .die_view import DieView
 from .inspector_dock import InspectorDock
 from .memory_map_dock import MemoryMapDock
@@ -16,13 +26,20 @@ from .single_sector_dock import SingleSectorDock
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, render_processes: int = 0):
         super().__init__()
         self.setWindowTitle("NOR Flash Visualizer (MT25Q-like)")
         self.resize(1600, 920)
-        self.model = MemoryModel()
+        self.workspace = Workspace()
+        # Worker processes need the device bytes in shared memory to render without copies.
+        self.render_pool = ProcessRenderPool(render_processes) if render_processes > 0 else None
+        self.device_backend = "shared" if self.render_pool else "sparse"
+        self.dump_backend = "shared" if self.render_pool else "mmap"
+        device = self.workspace.add("Device 1", SharedMemoryModel() if self.render_pool else MemoryModel())
+        self.model = device.model
 
         self.die = DieView(self.model)
+        self.die.render_pool = self.render_pool
         self.setCentralWidget(self.die)
 
         self.inspector = InspectorDock(self.model)
@@ -47,24 +64,36 @@ class MainWindow(QMainWindow):
         self.die.stats_changed.connect(self.on_stats)
 
         self._last_selection = {"level": "sector", "sector_id": 0, "start": 0, "size": 0x10000, "end": 0xFFFF}
+        # Coalesce model writes (including scripted/direct ones) into one invalidation per frame.
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setInterval(33)
+        self._frame_timer.timeout.connect(self.apply_model_changes)
+        self._frame_timer.start()
         self._make_menu_toolbar()
         self.statusBar().showMessage("Ready")
 
     def _make_menu_toolbar(self):
         mfile = self.menuBar().addMenu("File")
+        medit = self.menuBar().addMenu("Edit")
         mview = self.menuBar().addMenu("View")
         mtools = self.menuBar().addMenu("Tools")
 
         save = QAction("Save Project", self)
         load = QAction("Load Project", self)
-        export = QAction("Export PNG", self)
+        export = QAction("Export Image", self)
         preset = QAction("Load Paper-like Preset", self)
 
         save.triggered.connect(self.save_project)
         load.triggered.connect(self.load_project)
         export.triggered.connect(self.export_png)
         preset.triggered.connect(self.load_paper_like_preset)
-        mfile.addActions([save, load, export, preset])
+        new_device = QAction("New Device", self, triggered=self.new_device)
+        open_dump = QAction("Open Dump as Device", self, triggered=self.open_dump_device)
+        mfile.addActions([save, load, export, preset, new_device, open_dump])
+
+        undo = QAction("Undo", self, shortcut=QKeySequence.Undo, triggered=self.undo)
+        redo = QAction("Redo", self, shortcut=QKeySequence.Redo, triggered=self.redo)
+        medit.addActions([undo, redo])
 
         toolbar = QToolBar("Main", self)
         toolbar.addAction(QAction("Preset", self, triggered=self.load_paper_like_preset))
@@ -76,8 +105,23 @@ class MainWindow(QMainWindow):
         rows_spin.valueChanged.connect(self.die.set_visible_rows_per_column)
         toolbar.addWidget(rows_label)
         toolbar.addWidget(rows_spin)
+        self.device_combo = QComboBox(self)
+        self.device_combo.addItems(self.workspace.names)
+        self.device_combo.currentTextChanged.connect(self.switch_device)
+        toolbar.addWidget(QLabel("Device", self))
+        toolbar.addWidget(self.device_combo)
         self.addToolBar(toolbar)
 
+        for label, kind in [("Wear heatmap: off", None), ("Wear heatmap: erase", "erase"), ("Wear heatmap: program", "program")]:
+            a = QAction(label, self)
+            a.triggered.connect(lambda checked=False, k=kind: self.die.set_wear_overlay(k))
+            mview.addAction(a)
+
+        for label, name in [("Palette: reference", None), ("Palette: paper (LUT)", "paper"), ("Palette: colour-blind (LUT)", "colorblind")]:
+            a = QAction(label, self)
+            a.triggered.connect(lambda checked=False, n=name: self.die.set_palette(n))
+            mview.addAction(a)
+
         for deg in [0, 90, 180, 270]:
             a = QAction(f"Rotate {deg}", self)
             a.triggered.connect(lambda checked=False, d=deg: self.die.rotate_quadrant(d))
@@ -91,15 +135,25 @@ class MainWindow(QMainWindow):
         pick_col.triggered.connect(lambda: self.die.set_column_pick_mode(True))
         mtools.addAction(pick_col)
 
+        replay = QAction("Replay SPI Trace", self)
+        replay.triggered.connect(self.replay_spi_trace)
+        mtools.addAction(replay)
+
+        secded_device = QAction("SEC-DED Correct Device", self)
+        secded_device.triggered.connect(self.secded_correct_device)
+        mtools.addAction(secded_device)
+
+        secded_dump = QAction("SEC-DED Correct Dump File", self)
+        secded_dump.triggered.connect(self.secded_correct_dump)
+        mtools.addAction(secded_dump)
+
     def load_paper_like_preset(self):
-        apply_paper_like_preset(self.model)
-        for sid in range(16):
-            self.die.update_sector_revision(sid)
-        self.die.refresh_visible()
+        stats = apply_paper_like_preset(self.model)
+        self.apply_model_changes()
         self.die.focus_sectors(range(16), target_lod=1)
 
         hashes, results = validate_paper_like_hashes(self.model, bitorder=self.die.bitorder)
-        self.program.append_log("[Preset] Applied sectors 0..15")
+        self.program.append_log(f"[Preset] Applied sectors 0..15 ({stats.mb_per_s:.1f} MB/s)")
         self.program.append_log(f"hash(s0)={hashes[0]} hash(s12)={hashes[12]}")
         self.program.append_log(f"hash(s7)={hashes[7]} hash(s10)={hashes[10]}")
         self.program.append_log(f"hash(s5)={hashes[5]} hash(s8)={hashes[8]}")
@@ -112,6 +166,75 @@ class MainWindow(QMainWindow):
             self.program.append_log("[OK] Visual validation matched for all required pairs")
             self.statusBar().showMessage("Preset loaded and validated", 6000)
 
+    def undo(self):
+        if self.model.undo():
+            self.program.append_log("[Undo]")
+            self.apply_model_changes()
+
+    def redo(self):
+        if self.model.redo():
+            self.program.append_log("[Redo]")
+            self.apply_model_changes()
+
+    def replay_spi_trace(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Replay SPI Trace", filter="Trace (*.txt *.trace);;All files (*)")
+        if not path:
+            return
+
+        # Application-modal: the view repaints between frames, but nothing else can touch the
+        # model (undo, programming, device switches, a second replay) until the replay is done.
+        dialog = QProgressDialog("Replaying SPI trace...", None, 0, 0, self)
+        dialog.setWindowModality(Qt.ApplicationModal)
+        dialog.setMinimumDuration(0)
+        dialog.show()
+
+        def on_frame(stats):
+            self.apply_model_changes()
+            dialog.setLabelText(f"Replaying SPI trace: {stats.commands} commands")
+            QApplication.processEvents()
+
+        try:
+            stats = replay_trace(self.model, path, on_frame=on_frame, frame_every=20000)
+        except (OSError, ValueError) as exc:
+            self.apply_model_changes()
+            self.statusBar().showMessage(f"Replay failed: {exc}", 10000)
+            return
+        finally:
+            dialog.close()
+        self.program.append_log(
+            f"[Replay] {stats.commands} commands: {stats.programs} programs, {stats.erases} erases, "
+            f"{stats.ignored} ignored, {len(stats.sectors_touched)} sectors touched (one undo step)"
+        )
+        if stats.bad_lines:
+            self.program.append_log(f"[WARNING] skipped {stats.bad_lines} malformed line(s), first at line {stats.first_bad_line}")
+
+    def secded_correct_device(self):
+        report = self.model.ecc_index.correct()
+        self.apply_model_changes()
+        self._show_secded_report(report, "device")
+
+    def secded_correct_dump(self):
+        path, _ = QFileDialog.getOpenFileName(self, "SEC-DED Correct Dump", filter="Dump (*.bin)")
+        if not path:
+            return
+        data = np.fromfile(path, dtype=np.uint8)
+        try:
+            report = self.model.ecc_index.correct(data)
+        except ValueError as exc:
+            self.statusBar().showMessage(f"Cannot check dump: {exc}", 6000)
+            return
+        out = Path(path).with_suffix(".corrected.bin")
+        data.tofile(out)
+        self._show_secded_report(report, out.name)
+
+    def _show_secded_report(self, report, target: str):
+        self.die.set_ecc_status(report.sector_status())
+        self.inspector.secded_report = report
+        self.inspector.update_for_selection(self._last_selection)
+        self.program.append_log(
+            f"[SEC-DED] {target}: {report.corrected} datasets corrected, {report.uncorrectable} uncorrectable"
+        )
+
     def on_selection(self, info: dict):
         if info.get("action") == "program":
             self.program._program()
@@ -127,14 +250,24 @@ class MainWindow(QMainWindow):
             self.single_sector.show_sector(int(info["sector_id"]), self.die.bitorder)
 
     def on_memory_changed(self, region: dict):
-        start = region["start"]
-        end = start + region["size"] - 1
-        first = start >> 16
-        last = end >> 16
-        for sid in range(first, last + 1):
-            self.die.update_sector_revision(sid)
+        self.apply_model_changes()
+
+    def apply_model_changes(self):
+        ranges = self.model.drain_dirty()
+        if not ranges:
+            return
+        sectors = set()
+        for start, size in ranges:
+            sectors.update(sectors_in_range(start, size))
         self.die.refresh_visible()
-        self.inspector.update_for_selection(self._last_selection)
+        self.row_strip.invalidate_sectors(sectors)
+        self.single_sector.invalidate_sectors(sectors)
+        sel = self._last_selection
+        if any(start <= sel["end"] and sel["start"] < start + size for start, size in ranges):
+            self.inspector.update_for_selection(sel)
+        if not self.workspace.enforce_budget():
+            used, budget = self.workspace.used_bytes() >> 20, self.workspace.budget_bytes >> 20
+            self.statusBar().showMessage(f"Workspace over memory budget: {used} MiB of {budget} MiB", 10000)
 
     def on_stats(self, s: dict):
         self.statusBar().showMessage(f"tiles={s['sector_items']} jobs={s['jobs']} cache_hit={s['hit_rate']:.1%}")
@@ -154,25 +287,99 @@ class MainWindow(QMainWindow):
         if not path:
             return
         bpath = path + ".bin"
-        with open(bpath, "wb") as f:
-            f.write(self.model.mem)
-        save_json(path, {"bin": bpath, "visual": {"bitorder": self.die.bitorder, "show_ecc": self.die.show_ecc}})
+        self.model.write_dump(bpath)
+        save_json(path, {
+            "bin": bpath,
+            "visual": {"bitorder": self.die.bitorder, "show_ecc": self.die.show_ecc, "palette": self.die.palette},
+            "wear": {
+                "erase": encode_array(self.model.block_erase_count),
+                "program": encode_array(self.model.block_program_count),
+            },
+            "ecc": self.model.ecc_index.to_json(),
+        })
 
     def load_project(self):
         path, _ = QFileDialog.getOpenFileName(self, "Load Project", filter="Project (*.json)")
         if not path:
             return
         meta = load_json(path)
-        with open(meta["bin"], "rb") as f:
-            self.model.mem[:] = f.read()
         self.die.bitorder = meta.get("visual", {}).get("bitorder", "msb")
         self.die.show_ecc = meta.get("visual", {}).get("show_ecc", True)
-        for sid in range(512):
-            self.die.update_sector_revision(sid)
-        self.die.refresh_visible(force=True)
+        self.die.palette = meta.get("visual", {}).get("palette")
+        device = self._add_device(lambda name: self.workspace.open_dump(name, meta["bin"], self.dump_backend), Path(path).stem)
+        wear = meta.get("wear")
+        if device is not None and wear:
+            model = device.model
+            model.block_erase_count[:] = decode_array(wear["erase"], np.uint32, model.block_erase_count.size)
+            model.block_program_count[:] = decode_array(wear["program"], np.uint32, model.block_program_count.size)
+            self.die.refresh_visible(force=True)
+        if device is not None and "ecc" in meta:
+            index = device.model.ecc_index
+            index.restore(meta["ecc"])
+            bad = index.mismatched_pages()
+            if bad.size:
+                self.statusBar().showMessage(f"ECC syndrome mismatch on {bad.size} page(s), first at 0x{int(bad[0]) * 0x100:06X}", 10000)
+
+    def new_device(self):
+        self._add_device(lambda name: self.workspace.new_device(name, self.device_backend), f"Device {len(self.workspace) + 1}")
+
+    def open_dump_device(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Dump", filter="Dump (*.bin)")
+        if path:
+            self._add_device(lambda name: self.workspace.open_dump(name, path, self.dump_backend), Path(path).stem)
+
+    def _add_device(self, create, base_name: str) -> Device | None:
+        try:
+            device = create(self.workspace.unique_name(base_name))
+        except ValueError as exc:
+            self.statusBar().showMessage(f"Cannot add device: {exc}", 6000)
+            return None
+        self.device_combo.addItem(device.name)
+        self.device_combo.setCurrentText(device.name)
+        return device
+
+    def switch_device(self, name: str):
+        if name in self.workspace:
+            self._activate_device(self.workspace.device(name))
+
+    def _activate_device(self, device: Device):
+        self.model = device.model
+        for consumer in (self.inspector, self.program, self.row_strip, self.single_sector):
+            consumer.model = device.model
+        self.inspector.secded_report = None
+        # Die tiles are keyed by content digest and the sector view is invalidated below, so this
+        # device's pending journal entries are not needed.
+        device.model.drain_dirty()
+        self.die.set_model(device.model)
+        self.single_sector.invalidate_sectors(range(512))
+        self.row_strip.invalidate_sectors(range(512))
+        self.inspector.update_for_selection(self._last_selection)
+
+    def closeEvent(self, event):
+        self.die.thread_pool.waitForDone()  # render tasks read device memory
+        if self.render_pool is not None:
+            self.render_pool.close()
+        self.workspace.close()  # unmaps dumps and unlinks shared-memory devices
+        super().closeEvent(event)
 
     def export_png(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export PNG", filter="PNG (*.png)")
+        path, _ = QFileDialog.getSaveFileName(self, "Export Die Image", filter="PNG (*.png);;TIFF (*.tif *.tiff)")
         if not path:
             return
-        self.die.grab().save(path)
+
+        def on_progress(done: int, total: int):
+            self.statusBar().showMessage(f"Exporting: {done}/{total} rows")
+            QApplication.processEvents()
+
+        # Render at the current zoom (never below scene resolution) instead of grabbing the viewport.
+        scale = max(1.0, self.die.transform().m11())
+        try:
+            w, h = render_mosaic(
+                self.model, path, lod=self.die.current_lod(), scale=scale, bitorder=self.die.bitorder,
+                visible_rows=self.die.visible_rows_per_column, progress=on_progress,
+                palette=PALETTES.get(self.die.palette), processes=self.render_pool,
+            )
+        except (OSError, ValueError) as exc:
+            self.statusBar().showMessage(f"Export failed: {exc}", 6000)
+            return
+        self.statusBar().showMessage(f"Exported {w}x{h} image to {path}", 6000)
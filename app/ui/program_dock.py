@@ -14,6 +14,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from core.bulk import erase_op, program_op
+from core.patterns import SEGMENT_TYPES
 from core.utils import parse_int
 
 
@@ -34,7 +36,7 @@ class ProgramDock(QDockWidget):
         self.unit.addItems(["selected", "sector64", "block32", "block4", "page256", "range"])
         self.addr = QLineEdit("0x0")
         self.size = QLineEdit("0x100")
-        self.seg_type = QComboBox(); self.seg_type.addItems(["fill", "hex", "text"])
+        self.seg_type = QComboBox(); self.seg_type.addItems(list(SEGMENT_TYPES))
         self.seg_size = QLineEdit("0x100")
         self.seg_value = QLineEdit("0xAA")
 
@@ -98,13 +100,13 @@ class ProgramDock(QDockWidget):
     def _program(self):
         start, size = self._resolve_region()
         seg = {"type": self.seg_type.currentText(), "size_bytes": parse_int(self.seg_size.text()), "value": self.seg_value.text()}
-        self.model.program(start, size, [seg], enforce_nor=True)
-        self.log.append(f"Programmed 0x{start:X} size 0x{size:X}")
+        stats = self.model.apply_batch([program_op(start, size, [seg], enforce_nor=True)])
+        self.log.append(f"Programmed 0x{start:X} size 0x{size:X} ({stats.mb_per_s:.1f} MB/s)")
         self.changed.emit({"start": start, "size": size})
 
     def _erase(self):
         start, size = self._resolve_region()
-        self.model.erase(start, size)
+        self.model.apply_batch([erase_op(start, size)])
         self.log.append(f"Erased 0x{start:X} size 0x{size:X}")
         self.changed.emit({"start": start, "size": size})
 
@@ -26,6 +26,7 @@ class RowStripDock(QDockWidget):
         self.listw.setMovement(QListWidget.Static)
         self.listw.setIconSize(QPixmap(180, 80).size())
         self.listw.itemClicked.connect(self._on_item)
+        self._items: dict[int, QListWidgetItem] = {}
         lay.addWidget(self.label)
         lay.addWidget(self.listw)
         self.setWidget(body)
@@ -33,6 +34,7 @@ class RowStripDock(QDockWidget):
     def _show_sector_list(self, label: str, left: list[int], right: list[int]):
         self.label.setText(label)
         self.listw.clear()
+        self._items.clear()
         for sec in left:
             self.listw.addItem(self._item_for_sector(sec))
         sep = QListWidgetItem("| Sector |")
@@ -55,17 +57,27 @@ class RowStripDock(QDockWidget):
             right,
         )
 
+    def invalidate_sectors(self, sector_ids):
+        for sid in sector_ids:
+            it = self._items.get(sid)
+            if it is not None:
+                it.setIcon(self._icon_for_sector(sid))
+
     def _item_for_sector(self, sector_id: int) -> QListWidgetItem:
-        sbytes = self.model.read(sector_start(sector_id), SECTOR_SIZE)
+        it = QListWidgetItem(f"S{sector_id}")
+        it.setData(Qt.UserRole, sector_id)
+        it.setIcon(self._icon_for_sector(sector_id))
+        self._items[sector_id] = it
+        return it
+
+    def _icon_for_sector(self, sector_id: int) -> QIcon:
+        sbytes = self.model.read_view(sector_start(sector_id), SECTOR_SIZE)
         arr = sector_detailed_image(sbytes, height=220, with_ecc=False, orientation="vertical")
         arr = np.ascontiguousarray(arr, dtype=np.uint8)
         h, w, _ = arr.shape
         img = QImage(arr.data, w, h, 3 * w, QImage.Format_RGB888)
         pm = QPixmap.fromImage(img.copy()).scaled(95, 200, Qt.KeepAspectRatio, Qt.FastTransformation)
-        it = QListWidgetItem(f"S{sector_id}")
-        it.setData(Qt.UserRole, sector_id)
-        it.setIcon(QIcon(pm))
-        return it
+        return QIcon(pm)
 
     def _on_item(self, item: QListWidgetItem):
         sid = item.data(Qt.UserRole)
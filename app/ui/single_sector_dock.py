@@ -22,10 +22,16 @@ class SingleSectorDock(QDockWidget):
         lay.addWidget(self.title)
         lay.addWidget(self.preview)
         self.setWidget(body)
+        self._shown: tuple[int, str] | None = None
+
+    def invalidate_sectors(self, sector_ids):
+        if self._shown is not None and self._shown[0] in sector_ids:
+            self.show_sector(*self._shown)
 
     def show_sector(self, sector_id: int, bitorder: str = "msb"):
+        self._shown = (sector_id, bitorder)
         self.title.setText(f"Sector {sector_id}")
-        sbytes = self.model.read(sector_start(sector_id), SECTOR_SIZE)
+        sbytes = self.model.read_view(sector_start(sector_id), SECTOR_SIZE)
         arr = sector_detailed_image(sbytes, height=360, with_ecc=False, bitorder=bitorder, orientation="vertical")
         arr = np.ascontiguousarray(arr, dtype=np.uint8)
         h, w, _ = arr.shape